@@ -0,0 +1,58 @@
+"""
+Microbenchmark da normalização de argumentos das ferramentas.
+
+Compara, por chamada:
+  - por chamada: model_json_schema() + análise do schema + limpeza (o custo
+    anterior, ainda usado quando não há plano pré-compilado);
+  - plano do registro: apenas ArgumentPlan.apply, em uma única passada.
+
+Uso:
+  python -m benchmarks.argument_plans
+  python -m benchmarks.argument_plans --seconds 2
+"""
+from typing import List, Optional
+import argparse, sys
+
+from pydantic import BaseModel, Field
+
+from benchmarks.serialization import ops_per_second
+from src.tools.tools_args import compile_plan
+
+
+class ScrapeArgs(BaseModel):
+    """Shape of the Web_ScrapeUrl arguments."""
+    url: str
+    formats: List[str] = Field(default_factory=list)
+    only_main_content: bool = True
+    include_tags: Optional[List[str]] = None
+    exclude_tags: Optional[List[str]] = None
+    wait_for: int = 0
+    timeout: int = 30000
+
+
+ARGUMENTS = {"url": "https://example.com", "only_main_content": "true", "include_tags": "article", "wait_for": None}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Custo por chamada da normalização de argumentos")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duração de cada medição (s)")
+    args = parser.parse_args(argv)
+
+    def per_call():
+        return compile_plan(ScrapeArgs.model_json_schema(), "Web_ScrapeUrl").apply(ARGUMENTS)
+
+    plan = compile_plan(ScrapeArgs.model_json_schema(), "Web_ScrapeUrl")
+
+    assert per_call() == plan.apply(ARGUMENTS)
+
+    compiled = ops_per_second(per_call, args.seconds)
+    planned = ops_per_second(lambda: plan.apply(ARGUMENTS), args.seconds)
+
+    print(f"{'por chamada':<14} {compiled:12,.0f} ops/s  {1e6 / compiled:8.2f} µs/chamada")
+    print(f"{'plano':<14} {planned:12,.0f} ops/s  {1e6 / planned:8.2f} µs/chamada")
+    print(f"Plano pré-compilado {planned / compiled:.1f}x mais rápido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
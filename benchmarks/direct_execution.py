@@ -0,0 +1,130 @@
+"""
+Benchmark: execução direta vs. agente LLM para ferramentas autorizadas do Arcade.
+
+Roda offline: o Arcade e a OpenAI são simulados com latências fixas, então o
+resultado mostra o custo estrutural de cada caminho (idas e voltas ao LLM,
+reautorização dentro do wrapper, montagem do grafo), não a variação da rede.
+
+Uso:
+  python -m benchmarks.direct_execution
+  python -m benchmarks.direct_execution --calls 20 --llm-latency 0.8 --arcade-latency 0.2
+"""
+from statistics import mean, median
+from typing import List, Optional
+from unittest.mock import patch
+import argparse, asyncio, sys, time
+import uuid
+
+from arcadepy import Arcade
+from arcadepy.types import ToolDefinition
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.tools.loader import ToolkitLoader, toolkit_loader
+from src.tools.registry import ToolRegistry
+from src.tools.base import _run_agent
+
+
+TOOL_NAME = "Slack_SendMessage"
+
+
+class FakeArcadeTools:
+    """Arcade tools resource with fixed latency per remote call."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = {"authorize": 0, "execute": 0}
+
+    def authorize(self, tool_name, user_id, **kwargs):
+        self.calls["authorize"] += 1
+        time.sleep(self.latency)
+        return type("Auth", (), {"status": "completed", "url": None, "id": "auth"})()
+
+    def execute(self, tool_name, input, user_id=None, **kwargs):
+        self.calls["execute"] += 1
+        time.sleep(self.latency)
+        output = type("Output", (), {"value": {"sent": True, "text": input.get("text")}, "error": None})()
+        return type("Response", (), {"success": True, "output": output})()
+
+
+def fake_llm(latency: float, tool_name: str = TOOL_NAME):
+    """Model that asks for the tool on the first turn and answers on the second."""
+
+    def respond(messages):
+        time.sleep(latency)
+        if messages[-1].type == "tool":
+            return AIMessage(content=str(messages[-1].content))
+        return AIMessage(content="", tool_calls=[{
+            "name": tool_name, "args": {"channel_name": "general", "text": "hi"}, "id": f"call_{uuid.uuid4().hex[:8]}"
+        }])
+
+    return RunnableLambda(respond)
+
+
+def make_definition(name: str = "SendMessage", toolkit: str = "Slack") -> ToolDefinition:
+    return ToolDefinition.model_validate({
+        "name": name,
+        "fully_qualified_name": f"{toolkit}.{name}@1.0.0",
+        "toolkit": {"name": toolkit},
+        "description": "Send a Slack message",
+        "input": {"parameters": [
+            {"name": "channel_name", "required": True, "value_schema": {"val_type": "string"}},
+            {"name": "text", "required": True, "value_schema": {"val_type": "string"}},
+        ]},
+        "requirements": {"authorization": {"provider_id": "slack", "provider_type": "oauth2"}},
+    })
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, timings: List[float], calls: dict) -> None:
+    print(
+        f"{label:<8} média={mean(timings) * 1000:8.1f}ms  p50={median(timings) * 1000:8.1f}ms  "
+        f"p95={percentile(timings, 95) * 1000:8.1f}ms  arcade={calls}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara a execução direta com o caminho do agente LLM")
+    parser.add_argument("--calls", type=int, default=10, help="Chamadas por caminho")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Latência simulada de cada turno do LLM (s)")
+    parser.add_argument("--arcade-latency", type=float, default=0.2, help="Latência simulada de cada chamada ao Arcade (s)")
+    args = parser.parse_args(argv)
+
+    client = Arcade(api_key="benchmark")
+    fake_tools = FakeArcadeTools(args.arcade_latency)
+    client.__dict__["tools"] = fake_tools
+
+    entry = ToolkitLoader(client, [], [])._compile([make_definition()])[0]
+    registry = ToolRegistry()
+    registry.add(entry)
+    toolkit_loader.registry = registry
+
+    arguments = {"channel_name": "general", "text": "hi"}
+
+    direct: List[float] = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        asyncio.run(entry.executor(arguments, user_id="benchmark"))
+        direct.append(time.perf_counter() - start)
+    report("direto", direct, dict(fake_tools.calls))
+
+    fake_tools.calls = {"authorize": 0, "execute": 0}
+    agent: List[float] = []
+    with patch("src.agent.nodes.get_llm_with_tools", return_value=fake_llm(args.llm_latency)), \
+         patch("src.agent.nodes.tools_manager.authorize", side_effect=fake_tools.authorize):
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            asyncio.run(_run_agent(TOOL_NAME, arguments, str(uuid.uuid4()), "benchmark"))
+            agent.append(time.perf_counter() - start)
+    report("agente", agent, dict(fake_tools.calls))
+
+    print(f"Execução direta {mean(agent) / mean(direct):.1f}x mais rápida (média)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
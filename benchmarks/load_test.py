@@ -0,0 +1,233 @@
+"""
+Teste de carga offline do endpoint /mcp.
+
+Sobe `src.app.app` em processo (ASGI direto, sem rede) com o Arcade, o LLM e
+o MariaDB simulados por fakes com latência configurável, e dispara uma mistura
+de `initialize`, `tools/list` e `tools/call` com concorrência fixa. Reporta
+p50/p95/p99, requisições/s e o RSS do processo (equivalente a um worker), e
+grava o resultado em JSON para comparar execuções.
+
+Tipos de chamada da mistura (--mix, pesos relativos):
+  initialize, tools/list
+  echo    ferramenta personalizada local, sem latência
+  arcade  ferramenta do Arcade com autorização, execução direta (fake Arcade)
+  db      consulta SQL (fake MariaDB: bloqueia uma thread do pool pela latência)
+  agent   ferramenta do Arcade executada pelo agente LangGraph (fake LLM)
+
+Uso:
+  python -m benchmarks.load_test
+  python -m benchmarks.load_test --requests 2000 --concurrency 32 --output run.json
+  python -m benchmarks.load_test --mix "tools/list=1,arcade=3" --compare baseline.json
+"""
+import os
+
+# Sem chaves reais nem banco: tudo o que sai do processo é simulado
+os.environ.setdefault("ARCADE_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("MCP_AUTH_REQUIRED", "false")
+os.environ.setdefault("MCP_TOOLS_SNAPSHOT_PATH", "")
+os.environ.setdefault("MCP_LOG_LEVEL", "WARNING")
+
+from datetime import datetime, timezone
+from statistics import mean
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+import argparse, asyncio, itertools, json, platform, random, sys, threading, time
+
+from arcadepy import Arcade
+
+from benchmarks.direct_execution import FakeArcadeTools, fake_llm, make_definition, percentile
+from benchmarks.serialization import asgi_post
+from src.memory import process_memory
+from src.tools.catalog import build_catalog
+from src.tools.loader import ToolkitLoader, toolkit_loader
+from src.tools.registry import ToolRegistry, TOOL_KIND_CUSTOM, create_entry
+
+
+ARCADE_TOOL = "Slack_SendMessage"
+AGENT_TOOL = "Slack_SendDm"
+DEFAULT_MIX = "initialize=1,tools/list=2,echo=3,arcade=2,db=1,agent=1"
+
+
+class EchoTool:
+    name = "Echo_Tool"
+    description = "Returns its arguments"
+
+    def invoke(self, arguments):
+        return f"echo {arguments.get('text', '')}"
+
+
+class FakeQueryTool:
+    """Stand-in for VerxRH_RunQuery: holds a pool thread like a MariaDB query."""
+    name = "VerxRH_RunQuery"
+    description = "Run a SELECT"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, arguments):
+        time.sleep(self.latency)
+        return {"rows": [{"id": i, "name": f"row {i}"} for i in range(20)], "sql": arguments.get("sql")}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() and weight.strip():
+            mix[name.strip()] = float(weight)
+    unknown = set(mix) - {"initialize", "tools/list", "echo", "arcade", "db", "agent"}
+    if unknown:
+        raise ValueError(f"Unknown call types in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def install_fakes(args) -> FakeArcadeTools:
+    """Registry with the fake tools, served as if the toolkits were already loaded."""
+    client = Arcade(api_key="benchmark")
+    fake_tools = FakeArcadeTools(args.arcade_latency)
+    client.__dict__["tools"] = fake_tools
+
+    loader = ToolkitLoader(client, [], [])
+    registry = ToolRegistry()
+    registry.add(create_entry(EchoTool(), TOOL_KIND_CUSTOM))
+    registry.add(create_entry(FakeQueryTool(args.db_latency), TOOL_KIND_CUSTOM))
+    for entry in loader._compile([make_definition(), make_definition("SendDm")]):
+        registry.add(entry)
+
+    ready = threading.Event()
+    ready.set()
+    toolkit_loader.registry = registry
+    toolkit_loader.catalog = build_catalog(registry)
+    toolkit_loader._ready = ready
+    return fake_tools
+
+
+def request_body(kind: str, request_id: int) -> bytes:
+    if kind in ("initialize", "tools/list"):
+        method, params = kind, {}
+    elif kind == "echo":
+        method, params = "tools/call", {"name": "Echo_Tool", "arguments": {"text": f"hello {request_id}"}}
+    elif kind == "arcade":
+        method, params = "tools/call", {"name": ARCADE_TOOL, "arguments": {"channel_name": "general", "text": f"hi {request_id}"}}
+    elif kind == "db":
+        method, params = "tools/call", {"name": "VerxRH_RunQuery", "arguments": {"sql": f"SELECT {request_id}"}}
+    else:
+        method, params = "tools/call", {"name": AGENT_TOOL, "arguments": {"channel_name": "general", "text": f"hi {request_id}"}}
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}).encode()
+
+
+async def run_load(mix: Dict[str, float], requests: int, concurrency: int, seed: int) -> Tuple[Dict[str, List[float]], int, float]:
+    """Drive the app with `concurrency` clients until `requests` are done; latencies per call type."""
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    queue = iter(enumerate(kinds, start=1))
+    latencies: Dict[str, List[float]] = {kind: [] for kind in mix}
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for request_id, kind in queue:
+            body = request_body(kind, request_id)
+            start = time.perf_counter()
+            status = await asgi_post(body)
+            latencies[kind].append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(values: List[float], elapsed: float) -> Dict[str, Any]:
+    if not values:
+        return {"requests": 0}
+    return {
+        "requests": len(values),
+        "rps": len(values) / elapsed,
+        "mean_ms": mean(values) * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"{'chamada':<11} {'req':>6} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for kind, stats in list(result["calls"].items()) + [("total", result["total"])]:
+        if not stats.get("requests"):
+            continue
+        print(
+            f"{kind:<11} {stats['requests']:>6} {stats['rps']:>9.1f} {stats['p50_ms']:>7.1f}ms "
+            f"{stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+        )
+    memory = result["memory"]
+    print(f"erros={result['errors']}  RSS antes={memory['rss_before_mb']:.1f}MB depois={memory['rss_after_mb']:.1f}MB")
+
+
+def print_comparison(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print("Comparação com a execução de referência (variação %)")
+    for kind, stats in list(result["calls"].items()) + [("total", result["total"])]:
+        reference = baseline["calls"].get(kind) if kind != "total" else baseline.get("total")
+        if not stats.get("requests") or not reference or not reference.get("requests"):
+            continue
+        deltas = [
+            f"{key[:-3] if key.endswith('_ms') else key}={(stats[key] / reference[key] - 1) * 100:+.1f}%"
+            for key in ("rps", "p50_ms", "p95_ms", "p99_ms") if reference[key]
+        ]
+        print(f"  {kind:<11} " + "  ".join(deltas))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga offline do /mcp")
+    parser.add_argument("--requests", type=int, default=1000, help="Total de requisições")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes simultâneos")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Pesos por tipo de chamada")
+    parser.add_argument("--arcade-latency", type=float, default=0.05, help="Latência de cada chamada ao Arcade (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Latência de cada turno do LLM (s)")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Latência de cada consulta ao MariaDB (s)")
+    parser.add_argument("--seed", type=int, default=1, help="Semente da mistura de chamadas")
+    parser.add_argument("--output", help="Arquivo JSON com o resultado")
+    parser.add_argument("--compare", help="Resultado JSON anterior para comparar")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    fake_tools = install_fakes(args)
+    rss_before = process_memory().get("rss", 0)
+
+    with patch("src.tools.base.AGENT_TOOLS", {AGENT_TOOL}), \
+         patch("src.agent.nodes.get_llm_with_tools", return_value=fake_llm(args.llm_latency, AGENT_TOOL)), \
+         patch("src.agent.nodes.tools_manager.authorize", side_effect=fake_tools.authorize), \
+         patch("src.tools.base.tools_manager.authorize", side_effect=fake_tools.authorize):
+        latencies, errors, elapsed = asyncio.run(run_load(mix, args.requests, args.concurrency, args.seed))
+
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "elapsed_s": elapsed,
+        "errors": errors,
+        "calls": {kind: summarize(values, elapsed) for kind, values in latencies.items()},
+        "total": summarize(list(itertools.chain.from_iterable(latencies.values())), elapsed),
+        "arcade_calls": dict(fake_tools.calls),
+        "memory": {"rss_before_mb": rss_before, "rss_after_mb": process_memory().get("rss", 0)},
+    }
+
+    print_report(result)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            print_comparison(result, json.load(f))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Resultado gravado em {args.output}")
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Microbenchmarks das funções quentes, com baseline gravado e bloqueio de regressões.
+
+Cada caso roda sobre fixtures realistas (schema grande de ferramenta, resultado
+com 10 mil linhas, catálogo com 500 tabelas) e mede o menor tempo por chamada
+entre várias repetições. Os tempos são normalizados por um laço de referência
+em Python puro, medido na mesma execução, para que o baseline gravado
+(benchmarks/baseline.json) valha entre máquinas de velocidades diferentes.
+
+O comando sai com código 1 quando algum caso fica mais lento que o baseline
+além do limite (--threshold, 25% por padrão), para uso em CI.
+
+Uso:
+  python -m benchmarks.micro                     # compara com o baseline
+  python -m benchmarks.micro --filter markdown   # só os casos que casam com o filtro
+  python -m benchmarks.micro --update-baseline   # grava os tempos atuais como baseline
+"""
+import os
+
+os.environ.setdefault("ARCADE_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("MCP_LOG_LEVEL", "WARNING")
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import argparse, json, platform, sys, time, uuid
+
+from pydantic import create_model
+
+from src.services.nl2sql import json_fallback, mask_pii_value, to_markdown
+from src.services.sql_guard import _validate_select_only
+from src.tools.base import _format_result
+from src.tools.tools_args import _clean_arguments, compile_plan
+from src.utils import create_success_response
+
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+_cases: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    """Register a benchmark: the decorated function builds its fixture and returns the timed callable."""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        _cases[name] = setup
+        return setup
+    return register
+
+
+def run_sync(coro) -> Any:
+    """Drive a coroutine that never suspends (e.g. _clean_arguments) without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+# ------------------------------- Fixtures ------------------------------------
+
+def large_tool_schema(properties: int = 60) -> Dict[str, Any]:
+    types = [str, int, bool, float, List[str], Optional[str], Optional[List[str]], Optional[int]]
+    fields = {f"field_{i}": (types[i % len(types)], ...) for i in range(properties)}
+    return create_model("LargeToolArgs", **fields).model_json_schema()
+
+
+def large_tool_arguments(properties: int = 60) -> Dict[str, Any]:
+    values = ["texto", "42", "true", "3.5", "a@b.com", None, '["x", "y"]', "7"]
+    return {f"field_{i}": values[i % len(values)] for i in range(0, properties, 2)}
+
+
+def result_rows(count: int = 10_000) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "nome": f"Colaborador {i}",
+            "email": f"colaborador{i}@empresa.com.br",
+            "salario": Decimal("4321.50") + i,
+            "admissao": date(2020, 1, 1) + timedelta(days=i % 1500),
+            "ativo": i % 3 != 0,
+        }
+        for i in range(count)
+    ]
+
+
+def catalog(tables: int = 500) -> Dict[str, Any]:
+    def table(i: int) -> Dict[str, Any]:
+        columns = [
+            {"name": "id", "type": "int(11)", "nullable": False, "default": None, "comment": "Chave"},
+            {"name": "nome", "type": "varchar(120)", "nullable": False, "default": None, "comment": None},
+            {"name": "criado_em", "type": "datetime", "nullable": True, "default": "current_timestamp()", "comment": None},
+        ] + [
+            {"name": f"campo_{c}", "type": "varchar(60)", "nullable": True, "default": None, "comment": f"Campo {c}"}
+            for c in range(9)
+        ]
+        return {
+            "name": f"tabela_{i}",
+            "comment": f"Tabela {i} do RH",
+            "columns": columns,
+            "primary_key": ["id"],
+            "foreign_keys": [{
+                "columns": ["tabela_pai_id"], "ref_table": f"tabela_{max(i - 1, 0)}", "ref_columns": ["id"],
+                "on_update": "CASCADE", "on_delete": "RESTRICT",
+            }],
+            "indexes": [{"name": f"idx_nome_{i}", "columns": ["nome"], "unique": False}],
+            "sample_rows": [{"id": 1, "nome": "[email]", "criado_em": "2024-01-01T00:00:00"}],
+        }
+    return {"schema": "rh", "tables": [table(i) for i in range(tables)]}
+
+
+# --------------------------------- Casos -------------------------------------
+
+@case("clean_arguments.plan")
+def bench_clean_arguments():
+    schema = large_tool_schema()
+    plan = compile_plan(schema, "Large_Tool")
+    arguments = large_tool_arguments()
+    return lambda: run_sync(_clean_arguments(None, arguments, "Large_Tool", 1, "bench", schema=schema, plan=plan))
+
+
+@case("clean_arguments.compile_plan")
+def bench_compile_plan():
+    schema = large_tool_schema()
+    return lambda: compile_plan(schema, "Large_Tool")
+
+
+@case("format_result.10k_rows")
+def bench_format_result():
+    result = {"rows": result_rows()}
+    return lambda: _format_result(result)
+
+
+@case("create_success_response.10k_rows")
+def bench_success_response():
+    result = {"content": [{"type": "text", "text": "ok"}], "structuredContent": {"rows": result_rows()}}
+    return lambda: create_success_response(1, result)
+
+
+@case("validate_select_only")
+def bench_validate_select_only():
+    sql = "```sql\nSELECT c.nome, c.email FROM colaboradores c WHERE c.nome LIKE '%Silva%' ORDER BY c.nome\n```"
+    return lambda: _validate_select_only(sql)
+
+
+@case("mask_pii_value.1k_values")
+def bench_mask_pii():
+    values = [
+        f"Contato: fulano{i}@empresa.com.br, CPF 123.456.789-{i % 100:02d}, tel (11) 91234-{i % 10000:04d}\n  obs"
+        for i in range(1000)
+    ]
+    return lambda: [mask_pii_value(value, 160) for value in values]
+
+
+@case("json_fallback.10k_values")
+def bench_json_fallback():
+    samples = [datetime(2024, 5, 1, 12), date(2024, 5, 1), timedelta(hours=3), Decimal("10.50"), b"bytes", {1, 2}, uuid.uuid4()]
+    values = [samples[i % len(samples)] for i in range(10_000)]
+    return lambda: [json_fallback(value) for value in values]
+
+
+@case("to_markdown.500_tables")
+def bench_to_markdown():
+    data = catalog()
+    return lambda: to_markdown(data)
+
+
+# --------------------------------- Medição -----------------------------------
+
+def reference_workload() -> int:
+    total = 0
+    for i in range(20_000):
+        total += i * i % 7
+    return total
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> float:
+    """Best time per call (s): loops calibrated to last at least min_time, best of `repeat` runs."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def run_cases(pattern: Optional[str], repeat: int, min_time: float) -> Dict[str, Any]:
+    reference = measure(reference_workload, repeat, min_time)
+    results: Dict[str, Any] = {}
+    for name, setup in _cases.items():
+        if pattern and pattern not in name:
+            continue
+        seconds = measure(setup(), repeat, min_time)
+        results[name] = {"seconds": seconds, "relative": seconds / reference}
+    return {"reference_seconds": reference, "cases": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Names of the cases slower than the baseline by more than `threshold` (relative times)."""
+    regressions = []
+    for name, result in current["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference and result["relative"] > reference["relative"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds * 1e6:9.2f} µs"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks das funções quentes com baseline")
+    parser.add_argument("--filter", help="Roda apenas os casos cujo nome contém o texto")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições por caso (vale a menor)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Duração mínima de cada repetição (s)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Regressão tolerada (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Arquivo do baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Grava os tempos atuais como baseline")
+    args = parser.parse_args(argv)
+
+    current = run_cases(args.filter, args.repeat, args.min_time)
+
+    baseline: Dict[str, Any] = {}
+    if Path(args.baseline).exists():
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    regressions = compare(current, baseline, args.threshold)
+
+    print(f"{'caso':<36} {'tempo':>12} {'baseline':>12} {'variação':>9}")
+    for name, result in current["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference:
+            change = f"{(result['relative'] / reference['relative'] - 1) * 100:+8.1f}%"
+            expected = format_seconds(reference["relative"] * current["reference_seconds"])
+        else:
+            change, expected = "    novo", "-"
+        flag = "  REGRESSÃO" if name in regressions else ""
+        print(f"{name:<36} {format_seconds(result['seconds']):>12} {expected:>12} {change:>9}{flag}")
+
+    if args.update_baseline:
+        cases = {**baseline.get("cases", {}), **current["cases"]}
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), **current, "cases": cases}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} caso(s) mais lento(s) que o baseline além de {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
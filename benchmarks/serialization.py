@@ -0,0 +1,130 @@
+"""
+Microbenchmark do codec JSON do /mcp (orjson + msgspec) e da vazão em processo.
+
+Mede:
+  - decodificação/validação do envelope: json.loads + pydantic vs. msgspec;
+  - serialização da resposta: JSONResponse vs. ORJSONResponse;
+  - requisições/s de initialize, tools/list e tools/call pequeno, chamando o
+    app ASGI diretamente (sem rede, sem Arcade: ferramenta de eco local).
+
+Uso:
+  python -m benchmarks.serialization
+  python -m benchmarks.serialization --requests 5000
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+import argparse, asyncio, json, sys, threading, time
+
+from fastapi.responses import JSONResponse
+
+from src.app import app
+from src.codec import ORJSONResponse, decode_request
+from src.schemas.mcp_schemas import MCPRequest
+from src.tools.catalog import build_catalog
+from src.tools.loader import toolkit_loader
+from src.tools.registry import ToolRegistry, TOOL_KIND_CUSTOM, create_entry
+
+
+class EchoTool:
+    name = "Echo_Tool"
+    description = "Returns its arguments"
+
+    def invoke(self, arguments):
+        return {"markdown": f"echo {arguments.get('text', '')}"}
+
+
+def install_echo_tool() -> None:
+    registry = ToolRegistry()
+    registry.add(create_entry(EchoTool(), TOOL_KIND_CUSTOM))
+    toolkit_loader.registry = registry
+    toolkit_loader.catalog = build_catalog(registry)
+    toolkit_loader._ready = threading.Event()
+    toolkit_loader._ready.set()
+
+
+def ops_per_second(func: Callable[[], Any], seconds: float = 1.0) -> float:
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            func()
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+async def asgi_post(body: bytes) -> int:
+    """POST /mcp straight into the ASGI app; returns the status code."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/mcp", "raw_path": b"/mcp", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 1234), "server": ("test", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def requests_per_second(body: bytes, requests: int) -> float:
+    assert await asgi_post(body) == 200
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_post(body)
+    return requests / (time.perf_counter() - start)
+
+
+def rpc(method: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}).encode()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmark do codec JSON e da vazão do /mcp")
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por método")
+    args = parser.parse_args(argv)
+
+    body = rpc("tools/call", {"name": "Echo_Tool", "arguments": {"text": "hello", "limit": 10}})
+    result = {
+        "id": 1, "jsonrpc": "2.0",
+        "result": {"content": [{"type": "text", "text": "x" * 512}], "rows": [
+            {"id": i, "name": f"row {i}", "amount": 10.5 * i, "active": True} for i in range(20)
+        ]},
+    }
+    native = {"created": datetime.now(), "amount": Decimal("10.50"), "id": uuid4()}
+
+    print("Codec (operações/s)")
+    print(f"  decode  json+pydantic : {ops_per_second(lambda: MCPRequest(**json.loads(body))):>12,.0f}")
+    print(f"  decode  msgspec       : {ops_per_second(lambda: decode_request(body)):>12,.0f}")
+    print(f"  encode  JSONResponse  : {ops_per_second(lambda: JSONResponse(result)):>12,.0f}")
+    print(f"  encode  ORJSONResponse: {ops_per_second(lambda: ORJSONResponse(result)):>12,.0f}")
+    print(f"  encode  tipos nativos : {ops_per_second(lambda: ORJSONResponse(native)):>12,.0f} (datetime/Decimal/UUID)")
+
+    install_echo_tool()
+
+    print(f"App ASGI em processo (requisições/s, {args.requests} por método)")
+    for label, request_body in [
+        ("initialize", rpc("initialize")),
+        ("tools/list", rpc("tools/list")),
+        ("tools/call", body),
+    ]:
+        print(f"  {label:<11}: {asyncio.run(requests_per_second(request_body, args.requests)):>10,.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,19 @@
+import gc
 import multiprocessing
+import os
 
 # Server socket
 bind = "0.0.0.0:2906"
 workers = multiprocessing.cpu_count() * 2 + 1
 worker_class = "uvicorn.workers.UvicornWorker"
 
+# Preload: o master importa a aplicação e monta o registro/catálogo de ferramentas
+# uma única vez; os workers herdam tudo via copy-on-write após o fork.
+preload_app = os.getenv("MCP_PRELOAD", "true").lower() == "true"
+if preload_app:
+    # A importação da aplicação no master não carrega os toolkits (ver when_ready)
+    os.environ["MCP_TOOLKITS_PRELOAD"] = "true"
+
 # Logging
 accesslog = "./logs/access.log"
 errorlog = "./logs/error.log"
@@ -39,3 +48,27 @@ max_requests_jitter = 0
 limit_request_line = 4094
 limit_request_fields = 100
 limit_request_field_size = 8190
+
+
+# Server hooks
+def when_ready(server):
+    from src.memory import process_memory, format_memory
+
+    if preload_app:
+        from src.tools.loader import toolkit_loader
+
+        # Carrega no master tudo o que ainda faltar (snapshot ausente ou desatualizado)
+        toolkit_loader.preload()
+
+        # Move os objetos do master para a geração permanente do GC, para que as
+        # coletas nos workers não escrevam nas páginas compartilhadas
+        gc.collect()
+        gc.freeze()
+
+    server.log.info(f"Master memory (preload={preload_app}): {format_memory(process_memory())}")
+
+
+def post_worker_init(worker):
+    from src.memory import process_memory, format_memory
+
+    worker.log.info(f"Worker {worker.pid} memory after init (preload={preload_app}): {format_memory(process_memory())}")
@@ -1,34 +1,115 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+import threading
+
 from langgraph.checkpoint.memory import MemorySaver
 from src.agent.workflow import get_workflow
-from src.agent.tools import initialize_tools
+from src.agent.tools import initialize_tools, toolkit_loader
+from src.config import GRAPH_CACHE_SIZE
 from src.logs import agent_logger
+from src.stats import register_stats
 
 
-def get_graph_with_tool(tool_name: str):
-  """Obtém o grafo compilado"""
+def build_graph_with_tool(tool_name: str, catalog_version: str = ""):
+  """Compila o grafo de uma ferramenta (caminho lento, sem cache)"""
 
-  try:
-    agent_logger.info(f"Obtendo grafo para ferramenta: {tool_name}")
+  agent_logger.info(f"Inicializando ferramentas...")
+  langchain_tools = initialize_tools(tool_name)
+  agent_logger.info(f"Ferramentas inicializadas: {langchain_tools}")
+
+  agent_logger.info(f"Obtendo workflow...")
+  workflow = get_workflow(langchain_tools, catalog_version)
+  agent_logger.info(f"Workflow obtido: {workflow}")
+
+  # Cria uma instância do nosso "salvador de memória".
+  # Ela é compartilhada entre as chamadas: o estado de cada uma fica isolado pelo thread_id
+  memory = MemorySaver()
 
-    agent_logger.info(f"Inicializando ferramentas...")
-    langchain_tools = initialize_tools(tool_name)
-    agent_logger.info(f"Ferramentas inicializadas: {langchain_tools}")
+  agent_logger.info(f"Compilando grafo...")
+  # Compila o workflow em um grafo executável.
+  # O checkpointer garante que o estado seja salvo a cada passo.
+  graph = workflow.compile(checkpointer=memory)
 
-    agent_logger.info(f"Obtendo workflow...")
-    workflow = get_workflow(langchain_tools)
-    agent_logger.info(f"Workflow obtido: {workflow}")
+  agent_logger.info(f"Grafo compilado com sucesso")
 
-    # Cria uma instância do nosso "salvador de memória"
-    memory = MemorySaver()
+  return graph
 
-    agent_logger.info(f"Compilando grafo...")
-    # Compila o workflow em um grafo executável.
-    # O checkpointer garante que o estado seja salvo a cada passo.
-    graph = workflow.compile(checkpointer=memory)
 
-    agent_logger.info(f"Grafo compilado com sucesso")
+class GraphCache:
+  """Bounded LRU of compiled graphs, keyed by tool name and catalog version."""
+
+  def __init__(self, max_size: int, version: Callable[[], str] = lambda: ""):
+    self.max_size = max_size
+    self.version = version
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self._graphs: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, tool_name: str):
+    # Versão lida a cada chamada: após uma recarga do catálogo, os grafos antigos deixam de ser usados
+    catalog_version = self.version()
+    key = (tool_name, catalog_version)
+
+    with self._lock:
+      graph = self._graphs.get(key)
+      if graph is not None:
+        self._graphs.move_to_end(key)
+        self.hits += 1
+        return graph
+      self.misses += 1
+
+    # Compila fora do lock; em corrida, duas compilações do mesmo grafo são inofensivas
+    graph = build_graph_with_tool(tool_name, catalog_version)
+
+    if self.max_size > 0:
+      with self._lock:
+        # Grafos de catálogos anteriores não voltam a ser usados
+        for stale in [stale for stale in self._graphs if stale[1] != catalog_version]:
+          del self._graphs[stale]
+        self._graphs[key] = graph
+        self._graphs.move_to_end(key)
+        while len(self._graphs) > self.max_size:
+          self._graphs.popitem(last=False)
+          self.evictions += 1
 
     return graph
+
+  def clear(self) -> None:
+    with self._lock:
+      self._graphs.clear()
+
+  def stats(self) -> Dict[str, Any]:
+    lookups = self.hits + self.misses
+    return {
+      "hits": self.hits,
+      "misses": self.misses,
+      "hit_ratio": self.hits / lookups if lookups else 0.0,
+      "evictions": self.evictions,
+      "size": len(self._graphs),
+      "max_size": self.max_size,
+    }
+
+
+graph_cache = GraphCache(GRAPH_CACHE_SIZE, lambda: toolkit_loader.catalog.version)
+register_stats("graph_cache", graph_cache.stats)
+
+
+def get_graph_with_tool(tool_name: str):
+  """Obtém o grafo compilado"""
+
+  try:
+    agent_logger.info(f"Obtendo grafo para ferramenta: {tool_name}")
+    return graph_cache.get(tool_name)
   except Exception as e:
     agent_logger.error(f"Erro ao obter grafo para ferramenta {tool_name}: {str(e)}")
-    raise e
\ No newline at end of file
+    raise e
+
+
+def release_thread(graph, thread_id: str) -> None:
+  """Descarta os checkpoints de uma chamada no checkpointer compartilhado do grafo"""
+  try:
+    graph.checkpointer.delete_thread(thread_id)
+  except Exception as e:
+    agent_logger.warning(f"Erro ao descartar checkpoints do thread {thread_id}: {str(e)}")
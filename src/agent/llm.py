@@ -1,9 +1,56 @@
+from typing import Any, Dict, Optional, Tuple
+import threading
+
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import StructuredTool
 
+from src.http_pool import http_client, http_async_client
+from src.stats import register_stats
+
+
+# Todos os modelos usam o pool HTTP do processo: as conexões (e o TLS) sobrevivem entre os turnos do agente
+_models: Dict[Tuple[str, Optional[float]], ChatOpenAI] = {}
+_bound_models: Dict[Tuple[str, str, Tuple[str, ...]], Any] = {}
+_lock = threading.Lock()
+_counters = {"bound_hits": 0, "bound_misses": 0}
+
+
+def get_llm(model: str = "gpt-4o", temperature: Optional[float] = None) -> ChatOpenAI:
+  """Return the shared ChatOpenAI instance of a model (and temperature)"""
+  key = (model, temperature)
+  with _lock:
+    llm = _models.get(key)
+    if llm is None:
+      options = {} if temperature is None else {"temperature": temperature}
+      llm = ChatOpenAI(model=model, http_client=http_client, http_async_client=http_async_client, **options)
+      _models[key] = llm
+    return llm
+
+
+def get_llm_with_tools(langchain_tools: list[StructuredTool], model: str = "gpt-4o", version: str = ""):
+  """Return the model bound to the tools; version identifies the catalog the tools came from"""
+  # Reaproveita o modelo já vinculado às ferramentas (bind_tools converte os schemas a cada chamada).
+  # A versão do catálogo entra na chave: após uma recarga, o mesmo nome pode ter outro schema
+  key = (model, version, tuple(tool.name for tool in langchain_tools))
+
+  with _lock:
+    llm_with_tools = _bound_models.get(key)
+    if llm_with_tools is not None:
+      _counters["bound_hits"] += 1
+      return llm_with_tools
+    _counters["bound_misses"] += 1
+
+  llm_with_tools = get_llm(model).bind_tools(langchain_tools)
+
+  with _lock:
+    # Vínculos de catálogos anteriores não voltam a ser usados
+    for stale in [stale for stale in _bound_models if stale[1] != version]:
+      del _bound_models[stale]
+    return _bound_models.setdefault(key, llm_with_tools)
+
+
+def llm_stats() -> Dict[str, Any]:
+  return {**_counters, "models": len(_models), "bound_models": len(_bound_models)}
+
 
-def get_llm_with_tools(langchain_tools: list[StructuredTool], model: str = "gpt-4o"):
-  # Create a language model instance and bind it with the tools
-  llm = ChatOpenAI(model=model)
-  llm_with_tools = llm.bind_tools(langchain_tools)
-  return llm_with_tools
\ No newline at end of file
+register_stats("llm", llm_stats)
@@ -1,17 +1,23 @@
 from langgraph.graph import END, MessagesState
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import StructuredTool
 from src.agent.llm import get_llm_with_tools
-from src.agent.tools import tools_manager
+from src.agent.tools import tools_manager, toolkit_loader
+from src.tools.auth_cache import authorization_cache
+from src.tracing import span
 
 
-def get_agent_node(langchain_tools: list[StructuredTool]):
+def get_agent_node(langchain_tools: list[StructuredTool], catalog_version: str = ""):
+    # catalog_version: versão com que o grafo foi chaveado no GraphCache (invalida o modelo vinculado após recargas)
+
     # Função para invocar o modelo de linguagem e obter uma resposta
     def agent_node(state: MessagesState):
         messages = state["messages"]
 
-        llm_with_tools = get_llm_with_tools(langchain_tools)
+        llm_with_tools = get_llm_with_tools(langchain_tools, version=catalog_version)
 
-        response = llm_with_tools.invoke(messages)
+        with span("llm"):
+            response = llm_with_tools.invoke(messages)
 
         # Retorna o histórico atualizado de mensagens
         return {"messages": [response]}
@@ -25,7 +31,7 @@ def should_continue_node(state: MessagesState):
     if state["messages"][-1].tool_calls:
         for tool_call in state["messages"][-1].tool_calls:
             # verifica se a ferramenta precisa de autorização
-            if tools_manager.requires_auth(tool_call["name"]):
+            if toolkit_loader.requires_auth(tool_call["name"]):
                 return "authorization"
         return "tools"  # Prossiga para a execução da ferramenta se nenhuma autorização for necessária
     return END  # Termine o fluxo de trabalho se nenhuma ferramenta estiver presente
@@ -33,7 +39,7 @@ def should_continue_node(state: MessagesState):
 
 
 # Função para lidar com a autorização para ferramentas que exigem isso
-def authorize_node(state: MessagesState, config: dict):
+def authorize_node(state: MessagesState, config: RunnableConfig):
     # Pega o ID do usuário
     user_id = config["configurable"].get("user_id")
 
@@ -42,7 +48,13 @@ def authorize_node(state: MessagesState, config: dict):
         tool_name = tool_call["name"]
 
         # Verifica se a ferramenta precisa de autorização
-        if not tools_manager.requires_auth(tool_name):
+        if not toolkit_loader.requires_auth(tool_name):
+            continue
+
+        entry = toolkit_loader.get(tool_name)
+        auth_key = entry.auth_key or (tool_name,)
+
+        if authorization_cache.is_authorized(user_id, auth_key):
             continue
 
         auth_response = tools_manager.authorize(tool_name, user_id)
@@ -59,4 +71,6 @@ def authorize_node(state: MessagesState, config: dict):
                 # Interrompe a execução se a autorização falhar
                 raise ValueError("Authorization failed")
 
+        authorization_cache.mark_authorized(user_id, auth_key)
+
     return {"messages": []}
\ No newline at end of file
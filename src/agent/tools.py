@@ -1,13 +1,11 @@
-from langchain_arcade import ToolManager
-from src.config import ARCADE_API_KEY
+from src.tools.loader import tools_manager, toolkit_loader
 
-# Initialize tool manager
-tools_manager = ToolManager(
-  api_key=ARCADE_API_KEY,
-)
+# O tools_manager é o mesmo do servidor MCP (um único cliente Arcade por processo)
 
 def initialize_tools(tool_name: str):
   """Initialize tools"""
-  return tools_manager.init_tools(
-    tools=[tool_name],
-  )
\ No newline at end of file
+  # Reaproveita a definição já carregada pelo toolkit_loader (sem nova chamada remota)
+  entry = toolkit_loader.get(tool_name)
+  if entry is None:
+    raise ValueError(f"Tool '{tool_name}' not found")
+  return [entry.tool]
@@ -8,7 +8,7 @@ from src.agent.nodes import get_agent_node
 from src.logs import agent_logger
 
 
-def get_workflow(langchain_tools: list[StructuredTool]):
+def get_workflow(langchain_tools: list[StructuredTool], catalog_version: str = ""):
   """Obtém o workflow (nós e arestas)"""
 
   agent_logger.info(f"Obtendo nó de ferramentas...")
@@ -16,7 +16,7 @@ def get_workflow(langchain_tools: list[StructuredTool]):
   agent_logger.info(f"Nó de ferramentas obtido: {tool_node}")
 
   agent_logger.info(f"Obtendo nó do agente...")
-  agent_node = get_agent_node(langchain_tools)
+  agent_node = get_agent_node(langchain_tools, catalog_version)
   agent_logger.info(f"Nó do agente obtido: {agent_node}")
 
   # Cria um novo grafo de fluxo de trabalho.
@@ -1,13 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.routes.auth_routes import auth_router
 from src.routes.mcp_routes import mcp_router
+from src.routes.stats_routes import stats_router
+from src.tools.loader import toolkit_loader
+from src.tracing import TracingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # O servidor começa a escutar imediatamente; os toolkits carregam em segundo plano
+    toolkit_loader.start_warm_up()
+    yield
+
 
 # Cria a aplicação FastAPI
 app = FastAPI(
     title="MCP Server",
     description="Servidor MCP de Ferramentas do Arcade",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Spans por fase, histogramas do /metrics e cabeçalho Server-Timing
+app.add_middleware(TracingMiddleware)
+
 app.include_router(auth_router)
-app.include_router(mcp_router)
\ No newline at end of file
+app.include_router(mcp_router)
+app.include_router(stats_router)
\ No newline at end of file
@@ -1,11 +1,15 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import time
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Importa as configurações do JWT
 from src.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_REQUIRED
+from src.auth.token_cache import token_cache, token_key
+from src.metrics import jwt_verification_duration
+from src.tracing import span
 
 # Configurando HTTPBearer com auto_error=False para não gerar erro automaticamente
 security = HTTPBearer(auto_error=False)
@@ -47,13 +51,27 @@ def verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    try:
-        # Validação do token
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.PyJWTError:
+    # Validação do token, reaproveitando verificações anteriores (hash do token -> claims)
+    with span("jwt"):
+        start = time.perf_counter()
+        key = token_key(credentials.credentials)
+        found, payload = token_cache.get(key)
+        if found:
+            result = "hit" if payload is not None else "negative_hit"
+        else:
+            try:
+                payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+                token_cache.put(key, payload)
+                result = "verified"
+            except jwt.PyJWTError:
+                token_cache.reject(key)
+                payload, result = None, "rejected"
+        jwt_verification_duration.observe(time.perf_counter() - start, result=result)
+
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
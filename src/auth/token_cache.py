@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib, threading, time
+
+from src.config import JWT_CACHE_MAX_ENTRIES, JWT_CACHE_MAX_TTL, JWT_NEGATIVE_CACHE_TTL, JWT_NEGATIVE_CACHE_MAX_ENTRIES
+from src.stats import register_stats
+
+
+def token_key(token: str) -> bytes:
+    """Cache key of a bearer token: its SHA-256, so raw tokens are never kept in memory."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """LRU cache of verified JWT claims, plus a short negative cache of rejections.
+
+    Positive entries expire at the token's `exp` (capped by max_ttl); the clock
+    is wall time because `exp` is an epoch timestamp. Rejected tokens are
+    remembered for negative_ttl seconds so a client hammering with a bad token
+    does not pay a signature check per request. Rejections live in their own,
+    smaller LRU (max_negative_entries): a flood of bad tokens cannot evict the
+    claims of valid ones.
+    """
+
+    def __init__(self, max_entries: int, max_ttl: float, negative_ttl: float,
+                 max_negative_entries: int = 1000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.max_negative_entries = max_negative_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.negative_evictions = 0
+        # Valor: (expira_em, claims)
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Tokens rejeitados: expira_em
+        self._rejected: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(found, claims): claims is None for a cached rejection."""
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+
+            rejected_until = self._rejected.get(key)
+            if rejected_until is not None and rejected_until > now:
+                self._rejected.move_to_end(key)
+                self.negative_hits += 1
+                return True, None
+            if rejected_until is not None:
+                del self._rejected[key]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, key: bytes, claims: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+
+        expires_at = self.clock() + self.max_ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def reject(self, key: bytes) -> None:
+        if self.max_negative_entries <= 0 or self.negative_ttl <= 0:
+            return
+        with self._lock:
+            self._rejected[key] = self.clock() + self.negative_ttl
+            self._rejected.move_to_end(key)
+            while len(self._rejected) > self.max_negative_entries:
+                self._rejected.popitem(last=False)
+                self.negative_evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rejected.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "negative_evictions": self.negative_evictions,
+            "size": len(self._entries),
+            "negative_size": len(self._rejected),
+        }
+
+
+token_cache = TokenCache(JWT_CACHE_MAX_ENTRIES, JWT_CACHE_MAX_TTL, JWT_NEGATIVE_CACHE_TTL, JWT_NEGATIVE_CACHE_MAX_ENTRIES)
+register_stats("jwt_cache", token_cache.stats)
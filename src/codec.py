@@ -0,0 +1,62 @@
+"""
+Codec JSON de alto desempenho do servidor MCP.
+
+Respostas são serializadas com orjson (datetime, UUID, Decimal e modelos
+pydantic vindos das ferramentas funcionam sem conversão manual) e os
+envelopes JSON-RPC são decodificados e validados por structs msgspec
+compilados, sem passar por json.loads + pydantic.
+"""
+from decimal import Decimal
+from typing import Any, List, Union
+
+from fastapi.responses import JSONResponse
+import msgspec
+import orjson
+
+from src.schemas.mcp_schemas import MCPEnvelope, ToolCallEnvelope
+
+
+# Erros de decodificação/validação do msgspec (ambos derivam de MsgspecError)
+CodecError = msgspec.MsgspecError
+
+_request_decoder = msgspec.json.Decoder(Union[MCPEnvelope, List[Any]])
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        # String preserva a precisão (valores monetários do MariaDB, por exemplo)
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def decode_request(body: bytes) -> Union[MCPEnvelope, List[Any]]:
+    """Decode a POST /mcp body: a single envelope or a batch (list of raw elements)."""
+    return _request_decoder.decode(body)
+
+
+def convert_request(item: Any) -> MCPEnvelope:
+    """Validate one element of a batch as an MCP envelope."""
+    return msgspec.convert(item, MCPEnvelope)
+
+
+def convert_tool_call(params: Any) -> ToolCallEnvelope:
+    """Validate tools/call params."""
+    return msgspec.convert(params or {}, ToolCallEnvelope)
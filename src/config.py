@@ -19,6 +19,88 @@ SECRET_KEY = os.getenv('JWT_SECRET_KEY', "chave_secreta_muito_segura")  # Use um
 ALGORITHM = os.getenv('JWT_ALGORITHM', "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', "30"))
 AUTH_REQUIRED = os.getenv('MCP_AUTH_REQUIRED', "true").lower() == "true"
+# Usuário (Arcade e controle de admissão) das requisições sem JWT, ex.: com MCP_AUTH_REQUIRED=false
+DEFAULT_USER_ID = os.getenv('MCP_DEFAULT_USER_ID', "gabrielsilveira.web@gmail.com")
+
+# Cache de tokens JWT já verificados (hash do token -> claims, até o `exp`)
+JWT_CACHE_MAX_ENTRIES = int(os.getenv('MCP_JWT_CACHE_MAX_ENTRIES', "10000"))  # 0 desativa
+JWT_CACHE_MAX_TTL = float(os.getenv('MCP_JWT_CACHE_MAX_TTL', "3600"))  # segundos; teto para tokens sem `exp`
+JWT_NEGATIVE_CACHE_TTL = float(os.getenv('MCP_JWT_NEGATIVE_CACHE_TTL', "10"))  # segundos; 0 desativa
+JWT_NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv('MCP_JWT_NEGATIVE_CACHE_MAX_ENTRIES', "1000"))  # LRU própria; 0 desativa
+
+# Catálogo de ferramentas (tools/list)
+TOOLS_LIST_PAGE_SIZE = int(os.getenv('MCP_TOOLS_LIST_PAGE_SIZE', "0"))  # 0 = página única; paginação opcional
+
+# Carregamento dos toolkits do Arcade
+TOOLKITS_LOAD_MODE = os.getenv('MCP_TOOLKITS_LOAD_MODE', "lazy").lower()  # lazy | eager
+TOOLKITS_MAX_WORKERS = int(os.getenv('MCP_TOOLKITS_MAX_WORKERS', "8"))
+TOOLKITS_WARM_UP_TIMEOUT = float(os.getenv('MCP_TOOLKITS_WARM_UP_TIMEOUT', "30"))  # espera máxima do tools/list
+# Nova tentativa dos toolkits que falharam no aquecimento (espera dobra a cada falha, até o máximo); 0 desativa
+TOOLKITS_RETRY_DELAY = float(os.getenv('MCP_TOOLKITS_RETRY_DELAY', "5"))
+TOOLKITS_RETRY_MAX_DELAY = float(os.getenv('MCP_TOOLKITS_RETRY_MAX_DELAY', "300"))
+# Definido pelo gunicorn_config com preload_app: o master carrega tudo em when_ready, não na importação
+TOOLKITS_PRELOAD = os.getenv('MCP_TOOLKITS_PRELOAD', "false").lower() == "true"
+
+# Snapshot local das definições de ferramentas ("" desativa)
+TOOLS_SNAPSHOT_PATH = os.getenv('MCP_TOOLS_SNAPSHOT_PATH', str(Path(__file__).parent.parent / 'db' / 'tools_snapshot.json'))
+TOOLS_SNAPSHOT_MAX_AGE = float(os.getenv('MCP_TOOLS_SNAPSHOT_MAX_AGE', "3600"))  # segundos; 0 = nunca atualiza sozinho
+
+# Cache do status de autorização (usuário + provedor/escopos) das ferramentas do Arcade
+AUTH_CACHE_TTL = float(os.getenv('MCP_AUTH_CACHE_TTL', "600"))  # segundos; 0 desativa
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv('MCP_AUTH_CACHE_MAX_ENTRIES', "10000"))
+
+# Cache LRU de grafos LangGraph compilados por ferramenta (0 desativa)
+GRAPH_CACHE_SIZE = int(os.getenv('MCP_GRAPH_CACHE_SIZE', "64"))
+
+# Pool HTTP do processo, compartilhado pelos clientes do Arcade e da OpenAI
+# (MCP_LLM_MAX_* continuam aceitos por compatibilidade)
+HTTP_MAX_CONNECTIONS = int(os.getenv('MCP_HTTP_MAX_CONNECTIONS', os.getenv('MCP_LLM_MAX_CONNECTIONS', "100")))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS', os.getenv('MCP_LLM_MAX_KEEPALIVE_CONNECTIONS', "20")))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('MCP_HTTP_KEEPALIVE_EXPIRY', "60"))  # segundos que uma conexão ociosa fica no pool
+HTTP_MAX_PER_HOST = int(os.getenv('MCP_HTTP_MAX_PER_HOST', "50"))  # requisições simultâneas por host; 0 = sem limite
+HTTP2_ENABLED = os.getenv('MCP_HTTP2', "true").lower() == "true"  # exige o pacote h2
+
+# Ferramentas autorizadas executadas pelo agente LLM em vez da execução direta (nomes separados por vírgula)
+AGENT_TOOLS = {name.strip() for name in os.getenv('MCP_AGENT_TOOLS', "").split(",") if name.strip()}
+
+# Execução das ferramentas: pool para chamadas bloqueantes e limites de concorrência por ferramenta
+TOOL_EXECUTOR_WORKERS = int(os.getenv('MCP_TOOL_EXECUTOR_WORKERS', "16"))
+TOOL_CONCURRENCY_DEFAULT = int(os.getenv('MCP_TOOL_CONCURRENCY_DEFAULT', "0"))  # 0 = sem limite
+TOOL_CONCURRENCY_LIMITS = os.getenv('MCP_TOOL_CONCURRENCY_LIMITS', "Youtube_BlogPost=2")  # ex.: Youtube_BlogPost=2,VerxRH_RunQuery=4
+
+# Controle de admissão das tools/call: limite por usuário (sub do JWT) com fila limitada
+# (os limites por ferramenta são os de MCP_TOOL_CONCURRENCY_LIMITS)
+ADMISSION_USER_LIMIT = int(os.getenv('MCP_ADMISSION_USER_LIMIT', "8"))  # chamadas simultâneas por usuário; 0 = sem limite
+ADMISSION_QUEUE_SIZE = int(os.getenv('MCP_ADMISSION_QUEUE_SIZE', "64"))  # chamadas aguardando vaga no worker
+ADMISSION_MAX_WAIT = float(os.getenv('MCP_ADMISSION_MAX_WAIT', "30"))  # segundos na fila antes de rejeitar
+ADMISSION_RETRY_AFTER = int(os.getenv('MCP_ADMISSION_RETRY_AFTER', "5"))  # segundos sugeridos no Retry-After
+
+# Jobs em segundo plano para ferramentas longas (nomes separados por vírgula)
+JOB_TOOLS = {name.strip() for name in os.getenv('MCP_JOB_TOOLS', "Youtube_BlogPost").split(",") if name.strip()}
+JOBS_MAX_WORKERS = int(os.getenv('MCP_JOBS_MAX_WORKERS', "2"))
+JOBS_MAX_PENDING = int(os.getenv('MCP_JOBS_MAX_PENDING', "50"))
+JOBS_RESULT_TTL = float(os.getenv('MCP_JOBS_RESULT_TTL', "3600"))  # segundos que o resultado fica disponível
+JOBS_DB_PATH = os.getenv('MCP_JOBS_DB', "")  # SQLite compartilhado entre workers ("" = apenas em memória)
+
+# Batch JSON-RPC no /mcp
+BATCH_MAX_SIZE = int(os.getenv('MCP_BATCH_MAX_SIZE', "50"))
+BATCH_MAX_CONCURRENCY = int(os.getenv('MCP_BATCH_MAX_CONCURRENCY', "8"))
+
+# Cache de resultados de ferramentas somente leitura: Ferramenta=ttl[:max_bytes_por_resultado[:user]]
+# ('*' no fim casa um prefixo; "user" separa os resultados por usuário)
+RESULT_CACHE_POLICIES = os.getenv('MCP_RESULT_CACHE_POLICIES', "Web_ScrapeUrl=600,Search_*=300,VerxRH_GetDBCatalog=3600")
+RESULT_CACHE_MAX_BYTES = int(os.getenv('MCP_RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))  # 0 desativa
+
+# Chamadas idênticas simultâneas compartilham uma única execução (além das ferramentas com política de cache)
+COALESCE_TOOLS = {name.strip() for name in os.getenv('MCP_COALESCE_TOOLS', "Youtube_BlogPost").split(",") if name.strip()}
+
+# Logging: nível padrão, níveis por logger (ex.: tools=DEBUG,auth=WARNING), formato ("json" ou "text"),
+# tamanho máximo das prévias de argumentos/resultados e capacidade da fila do escritor em segundo plano
+LOG_LEVEL = os.getenv('MCP_LOG_LEVEL', "INFO").upper()
+LOG_LEVELS = os.getenv('MCP_LOG_LEVELS', "")
+LOG_FORMAT = os.getenv('MCP_LOG_FORMAT', "json").lower()
+LOG_PREVIEW_CHARS = int(os.getenv('MCP_LOG_PREVIEW_CHARS', "500"))
+LOG_QUEUE_SIZE = int(os.getenv('MCP_LOG_QUEUE_SIZE', "10000"))
 
 server_name = "OAPV Tools MCP Server"
 server_version = "1.0.0"
\ No newline at end of file
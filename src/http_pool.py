@@ -0,0 +1,154 @@
+"""
+Pool HTTP único do processo para o tráfego de saída (Arcade e OpenAI).
+
+Um cliente síncrono (cliente Arcade e chamadas síncronas do LangChain, nas
+threads do pool de execução) e um assíncrono (chamadas async da OpenAI),
+com keep-alive, HTTP/2 quando o pacote `h2` está instalado e limite de
+requisições simultâneas por host. Cada requisição informa, pelo trace do
+httpcore, se abriu conexão nova ou reaproveitou uma do pool; os contadores
+por host aparecem em GET /stats, na seção `http_pool`.
+"""
+from typing import Any, Dict
+import asyncio, threading
+
+import httpx
+
+from src.config import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY, HTTP_MAX_PER_HOST, HTTP2_ENABLED,
+)
+from src.stats import register_stats
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ConnectionStats:
+    """Requests and newly opened connections per host (the rest reused a pooled connection)."""
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.connections: Dict[str, int] = {}
+        self.http2: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, new_connection: bool, http_version: str) -> None:
+        with self._lock:
+            self.requests[host] = self.requests.get(host, 0) + 1
+            if new_connection:
+                self.connections[host] = self.connections.get(host, 0) + 1
+            if http_version == "HTTP/2":
+                self.http2[host] = self.http2.get(host, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {
+                host: {
+                    "requests": requests,
+                    "new_connections": self.connections.get(host, 0),
+                    "reused": requests - self.connections.get(host, 0),
+                    "http2_requests": self.http2.get(host, 0),
+                }
+                for host, requests in self.requests.items()
+            }
+        requests = sum(host["requests"] for host in hosts.values())
+        reused = sum(host["reused"] for host in hosts.values())
+        return {
+            "requests": requests,
+            "reused": reused,
+            "reuse_ratio": reused / requests if requests else 0.0,
+            "http2": HTTP2_ENABLED and HTTP2_AVAILABLE,
+            "max_per_host": HTTP_MAX_PER_HOST,
+            "hosts": hosts,
+        }
+
+
+# Evento do trace do httpcore emitido apenas quando a requisição abre uma conexão nova
+NEW_CONNECTION_EVENT = "connection.connect_tcp.complete"
+
+
+class PooledTransport(httpx.HTTPTransport):
+    """HTTP transport with a per-host cap on concurrent requests and connection-reuse counters."""
+
+    def __init__(self, stats: ConnectionStats, max_per_host: int = 0, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.connection_stats = stats
+        self.max_per_host = max_per_host
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[host]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        opened = {"new": False}
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == NEW_CONNECTION_EVENT:
+                opened["new"] = True
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        if self.max_per_host <= 0:
+            response = super().handle_request(request)
+        else:
+            with self._slot(host):
+                response = super().handle_request(request)
+
+        self.connection_stats.record(host, opened["new"], response.extensions.get("http_version", b"").decode())
+        return response
+
+
+class AsyncPooledTransport(httpx.AsyncHTTPTransport):
+    """Async counterpart of PooledTransport."""
+
+    def __init__(self, stats: ConnectionStats, max_per_host: int = 0, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.connection_stats = stats
+        self.max_per_host = max_per_host
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        opened = {"new": False}
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == NEW_CONNECTION_EVENT:
+                opened["new"] = True
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        if self.max_per_host <= 0:
+            response = await super().handle_async_request(request)
+        else:
+            async with self._slots.setdefault(host, asyncio.Semaphore(self.max_per_host)):
+                response = await super().handle_async_request(request)
+
+        self.connection_stats.record(host, opened["new"], response.extensions.get("http_version", b"").decode())
+        return response
+
+
+connection_stats = ConnectionStats()
+
+_limits = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+)
+_http2 = HTTP2_ENABLED and HTTP2_AVAILABLE
+
+# Clientes compartilhados: as conexões (e o TLS) sobrevivem entre chamadas ao Arcade e à OpenAI
+http_client = httpx.Client(
+    transport=PooledTransport(connection_stats, HTTP_MAX_PER_HOST, limits=_limits, http2=_http2)
+)
+http_async_client = httpx.AsyncClient(
+    transport=AsyncPooledTransport(connection_stats, HTTP_MAX_PER_HOST, limits=_limits, http2=_http2)
+)
+
+register_stats("http_pool", connection_stats.stats)
@@ -0,0 +1,123 @@
+"""
+Tabela das chamadas de ferramenta em andamento, por sessão + id JSON-RPC.
+
+Permite que `notifications/cancelled` interrompa de fato a chamada: a task
+asyncio é cancelada (o que também encerra o stream do LangGraph) e os
+ganchos registrados pelas camadas inferiores liberam o que não é asyncio,
+como a consulta em execução no MariaDB (KILL QUERY) ou o job em segundo plano.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio, time
+
+from src.logs import mcp_logger
+from src.stats import register_stats
+
+
+DEFAULT_SESSION = "default"
+
+
+class RequestCancelledError(Exception):
+    """The request was cancelled by the client (notifications/cancelled)."""
+
+
+@dataclass
+class InFlightCall:
+    session_id: Hashable
+    request_id: Any
+    tool_name: str
+    task: Optional[asyncio.Task] = None
+    started_at: float = field(default_factory=time.monotonic)
+    cancel_requested: bool = False
+    reason: Optional[str] = None
+    hooks: Dict[int, Tuple[str, Callable[[], Any], bool]] = field(default_factory=dict)
+
+
+# Chamada em andamento no contexto atual (propagada às threads por run_blocking)
+current_call: ContextVar[Optional[InFlightCall]] = ContextVar("current_call", default=None)
+
+_hook_ids = count()
+
+
+def register_cancel_hook(description: str, callback: Callable[[], Any], blocking: bool = False) -> Callable[[], None]:
+    """Register a callback that frees a resource if the current call is cancelled.
+
+    Blocking callbacks (e.g. a KILL QUERY) run in a thread. Returns a function
+    that unregisters the hook once the resource is released; outside a
+    tracked call this is a no-op.
+    """
+    call = current_call.get()
+    if call is None:
+        return lambda: None
+
+    hook_id = next(_hook_ids)
+    call.hooks[hook_id] = (description, callback, blocking)
+    return lambda: call.hooks.pop(hook_id, None)
+
+
+class InFlightRequests:
+    """In-flight tool calls keyed by (session, JSON-RPC id)."""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[Hashable, Any], InFlightCall] = {}
+        self.cancelled = 0
+
+    async def run(self, session_id: Hashable, request_id: Any, tool_name: str,
+                  call_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a tool call as a cancellable task registered under (session, id)."""
+        key = (session_id, request_id)
+        call = InFlightCall(session_id, request_id, tool_name)
+
+        async def tracked():
+            current_call.set(call)
+            return await call_factory()
+
+        call.task = asyncio.create_task(tracked())
+        self._calls[key] = call
+        try:
+            return await call.task
+        except asyncio.CancelledError:
+            if call.cancel_requested:
+                raise RequestCancelledError(f"Request {request_id} cancelled: {call.reason or 'no reason given'}")
+            raise
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    async def cancel(self, session_id: Hashable, request_id: Any, reason: Optional[str] = None) -> bool:
+        """Cancel an in-flight call, running its cleanup hooks. False when nothing matches."""
+        call = self._calls.get((session_id, request_id))
+        if call is None or call.task is None or call.task.done():
+            mcp_logger.info(f"Cancel for request {request_id} (session {session_id}) ignored: not in flight")
+            return False
+
+        call.cancel_requested, call.reason = True, reason
+        hooks = list(call.hooks.values())
+        call.task.cancel()
+
+        freed: List[str] = [f"task of tool '{call.tool_name}'"]
+        for description, callback, blocking in hooks:
+            try:
+                if blocking:
+                    await asyncio.to_thread(callback)
+                else:
+                    callback()
+                freed.append(description)
+            except Exception as e:
+                mcp_logger.warning(f"Failed to free {description} of request {request_id}: {str(e)}")
+
+        self.cancelled += 1
+        mcp_logger.info(
+            f"Request {request_id} (session {session_id}) cancelled after "
+            f"{time.monotonic() - call.started_at:.2f}s ({reason or 'no reason given'}); freed: {', '.join(freed)}"
+        )
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._calls), "cancelled": self.cancelled}
+
+
+inflight_requests = InFlightRequests()
+register_stats("inflight", inflight_requests.stats)
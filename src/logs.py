@@ -1,11 +1,214 @@
-import logging
+"""
+Logging do servidor: não bloqueante, com nível por logger e saída em JSON lines.
+
+Os loggers só colocam o registro em uma fila (QueueHandler); a formatação e a
+escrita acontecem em uma thread de fundo (QueueListener), fora do event loop.
+Mensagens usam o estilo '%s' do logging, então nada é formatado quando o nível
+está desativado, e `preview()` limita o tamanho de argumentos/resultados.
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+import atexit, copy, json, logging, os, queue, sys
+
+from src.config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_PREVIEW_CHARS, LOG_QUEUE_SIZE
+from src.stats import register_stats
+
+
+# Id JSON-RPC da requisição em andamento (propagado às threads por run_blocking)
+request_id_var: ContextVar[Optional[Any]] = ContextVar("log_request_id", default=None)
+
+
+class Preview:
+    """Lazy, size-capped rendering of a payload; only formatted if the record is emitted."""
+
+    __slots__ = ("payload", "limit")
+
+    def __init__(self, payload: Any, limit: int = LOG_PREVIEW_CHARS):
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if isinstance(self.payload, str):
+            if len(self.payload) > self.limit:
+                return f"{self.payload[:self.limit]}... ({len(self.payload)} chars)"
+            return self.payload
+
+        try:
+            text, truncated = _bounded_json(self.payload, self.limit)
+        except Exception as e:
+            # Uma prévia com erro não pode derrubar o registro
+            return f"<{type(self.payload).__name__}: preview failed: {e!r}>"[:self.limit]
+        return f"{text}... (truncated)" if truncated else text
+
+
+class _PreviewFull(Exception):
+    pass
+
+
+def _bounded_json(payload: Any, limit: int) -> Tuple[str, bool]:
+    """JSON text of payload, rendered only up to limit chars: (text, truncated).
+
+    Stops walking as soon as the budget is spent, so the cost of a preview does
+    not grow with the size of a tool result (it runs on the event loop).
+    """
+    parts: List[str] = []
+    size = 0
+
+    def emit(text: str) -> None:
+        nonlocal size
+        parts.append(text)
+        size += len(text)
+        if size > limit:
+            raise _PreviewFull
+
+    def walk(value: Any) -> None:
+        if isinstance(value, dict):
+            emit("{")
+            for index, (key, item) in enumerate(value.items()):
+                emit(", " if index else "")
+                emit(json.dumps(str(key), ensure_ascii=False) + ": ")
+                walk(item)
+            emit("}")
+        elif isinstance(value, (list, tuple)):
+            emit("[")
+            for index, item in enumerate(value):
+                emit(", " if index else "")
+                walk(item)
+            emit("]")
+        elif value is None or isinstance(value, (bool, int, float)):
+            emit(json.dumps(value))
+        else:
+            # Strings e demais objetos (str()): só o trecho que ainda cabe na prévia
+            text = value if isinstance(value, str) else str(value)
+            emit(json.dumps(text[:limit - size + 1], ensure_ascii=False))
+
+    try:
+        walk(payload)
+    except _PreviewFull:
+        return "".join(parts)[:limit], True
+    return "".join(parts), False
+
+
+def preview(payload: Any, limit: int = LOG_PREVIEW_CHARS) -> Preview:
+    return Preview(payload, limit)
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, request_id, message (and exc)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Enqueue records without formatting them; capture the context the writer cannot see."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Escritor atrasado: descarta em vez de bloquear o event loop
+            ContextQueueHandler.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.request_id = request_id_var.get()
+        if isinstance(record.args, tuple) and any(isinstance(arg, Preview) for arg in record.args):
+            # O registro já vai ser emitido: a prévia é renderizada aqui, antes que o payload
+            # mude (ou seja liberado) enquanto espera na fila do escritor
+            record.args = tuple(str(arg) if isinstance(arg, Preview) else arg for arg in record.args)
+        if record.exc_info:
+            # O traceback precisa ser lido na thread que gerou o registro
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(value: str) -> Dict[str, str]:
+    """Parse 'tools=DEBUG,auth=WARNING' into logger -> level."""
+    levels: Dict[str, str] = {}
+    for item in value.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "json":
+        return JSONLinesFormatter()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s')
+
+
+_listener: Optional[QueueListener] = None
+_records: Optional[queue.Queue] = None
+
+
+def _start_listener() -> None:
+    """(Re)create the queue and its writer thread and attach them to the root logger."""
+    global _listener, _records
+
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(LOG_QUEUE_SIZE)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_build_formatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, ContextQueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(ContextQueueHandler(records))
+
+    _records = records
+    _listener = QueueListener(records, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def logging_stats() -> Dict[str, Any]:
+    return {
+        "queued": _records.qsize() if _records is not None else 0,
+        "dropped": ContextQueueHandler.dropped,
+        "level": LOG_LEVEL,
+        "levels": _parse_levels(LOG_LEVELS),
+        "format": LOG_FORMAT,
+    }
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def setup_logging() -> None:
+    """Configure levels and the non-blocking pipeline (called once, on import)."""
+    logging.getLogger().setLevel(LOG_LEVEL)
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _start_listener()
+    atexit.register(_stop_listener)
+    # Threads não sobrevivem ao fork dos workers do Gunicorn (preload): cada worker sobe o seu escritor
+    os.register_at_fork(after_in_child=_start_listener)
+    register_stats("logging", logging_stats)
+
+
+setup_logging()
 
-# Configuração do logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s\n'
-)
 mcp_logger = logging.getLogger('mcp_server')
 auth_logger = logging.getLogger('auth')
 tools_logger = logging.getLogger('tools')
-agent_logger = logging.getLogger('agent')
\ No newline at end of file
+agent_logger = logging.getLogger('agent')
@@ -0,0 +1,80 @@
+"""
+Medição de memória por processo (Linux, via /proc/<pid>/smaps_rollup).
+
+RSS conta as páginas compartilhadas em cada processo; PSS divide as páginas
+compartilhadas entre os processos que as usam, e é a métrica certa para
+comparar workers com e sem preload (copy-on-write).
+
+Uso (resumo do master do gunicorn e seus workers):
+  python -m src.memory              # lê ./run/gunicorn.pid
+  python -m src.memory <pid_master>
+"""
+from typing import Dict, List, Optional
+import os, resource, sys
+
+
+def process_memory(pid: str = "self") -> Dict[str, float]:
+    """Return rss, pss, shared and private memory of a process, in MB."""
+    fields: Dict[str, float] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024
+    except OSError:
+        # Fallback fora do Linux: apenas o pico de RSS do processo atual
+        if pid != "self":
+            return {}
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss": maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)}
+
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def format_memory(memory: Dict[str, float]) -> str:
+    return ", ".join(f"{key}={value:.1f}MB" for key, value in memory.items())
+
+
+def child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children", "r") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv:
+        master_pid = int(argv[0])
+    else:
+        with open("./run/gunicorn.pid", "r") as f:
+            master_pid = int(f.read().strip())
+
+    workers = child_pids(master_pid)
+    total_pss = 0.0
+
+    for label, pid in [("master", master_pid)] + [("worker", pid) for pid in workers]:
+        memory = process_memory(str(pid))
+        total_pss += memory.get("pss", 0)
+        print(f"{label:<7} {pid:>7}  {format_memory(memory)}")
+
+    if workers:
+        worker_private = sum(process_memory(str(pid)).get("private", 0) for pid in workers) / len(workers)
+        print(f"{len(workers)} worker(s), PSS total={total_pss:.1f}MB, privado médio por worker={worker_private:.1f}MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Métricas em processo no formato de exposição do Prometheus (GET /metrics).
+
+Sem dependências nem coletor externo: histogramas, contadores e gauges
+simples, mais as estatísticas já registradas em src.stats (caches, pools,
+filas), publicadas como gauges `mcp_stat{section=...,key=...}`.
+Cada worker do Gunicorn expõe as próprias métricas.
+"""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
+
+from src.stats import collect_stats
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return self.header() + list(self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Sem labels a série existe desde o início (ex.: gauge em 0)
+        self._values: Dict[LabelValues, float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in list(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por combinação de labels: contagem por bucket (+Inf no fim), soma e total
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect_left(self.buckets, value)] += 1
+            totals[0] += value
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Iterator[str]:
+        for key, (counts, totals) in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {totals[0]}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}"
+
+
+_metrics: List[_Metric] = []
+
+
+def _register(metric: _Metric) -> _Metric:
+    _metrics.append(metric)
+    return metric
+
+
+def _flatten(prefix: str, value: Any) -> Iterator[Tuple[str, float]]:
+    """Numeric leaves of a stats dict, with nested keys joined by '.'."""
+    if isinstance(value, bool):
+        yield prefix, float(value)
+    elif isinstance(value, (int, float)):
+        yield prefix, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(f"{prefix}.{key}" if prefix else str(key), item)
+
+
+def _stats_samples(stats_provider: Callable[[], Dict[str, Any]]) -> List[str]:
+    lines = [
+        "# HELP mcp_stat Internal counters from GET /stats (caches, pools, queues)",
+        "# TYPE mcp_stat gauge",
+    ]
+    for section, values in stats_provider().items():
+        for key, value in _flatten("", values):
+            lines.append(f"mcp_stat{_labels(('section', 'key'), (section, key))} {value}")
+    return lines
+
+
+def render_metrics(stats_provider: Optional[Callable[[], Dict[str, Any]]] = collect_stats) -> str:
+    """Render every metric (plus the stats registry) in the Prometheus text format."""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    if stats_provider is not None:
+        lines.extend(_stats_samples(stats_provider))
+    return "\n".join(lines) + "\n"
+
+
+request_duration = _register(Histogram(
+    "mcp_request_duration_seconds", "Latency of HTTP requests by MCP method and tool", ("method", "tool")
+))
+span_duration = _register(Histogram(
+    "mcp_span_duration_seconds", "Latency of each request phase by span and tool", ("span", "tool")
+))
+requests_in_flight = _register(Gauge(
+    "mcp_requests_in_flight", "HTTP requests currently being handled"
+))
+request_errors = _register(Counter(
+    "mcp_request_errors_total", "JSON-RPC error responses by method, tool and error code", ("method", "tool", "code")
+))
+jwt_verification_duration = _register(Histogram(
+    "mcp_jwt_verification_seconds", "Cost of verifying the bearer token by cache result (hit, negative_hit, verified, rejected)",
+    ("result",), buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01),
+))
+admission_queue_depth = _register(Gauge(
+    "mcp_admission_queue_depth", "tools/call requests waiting for a slot by scope (user or tool)", ("scope",)
+))
+admission_wait = _register(Histogram(
+    "mcp_admission_wait_seconds", "Time tools/call requests waited for a slot by scope and tool", ("scope", "tool")
+))
+admission_rejections = _register(Counter(
+    "mcp_admission_rejections_total", "tools/call requests rejected for lack of a slot by scope, reason and tool", ("scope", "reason", "tool")
+))
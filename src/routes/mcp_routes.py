@@ -1,54 +1,85 @@
 from fastapi import APIRouter, Request, Depends
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi.responses import Response
+from typing import Any, Hashable, List, Optional, Tuple
+import asyncio
 from src.utils import create_error_response
-from src.logs import mcp_logger
-from src.schemas.mcp_schemas import MCPRequest, MCPErrorCode
+from src.logs import mcp_logger, preview, request_id_var
+from src.tracing import OTHER, label_request, span
+from src.schemas.mcp_schemas import MCPEnvelope, MCPErrorCode
+from src.inflight import DEFAULT_SESSION
+from src.codec import ORJSONResponse, CodecError, decode_request, convert_request
 from src.services import tools_service
 from src.auth.jwt_handler import verify_token
-from src.config import AUTH_REQUIRED
+from src.config import AUTH_REQUIRED, BATCH_MAX_SIZE, BATCH_MAX_CONCURRENCY, DEFAULT_USER_ID
+
+# Métodos com label próprio nas métricas (os demais, vindos do cliente, viram "other")
+METRIC_METHODS = {
+    "initialize", "notifications/initialized", "notifications/cancelled", "tools/list", "tools/call", "jobs/get",
+}
 
 async def get_mcp_info():
     """Handle GET /mcp requests - Returns server information"""
-    return JSONResponse(content=tools_service.get_server_info())
+    return ORJSONResponse(content=tools_service.get_server_info())
 
 async def get_token_data(token_data: dict = Depends(verify_token)):
     """Dependency to get token data if AUTH_REQUIRED is True"""
     return token_data if AUTH_REQUIRED else None
 
-async def handle_mcp_request(request: Request, token_data: Optional[dict] = Depends(get_token_data)):
-    """Handle POST /mcp requests - Process MCP method calls"""
-    try:
-        data = await request.json()
-        mcp_request = MCPRequest(**data)
-        method = mcp_request.method
-        request_id = mcp_request.id or 0
-    except ValueError as e:
-        mcp_logger.error(f"Invalid request format: {str(e)}")
-        return create_error_response(0, MCPErrorCode.INVALID_REQUEST, str(e))
-    
+def _session_id(request: Request, token_data: Optional[dict]) -> Tuple[str, str]:
+    """Session that scopes request ids for notifications/cancelled"""
+    # Sempre dentro do sub verificado: o cabeçalho (controlado pelo cliente) só separa sessões do mesmo usuário
+    sub = str((token_data or {}).get("sub") or DEFAULT_SESSION)
+    return sub, request.headers.get("mcp-session-id") or DEFAULT_SESSION
+
+def _user_id(token_data: Optional[dict]) -> str:
+    """User that runs the call (JWT sub); requests without a JWT share the default user"""
+    return str((token_data or {}).get("sub") or DEFAULT_USER_ID)
+
+async def dispatch_mcp_request(mcp_request: MCPEnvelope, request: Request, batched: bool = False,
+                               session_id: Hashable = DEFAULT_SESSION, user_id: str = DEFAULT_USER_ID) -> Response:
+    """Dispatch a single MCP method call (alone or as an element of a batch)"""
+    method = mcp_request.method
+    request_id = mcp_request.id or 0
+
+    # Os logs desta requisição (inclusive nas threads do pool) carregam o id JSON-RPC
+    request_id_var.set(request_id)
+    label_request(method=method if method in METRIC_METHODS else OTHER)
+
     if method == "initialize":
-        return JSONResponse(content=tools_service.get_initialize_response(request_id))
+        return ORJSONResponse(content=tools_service.get_initialize_response(request_id))
     
     elif method == "notifications/initialized":
-        return JSONResponse(
+        return ORJSONResponse(
             content=tools_service.get_initialized_notification_response(request_id),
             status_code=202
         )
     
     elif method == "notifications/cancelled":
-        return JSONResponse(
+        await tools_service.cancel_request(session_id, mcp_request.params)
+        return ORJSONResponse(
             content=tools_service.get_cancellation_response(request_id),
             status_code=200
         )
     
     elif method == "tools/list":
-        return JSONResponse(content=tools_service.get_tools_list_response(request_id))
+        return await tools_service.get_tools_list_response(
+            request_id,
+            mcp_request.params,
+            None if batched else request.headers.get("if-none-match")
+        )
     
     elif method == "tools/call":
-        mcp_logger.info(f"Received tool call request - - - - - - - - - - \nRequest body: {mcp_request}\n")
+        mcp_logger.info("Received tool call request: %s", preview(mcp_request.params))
+
+        # Streamable HTTP: progresso e mensagens parciais como SSE quando o cliente aceita
+        # (em batch as respostas voltam juntas em um único array JSON)
+        if not batched and "text/event-stream" in request.headers.get("accept", ""):
+            return tools_service.stream_tool_request(request_id, mcp_request.params, session_id, user_id)
 
-        return await tools_service.handle_tool_request(request_id, mcp_request.params)
+        return await tools_service.handle_tool_request(request_id, mcp_request.params, session_id, user_id)
+
+    elif method == "jobs/get":
+        return tools_service.get_job_response(request_id, mcp_request.params)
     
     return create_error_response(
         request_id,
@@ -56,6 +87,66 @@ async def handle_mcp_request(request: Request, token_data: Optional[dict] = Depe
         f"Method {method} not supported"
     )
 
+def _is_notification(item: Any) -> bool:
+    return isinstance(item, dict) and ("id" not in item or str(item.get("method", "")).startswith("notifications/"))
+
+async def handle_batch_request(items: List[Any], request: Request, session_id: Hashable = DEFAULT_SESSION,
+                               user_id: str = DEFAULT_USER_ID) -> Response:
+    """Handle a JSON-RPC batch: elements run concurrently, responses return in one array"""
+    if not items:
+        return create_error_response(None, MCPErrorCode.INVALID_REQUEST, "Empty batch")
+
+    if len(items) > BATCH_MAX_SIZE:
+        return create_error_response(None, MCPErrorCode.INVALID_REQUEST, f"Batch too large (max {BATCH_MAX_SIZE})")
+
+    mcp_logger.info(f"Received batch with {len(items)} request(s)")
+    label_request(method="batch", tool="")
+
+    # Limita a concorrência dentro do batch (várias tools/call independentes)
+    slots = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def run(item: Any) -> Optional[bytes]:
+        try:
+            mcp_request = convert_request(item)
+        except CodecError as e:
+            return create_error_response(None, MCPErrorCode.INVALID_REQUEST, str(e)).body
+
+        try:
+            async with slots:
+                response = await dispatch_mcp_request(mcp_request, request, batched=True, session_id=session_id, user_id=user_id)
+        except Exception as e:
+            # Falha de um elemento não derruba o batch: vira o erro daquele elemento
+            mcp_logger.error(f"Error processing batch element {mcp_request.method}: {str(e)}")
+            response = create_error_response(mcp_request.id, MCPErrorCode.INTERNAL_ERROR, str(e))
+
+        # Notificações não produzem entrada na resposta do batch
+        return None if _is_notification(item) else response.body
+
+    bodies = [body for body in await asyncio.gather(*(run(item) for item in items)) if body is not None]
+
+    if not bodies:
+        return Response(status_code=202)
+
+    return Response(content=b"[" + b",".join(bodies) + b"]", media_type="application/json")
+
+async def handle_mcp_request(request: Request, token_data: Optional[dict] = Depends(get_token_data)):
+    """Handle POST /mcp requests - Process MCP method calls"""
+    try:
+        body = await request.body()
+        with span("parse"):
+            data = decode_request(body)
+    except CodecError as e:
+        mcp_logger.error(f"Invalid request format: {str(e)}")
+        return create_error_response(0, MCPErrorCode.INVALID_REQUEST, str(e))
+
+    session_id = _session_id(request, token_data)
+    user_id = _user_id(token_data)
+
+    if isinstance(data, list):
+        return await handle_batch_request(data, request, session_id, user_id)
+
+    return await dispatch_mcp_request(data, request, session_id=session_id, user_id=user_id)
+
 mcp_router = APIRouter(tags=["MCP"])
 
 mcp_router.get("/mcp")(get_mcp_info)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from src.codec import ORJSONResponse
+from typing import Optional
+from src.routes.mcp_routes import get_token_data
+from src.stats import collect_stats
+from src.metrics import render_metrics
+
+async def get_stats(token_data: Optional[dict] = Depends(get_token_data)):
+    """Handle GET /stats requests - Returns internal cache and pool counters"""
+    return ORJSONResponse(content=collect_stats())
+
+async def get_metrics(token_data: Optional[dict] = Depends(get_token_data)):
+    """Handle GET /metrics requests - Prometheus text exposition of latencies, errors and stats"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+stats_router = APIRouter(tags=["Stats"])
+
+stats_router.get("/stats")(get_stats)
+stats_router.get("/metrics")(get_metrics)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from enum import Enum
+import msgspec
 
 class MCPRequest(BaseModel):
     jsonrpc: str = "2.0"
@@ -8,8 +9,23 @@ class MCPRequest(BaseModel):
     params: Optional[Dict[str, Any]] = None
     id: Optional[int] = 0
 
+# Structs compilados (msgspec) usados na decodificação rápida do /mcp (ver src/codec.py)
+class MCPEnvelope(msgspec.Struct):
+    method: str
+    jsonrpc: str = "2.0"
+    params: Optional[Dict[str, Any]] = None
+    id: Union[int, str, None] = 0
+
+class ToolCallEnvelope(msgspec.Struct):
+    name: str
+    arguments: Dict[str, Any] = {}
+    meta: Optional[Dict[str, Any]] = msgspec.field(default=None, name="_meta")
+
 # Error codes enum
 class MCPErrorCode(Enum):
     METHOD_NOT_FOUND = -32601
     INTERNAL_ERROR = -32603
-    INVALID_REQUEST = -32600
\ No newline at end of file
+    INVALID_PARAMS = -32602
+    INVALID_REQUEST = -32600
+    REQUEST_CANCELLED = -32800
+    SERVER_BUSY = -32005
\ No newline at end of file
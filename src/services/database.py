@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
 from langchain_community.utilities import SQLDatabase
 from src.config import MARIADB_URI
+from src.inflight import register_cancel_hook
+from src.stats import register_stats
 
 # --------- Conexão com MariaDB ---------
 def build_engine() -> Engine:
@@ -19,8 +23,40 @@ def build_engine() -> Engine:
 
 ENGINE: Engine = build_engine()
 
+def pool_stats() -> dict:
+    pool = ENGINE.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+register_stats("db_pool", pool_stats)
+
 DB = SQLDatabase.from_uri(
     MARIADB_URI,
     sample_rows_in_table_info=2,
 )
 
+
+def kill_query(connection_id: int) -> None:
+    """Interrompe a consulta em execução em outra conexão (KILL QUERY)."""
+    with ENGINE.connect() as conn:
+        conn.execute(text(f"KILL QUERY {int(connection_id)}"))
+
+
+@contextmanager
+def cancellable_connection() -> Iterator[Connection]:
+    """Conexão cuja consulta em andamento é morta se a chamada MCP for cancelada."""
+    with ENGINE.connect() as conn:
+        connection_id = conn.execute(text("SELECT CONNECTION_ID()")).scalar()
+        unregister = register_cancel_hook(
+            f"MariaDB query on connection {connection_id}",
+            lambda: kill_query(connection_id),
+            blocking=True,
+        )
+        try:
+            yield conn
+        finally:
+            unregister()
@@ -0,0 +1,46 @@
+"""Validação do SQL gerado/recebido pelas ferramentas VerxRH (sem dependência do banco)."""
+import re
+
+from src.logs import tools_logger
+
+
+def _enforce_allowed_tables(sql: str) -> None:
+    """Função mantida para compatibilidade, mas não faz mais verificações
+    já que o controle de acesso é feito via schema seguro e permissões do usuário."""
+    # O controle agora é feito via schema seguro e permissões do usuário
+    pass
+
+
+def _validate_select_only(sql: str) -> str:
+    # Logs de debug (formatados só quando o nível DEBUG está ativo)
+    tools_logger.debug("SQL recebido para validação: '%s'", sql)
+    tools_logger.debug("Primeiros 10 caracteres (representação): %r", sql[:10])
+    
+    # Remover marcadores de código Markdown se presentes
+    if sql.startswith('```'):
+        # Encontra o final do bloco de código
+        end_marker = sql.rfind('```')
+        if end_marker > 3:  # Certifica-se de que há um marcador de fim
+            # Extrai apenas o conteúdo entre os marcadores
+            # Pula a primeira linha se contiver apenas ```sql ou similar
+            lines = sql[3:end_marker].strip().split('\n')
+            if lines[0].strip().lower() in ['sql', 'mysql', 'mariadb']:
+                sql = '\n'.join(lines[1:]).strip()
+            else:
+                sql = '\n'.join(lines).strip()
+            tools_logger.debug("SQL após remoção de marcadores Markdown: '%s'", sql)
+    
+    # Normalizar a string removendo espaços extras e caracteres invisíveis
+    normalized_sql = sql.strip()
+    
+    # Verificar se começa com SELECT
+    if not re.match(r"(?i)^\s*select\b", normalized_sql, re.IGNORECASE):
+        tools_logger.debug("ERRO: SQL não começa com SELECT: '%s'", normalized_sql)
+        raise ValueError("Somente consultas SELECT são permitidas.")
+    
+    # Impõe LIMIT se não houver
+    if not re.search(r"\blimit\s+\d+\s*;?\s*$", normalized_sql, re.IGNORECASE):
+        normalized_sql = normalized_sql.rstrip().rstrip(";") + " LIMIT 200;"
+        tools_logger.debug("SQL com LIMIT adicionado: '%s'", normalized_sql)
+    
+    return normalized_sql
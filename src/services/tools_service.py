@@ -1,8 +1,18 @@
-from src.utils import create_error_response
-from src.tools.base import handle_tool_call, raw_tools, ToolCallParams
+from typing import Any, AsyncIterator, Dict, Hashable, Optional
+import asyncio
+from fastapi.responses import Response, StreamingResponse
+from src.utils import create_error_response, create_success_response
+from src.tools.base import handle_tool_call
+from src.codec import convert_tool_call, dumps
+from src.tools.loader import toolkit_loader
+from src.tools.jobs import job_manager
+from src.tools.admission import AdmissionRejectedError
+from src.tools.progress import progress_notification, progress_sink
+from src.inflight import DEFAULT_SESSION, RequestCancelledError, inflight_requests
+from src.tools.catalog import InvalidCursorError
 from src.logs import tools_logger
 from src.schemas.mcp_schemas import MCPErrorCode
-from src.config import server_name, server_version
+from src.config import server_name, server_version, TOOLKITS_WARM_UP_TIMEOUT, DEFAULT_USER_ID
 
 def get_server_info():
     """Get server information and capabilities"""
@@ -52,6 +62,14 @@ def get_cancellation_response(request_id: int):
         "result": None
     }
 
+async def cancel_request(session_id: Hashable, params: Optional[dict] = None) -> bool:
+    """Cancel the in-flight tool call named by notifications/cancelled"""
+    params = params or {}
+    if params.get("requestId") is None:
+        tools_logger.warning("notifications/cancelled without requestId ignored")
+        return False
+    return await inflight_requests.cancel(session_id, params["requestId"], params.get("reason"))
+
 def get_initialized_notification_response(request_id: int):
     """Get initialized notification response"""
     return {
@@ -60,35 +78,116 @@ def get_initialized_notification_response(request_id: int):
         "result": None
     }
 
-def get_tools_list_response(request_id: int):
-    """Get list of available tools"""
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+async def get_tools_list_response(request_id: int, params: Optional[dict] = None, if_none_match: Optional[str] = None) -> Response:
+    """Get list of available tools (pre-serialized page, ETag and cursor aware)"""
+    cursor = (params or {}).get("cursor")
+
     # Log básico da solicitação
-    tools_logger.info(f"Solicitação de listagem de ferramentas (request_id: {request_id})")
-    
-    return {
-        "id": request_id,
-        "jsonrpc": "2.0",
-        "result": {
-            "tools": [
-                {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "inputSchema": tool.args_schema.model_json_schema() if hasattr(tool, 'args_schema') else {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-                for tool in raw_tools
-            ]
-        }
-    }
+    tools_logger.info(f"Solicitação de listagem de ferramentas (request_id: {request_id}, cursor: {cursor})")
+
+    # No modo lazy, aguarda o aquecimento dos toolkits para não listar um catálogo parcial
+    if not toolkit_loader.ready and not await toolkit_loader.wait_until_ready(TOOLKITS_WARM_UP_TIMEOUT):
+        tools_logger.warning("Toolkits ainda carregando: retornando catálogo parcial")
+
+    try:
+        page = toolkit_loader.catalog.page(cursor)
+    except InvalidCursorError as e:
+        return create_error_response(request_id, MCPErrorCode.INVALID_PARAMS, str(e))
+
+    if _etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers={"ETag": page.etag})
+
+    return Response(
+        content=page.render(request_id),
+        media_type="application/json",
+        headers={"ETag": page.etag}
+    )
 
-async def handle_tool_request(request_id: int, params: dict):
-    """Handle tool execution request"""
+async def handle_tool_request(request_id: int, params: dict, session_id: Hashable = DEFAULT_SESSION,
+                              user_id: str = DEFAULT_USER_ID):
+    """Handle tool execution request (admission-controlled, cancellable through notifications/cancelled)"""
     try:
-        params = ToolCallParams(**params or {})
-        return await handle_tool_call(request_id, params.name, params.arguments)
+        params = convert_tool_call(params)
+        progress_token = (params.meta or {}).get("progressToken")
+        return await inflight_requests.run(
+            session_id,
+            request_id,
+            params.name,
+            lambda: handle_tool_call(request_id, params.name, params.arguments, progress_token, user_id)
+        )
+    except RequestCancelledError as e:
+        return create_error_response(request_id, MCPErrorCode.REQUEST_CANCELLED, str(e))
+    except AdmissionRejectedError as e:
+        return create_error_response(
+            request_id,
+            MCPErrorCode.SERVER_BUSY,
+            str(e),
+            data={"retryAfter": e.retry_after},
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         tools_logger.error(f"Error processing tool call: {str(e)}")
         return create_error_response(request_id, MCPErrorCode.INTERNAL_ERROR, str(e))
+
+
+def _sse_event(data: bytes) -> bytes:
+    return b"event: message\ndata: " + data + b"\n\n"
+
+async def _stream_tool_call(request_id: int, params: Optional[dict], session_id: Hashable, user_id: str) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    events: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    progress_token = ((params or {}).get("_meta") or {}).get("progressToken", request_id)
+
+    def sink(progress, total, message):
+        # O progresso pode ser reportado de uma thread do pool de execução
+        notification = progress_notification(progress_token, progress, total, message)
+        loop.call_soon_threadsafe(events.put_nowait, notification)
+
+    async def run():
+        progress_sink.set(sink)
+        return await handle_tool_request(request_id, params, session_id, user_id)
+
+    call = asyncio.create_task(run())
+    try:
+        while not call.done():
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({next_event, call}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield _sse_event(dumps(next_event.result()))
+            else:
+                next_event.cancel()
+
+        while not events.empty():
+            yield _sse_event(dumps(events.get_nowait()))
+
+        yield _sse_event(call.result().body)
+    finally:
+        # Cliente desconectou antes do fim
+        if not call.done():
+            call.cancel()
+
+def stream_tool_request(request_id: int, params: Optional[dict], session_id: Hashable = DEFAULT_SESSION,
+                        user_id: str = DEFAULT_USER_ID) -> StreamingResponse:
+    """Handle tool execution as a Streamable HTTP (SSE) response: progress notifications, then the result"""
+    return StreamingResponse(
+        _stream_tool_call(request_id, params, session_id, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def get_job_response(request_id: int, params: Optional[dict] = None):
+    """Get the state (and result, when finished) of a background job"""
+    job_id = (params or {}).get("jobId")
+    if not job_id:
+        return create_error_response(request_id, MCPErrorCode.INVALID_PARAMS, "Missing jobId")
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return create_error_response(request_id, MCPErrorCode.INVALID_PARAMS, f"Job {job_id} not found")
+
+    return create_success_response(request_id, job)
@@ -0,0 +1,14 @@
+"""Registro das estatísticas internas (caches, filas, pools) expostas em GET /stats."""
+from typing import Any, Callable, Dict
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Register a callable returning a dict of counters under a name."""
+    _providers[name] = provider
+
+
+def collect_stats() -> Dict[str, Any]:
+    """Collect the current counters of every registered provider."""
+    return {name: provider() for name, provider in _providers.items()}
@@ -0,0 +1,185 @@
+"""
+Controle de admissão das tools/call em cada worker.
+
+Antes de executar, a chamada precisa de uma vaga do seu usuário (sub do JWT;
+requisições sem JWT dividem a vaga do usuário padrão). Sem vaga, espera em
+uma fila limitada até o prazo; com a fila cheia ou o prazo vencido, a chamada
+é rejeitada na hora com um erro JSON-RPC e `Retry-After`, em vez de ocupar o
+pool de execução (e o pool do MariaDB) atrás das chamadas de um único cliente.
+
+A mesma fila (SlotQueue) limita as execuções por ferramenta, no tool_limiter
+(src/tools/execution.py). Jobs em segundo plano seguram a vaga do usuário até
+terminar (AdmissionSlot.detach).
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict
+import asyncio, time
+
+from src.config import ADMISSION_USER_LIMIT, ADMISSION_QUEUE_SIZE, ADMISSION_MAX_WAIT, ADMISSION_RETRY_AFTER
+from src.logs import tools_logger
+from src.metrics import admission_queue_depth, admission_rejections, admission_wait
+from src.stats import register_stats
+
+
+class AdmissionRejectedError(Exception):
+    """The worker is saturated for this user or tool; the client should retry later."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    key: str
+    tool: str
+    future: "asyncio.Future[None]"
+
+
+class AdmissionSlot:
+    """A held slot; detach() hands its release to a longer-lived owner, e.g. a background job."""
+
+    def __init__(self, release: Callable[[], None]):
+        self._release = release
+        self.detached = False
+
+    def detach(self) -> Callable[[], None]:
+        self.detached = True
+        return self._release
+
+
+class SlotQueue:
+    """Per-key concurrency limit with a bounded FIFO wait queue and deadline (limit 0 = unlimited)."""
+
+    # Label `scope` das métricas e texto das rejeições
+    scope = "key"
+
+    def __init__(self, max_queue: int = 64, max_wait: float = 30.0, retry_after: int = 5):
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.in_flight: Dict[str, int] = {}
+        self._waiters: Deque[_Waiter] = deque()
+
+    def limit_for(self, key: str) -> int:
+        raise NotImplementedError
+
+    def _has_slot(self, key: str) -> bool:
+        limit = self.limit_for(key)
+        return limit <= 0 or self.in_flight.get(key, 0) < limit
+
+    def _enter(self, key: str) -> None:
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+        self.admitted += 1
+
+    def _leave(self, key: str) -> None:
+        self.in_flight[key] -= 1
+        if not self.in_flight[key]:
+            del self.in_flight[key]
+
+        # A vaga liberada vai para os primeiros da fila que couberem (antes de chamadas novas)
+        for waiter in list(self._waiters):
+            if self._has_slot(waiter.key):
+                self._waiters.remove(waiter)
+                self._enter(waiter.key)
+                waiter.future.set_result(None)
+        admission_queue_depth.set(len(self._waiters), scope=self.scope)
+
+    def _reject(self, reason: str, key: str, tool: str) -> AdmissionRejectedError:
+        self.rejected += 1
+        admission_rejections.inc(scope=self.scope, reason=reason, tool=tool)
+        tools_logger.warning(f"Tool '{tool}' call rejected by the {self.scope} limit of '{key}' ({reason})")
+        return AdmissionRejectedError(
+            f"Server busy ({reason}) for {self.scope} {key}; retry in {self.retry_after}s", self.retry_after
+        )
+
+    async def _acquire(self, key: str, tool: str) -> None:
+        # Vagas livres que ninguém da fila consegue usar podem ser ocupadas na hora
+        if self._has_slot(key):
+            self._enter(key)
+            admission_wait.observe(0.0, scope=self.scope, tool=tool)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", key, tool)
+
+        waiter = _Waiter(key, tool, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self.queued += 1
+        admission_queue_depth.set(len(self._waiters), scope=self.scope)
+        start = time.perf_counter()
+        try:
+            # O shield impede que o prazo cancele uma vaga já concedida
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done():
+                # Vaga concedida junto com o prazo/cancelamento: devolve
+                self._leave(key)
+            else:
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+                admission_queue_depth.set(len(self._waiters), scope=self.scope)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("timeout", key, tool) from None
+            raise
+        finally:
+            admission_wait.observe(time.perf_counter() - start, scope=self.scope, tool=tool)
+
+    @asynccontextmanager
+    async def admit(self, key: str, tool: str) -> AsyncIterator[AdmissionSlot]:
+        """Hold a slot of key until the block ends, or until the detached release is called."""
+        await self._acquire(key, tool)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._leave(key)
+
+        slot = AdmissionSlot(release)
+        try:
+            yield slot
+        finally:
+            if not slot.detached:
+                release()
+
+    def waiting(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for waiter in self._waiters:
+            counts[waiter.key] = counts.get(waiter.key, 0) + 1
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+        }
+
+
+class AdmissionController(SlotQueue):
+    """Per-user concurrency limit of tools/call (the user slot is held by background jobs until they end)."""
+
+    scope = "user"
+
+    def __init__(self, user_limit: int, max_queue: int = 64, max_wait: float = 30.0, retry_after: int = 5):
+        super().__init__(max_queue, max_wait, retry_after)
+        self.user_limit = user_limit
+
+    def limit_for(self, key: str) -> int:
+        return self.user_limit
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "in_flight_users": len(self.in_flight), "user_limit": self.user_limit}
+
+
+admission_controller = AdmissionController(ADMISSION_USER_LIMIT, ADMISSION_QUEUE_SIZE, ADMISSION_MAX_WAIT, ADMISSION_RETRY_AFTER)
+register_stats("admission", admission_controller.stats)
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading, time
+
+from arcadepy import AuthenticationError, PermissionDeniedError
+
+from src.config import AUTH_CACHE_TTL, AUTH_CACHE_MAX_ENTRIES
+from src.logs import tools_logger
+from src.stats import register_stats
+
+
+class AuthorizationCache:
+    """TTL + LRU cache of completed Arcade authorizations.
+
+    Keyed by (user_id, auth_key), where auth_key identifies the auth provider
+    and scopes of a tool, so every tool sharing the same grant hits the same
+    entry.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_authorized(self, user_id: str, auth_key: Optional[Hashable]) -> bool:
+        """True when a completed authorization is cached and not expired."""
+        key = (user_id, auth_key)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+
+            if expires_at is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False
+
+    def mark_authorized(self, user_id: str, auth_key: Optional[Hashable]) -> None:
+        if self.ttl <= 0:
+            return
+
+        key = (user_id, auth_key)
+        with self._lock:
+            self._entries[key] = self.clock() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str, auth_key: Optional[Hashable]) -> None:
+        with self._lock:
+            if self._entries.pop((user_id, auth_key), None) is not None:
+                self.invalidations += 1
+                tools_logger.info(f"Authorization cache invalidated for {user_id} ({auth_key})")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
+
+
+def is_auth_error(error: BaseException) -> bool:
+    """Whether a tool execution failure means the cached authorization is no longer valid."""
+    if isinstance(error, (AuthenticationError, PermissionDeniedError)):
+        return True
+    message = str(error).lower()
+    return "authoriz" in message or "unauthenticated" in message or "invalid_grant" in message
+
+
+authorization_cache = AuthorizationCache(AUTH_CACHE_TTL, AUTH_CACHE_MAX_ENTRIES)
+register_stats("authorization_cache", authorization_cache.stats)
@@ -1,75 +1,51 @@
 from fastapi.responses import JSONResponse
-from langchain_arcade import ToolManager
-from typing import Dict, Any
-from pydantic import BaseModel
+from src.codec import ORJSONResponse
+from typing import Dict, Any, Awaitable, Callable, Optional
+from pydantic import BaseModel, Field
 from uuid import uuid4
-import json, time
+import asyncio, time
 
 from src.utils import create_error_response, create_success_response, MCPErrorCode
-from src.logs import tools_logger
-from src.config import ARCADE_API_KEY
+from src.logs import tools_logger, preview
+from src.config import AGENT_TOOLS, JOB_TOOLS, COALESCE_TOOLS, DEFAULT_USER_ID
 from src.tools.tools_args import _clean_arguments
-from src.agent.graph import get_graph_with_tool
-from src.tools.youtube_tools import Youtube_BlogPost
-# from src.tools.verx_rh_tools import VerxRH_GetDBCatalog, VerxRH_RunQuery
+from src.tools.loader import tools_manager, toolkit_loader
+from src.tools.auth_cache import authorization_cache, is_auth_error
+from src.tools.result_cache import call_key, result_cache
+from src.tools.singleflight import single_flight
+from src.tools.admission import AdmissionRejectedError, AdmissionSlot, admission_controller
+from src.tools.execution import run_blocking, tool_limiter
+from src.tools.jobs import job_manager, JobQueueFullError, JOB_COMPLETED
+from src.tools.progress import progress_sink, report_progress
+from src.inflight import register_cancel_hook
+from src.agent.graph import get_graph_with_tool, release_thread
+from src.tracing import UNKNOWN_TOOL, label_request, span
 
 
 # Request/Response models
 class ToolCallParams(BaseModel):
     name: str
     arguments: Dict[str, Any]
+    meta: Optional[Dict[str, Any]] = Field(default=None, alias="_meta")
 
 
-# Initialize tool manager
-tools_manager = ToolManager(
-    api_key=ARCADE_API_KEY,
-)
-
-
-# Initialize tools
-raw_tools = tools_manager.init_tools(
-    toolkits=[
-        "Web",
-        "Search",
-        "Google",
-        "Microsoft",
-        "Github",
-        "Slack",
-        "Linkedin",
-        "X",
-        "Confluence",
-        "Jira",
-        "Trello",
-        "Notion",
-        "Dropbox",
-        "Reddit",
-    ],
-)
-
-raw_tools.append(Youtube_BlogPost)
-
-# raw_tools.append(VerxRH_GetDBCatalog)
-# raw_tools.append(VerxRH_RunQuery)
-
-# As ferramentas personalizadas estão em raw_tools, mas precisamos garantir
-# que sejam executadas corretamente mesmo sem estarem no tools_manager
+# As ferramentas (Arcade e personalizadas) ficam no registro do toolkit_loader,
+# carregado de forma concorrente e sob demanda (ver src/tools/toolkits.py)
 
 
 # Função auxiliar para encontrar uma ferramenta pelo nome
 def find_tool_by_name(name: str):
-    """Find a tool by its name in raw_tools."""
-    for tool in raw_tools:
-        if tool.name == name:
-            return tool
-    return None
+    """Find a tool by its name in the tool registry."""
+    entry = toolkit_loader.get(name)
+    return entry.tool if entry else None
 
 
-def _create_auth_response(request_id: int, tool_name: str, url: str) -> JSONResponse:
+def _create_auth_response(request_id: int, tool_name: str, url: str) -> ORJSONResponse:
     """Create authentication response for tools requiring authentication."""
 
     tools_logger.info(f"Creating authentication response for tool: {tool_name}")
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "error": {
                 "code": -32003,
@@ -100,103 +76,232 @@ def _format_result(result: Any) -> str:
         return str(result) if result is not None else ""
 
 
-async def handle_tool_call(request_id: int, tool_name: str, arguments: Dict[str, Any]) -> JSONResponse:
-    """Handle tool execution requests"""
+def _describe_message(message) -> str:
+    """Short text of an agent step: the tool calls requested or the partial content."""
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        return "Chamando " + ", ".join(tool_call["name"] for tool_call in tool_calls)
+    content = getattr(message, "content", None)
+    if content is None and isinstance(message, dict):
+        content = message.get("content")
+    return str(content or "")
+
+
+async def _run_agent(tool_name: str, cleaned_arguments: Dict[str, Any], thread_id: str, user_id: str) -> str:
+    """Run the tool through the LangGraph agent and return the final message text."""
+    # A compilação (no primeiro uso) é síncrona: roda fora do event loop
+    with span("graph_build"):
+        graph_with_tool = await run_blocking(get_graph_with_tool, tool_name)
+
+    # Define as mensagens com o input do usuário
+    inputs = {
+        "messages": [
+            {
+                "role": "user",
+                "content": f"Execute a ferramenta {tool_name} com os seguintes argumentos: {str(cleaned_arguments)}",
+            }
+        ],
+    }
+
+    tools_logger.debug("Message: %s", preview(inputs))
+
+    # Configuração com IDs de encadeamento e usuário para fins de autorização
+    config = {"configurable": {"thread_id": thread_id, "user_id": user_id}}
+
+    # Executa o grafo e transmite as saídas (os nós síncronos rodam em threads do langgraph).
+    # Cada passo vira uma notificação de progresso (enviada ao cliente quando a resposta é SSE)
+    try:
+        step = 0
+        async for chunk in graph_with_tool.astream(inputs, config=config, stream_mode="values"):
+            tools_logger.debug("Chunk: %s", preview(chunk["messages"][-1]))
+            step += 1
+            report_progress(step, None, _describe_message(chunk["messages"][-1]))
+    finally:
+        # O grafo é reutilizado entre chamadas: descarta o estado desta execução
+        release_thread(graph_with_tool, thread_id)
+
+    return chunk["messages"][-1].content
+
+
+async def _coalesced(flight_key: Optional[Any], tool_name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    """Run call(), sharing the execution with identical concurrent calls when flight_key is set."""
+    if flight_key is None:
+        return await call()
+
+    result, shared = await single_flight.do(flight_key, tool_name, call)
+    if shared:
+        tools_logger.info(f"Tool '{tool_name}' result shared with an identical concurrent call")
+    return result
+
+
+async def _submit_job(request_id: int, entry, cleaned_arguments: Dict[str, Any],
+                      executor_kwargs: Dict[str, Any], progress_token: Any,
+                      flight_key: Optional[Any] = None, slot: Optional[AdmissionSlot] = None) -> JSONResponse:
+    """Start the tool as a background job and answer with the job handle (the user slot is held until it ends)."""
+
+    async def execute() -> Any:
+        async with tool_limiter.limit(entry.name):
+            with span("execute", entry.name):
+                return await entry.executor(cleaned_arguments, **executor_kwargs)
+
+    async def run() -> Dict[str, Any]:
+        # Jobs idênticos enviados ao mesmo tempo aguardam a mesma execução
+        result = await _coalesced(flight_key, entry.name, execute)
+        return {"content": [{"type": "text", "text": _format_result(result)}]}
+
+    try:
+        job = job_manager.submit(entry.name, run, progress_token)
+    except JobQueueFullError as e:
+        return create_error_response(request_id, MCPErrorCode.INTERNAL_ERROR, str(e))
+
+    if slot is not None:
+        # O job conta no limite do usuário enquanto estiver na fila ou rodando, não só até ser aceito
+        release = slot.detach()
+        job.task.add_done_callback(lambda task: release())
+
+    # Resposta em stream (SSE): o progresso do job já chega ao cliente, então aguarda o resultado.
+    # O shield mantém o job rodando se o cliente desconectar.
+    if progress_sink.get() is not None:
+        # Cancelamento explícito (notifications/cancelled) interrompe o job também
+        unregister = register_cancel_hook(f"background job {job.id}", job.task.cancel)
+        try:
+            await asyncio.shield(job.task)
+        finally:
+            unregister()
+        if job.status == JOB_COMPLETED:
+            return create_success_response(request_id, job.result)
+        return create_error_response(request_id, MCPErrorCode.INTERNAL_ERROR, job.error or f"Job {job.status}")
+
+    return create_success_response(request_id, {
+        "content": [{
+            "type": "text",
+            "text": f"Job {job.id} iniciado para a ferramenta {entry.name}. Consulte o resultado com jobs/get."
+        }],
+        "structuredContent": {"jobId": job.id, "status": job.status, "progressToken": job.progress_token},
+    })
+
+
+async def handle_tool_call(request_id: int, tool_name: str, arguments: Dict[str, Any], progress_token: Any = None,
+                           user_id: str = DEFAULT_USER_ID) -> JSONResponse:
+    """Handle tool execution requests on behalf of user_id (JWT sub, or the default user)"""
     thread_id = str(uuid4())
     start_time = time.time()
 
-    # TODO: the user_id should be related to the logged user...
-    user_id = "gabrielsilveira.web@gmail.com"
-    
-    tools_logger.info(f"[{thread_id}] Tool '{tool_name}' called with arguments: {json.dumps(arguments, indent=2)}")
+    tools_logger.info("[%s] Tool '%s' called with arguments: %s", thread_id, tool_name, preview(arguments))
 
-    tool = find_tool_by_name(tool_name)
-    if not tool:
+    with span("lookup"):
+        entry = await toolkit_loader.aget(tool_name)
+    # Só nomes do registro viram label de métrica
+    label_request(tool=entry.name if entry else UNKNOWN_TOOL)
+    if not entry:
         return create_error_response(request_id, MCPErrorCode.METHOD_NOT_FOUND, f"Tool {tool_name} not found")
 
-    tools_logger.info(f"Tool found: {tool}")
+    tool = entry.tool
+
+    tools_logger.debug("Tool found: %s", tool)
+
+    with span("arguments"):
+        cleaned_arguments = await _clean_arguments(tool, arguments, tool_name, request_id, thread_id, schema=entry.schema, plan=entry.plan)
+    if isinstance(cleaned_arguments, JSONResponse):
+        # Argumento incompatível com o schema da ferramenta
+        return cleaned_arguments
+
+    tools_logger.debug("[%s] Cleaned arguments for tool '%s': %s", thread_id, tool_name, preview(cleaned_arguments))
+
+    # Ferramentas sem provedor conhecido usam o próprio nome como chave
+    auth_key = entry.auth_key or (tool_name,)
+
+    # Ferramentas somente leitura com política de cache: mesmos argumentos, mesmo resultado.
+    # Resultados de ferramentas autorizadas nunca são compartilhados entre usuários
+    cache_policy = result_cache.policy_for(tool_name)
+    scope = user_id if entry.requires_auth or (cache_policy is not None and cache_policy.per_user) else None
+    if cache_policy is not None:
+        cache_key = result_cache.key(tool_name, cleaned_arguments, scope)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            payload, age = cached
+            tools_logger.info(f"[{thread_id}] Tool '{tool_name}' served from result cache ({age:.0f}s old)")
+            return create_success_response(request_id, {**payload, "_meta": {"cache": "hit", "age": round(age, 3)}})
+
+    # Chamadas idênticas simultâneas (mesma ferramenta, argumentos e escopo de usuário) executam uma vez só
+    flight_key = call_key(tool_name, cleaned_arguments, scope) if cache_policy is not None or tool_name in COALESCE_TOOLS else None
+
+    # Vaga do usuário no worker (jobs a seguram até terminar); AdmissionRejectedError sobe até o
+    # tools_service (429). Respostas servidas pelo cache de resultados não ocupam vaga
+    async with admission_controller.admit(user_id, tool_name) as slot:
+        try:
+            # Verifica se a ferramenta requer autorização (resolvido uma única vez no registro)
+            if entry.requires_auth:
+                tools_logger.info(f"Auth is required for tool: {tool_name}")
+
+                # Autorizações concluídas ficam em cache por usuário + provedor/escopos
+                if authorization_cache.is_authorized(user_id, auth_key):
+                    tools_logger.info(f"Auth status for tool '{tool_name}' served from cache")
+                else:
+                    with span("authorize"):
+                        auth_response = await run_blocking(tools_manager.authorize, tool_name, user_id)
 
-    cleaned_arguments = await _clean_arguments(tool, arguments, tool_name, request_id, thread_id)
+                    tools_logger.info("Auth response ID: %s, status: %s", auth_response.id, auth_response.status)
+                    tools_logger.debug("Complete auth response: %s", auth_response)
 
-    tools_logger.info(f"[{thread_id}] Cleaned arguments for tool '{tool_name}': {json.dumps(cleaned_arguments, indent=2)}")
+                    if auth_response.status != "completed":
+                        return _create_auth_response(request_id, tool_name, auth_response.url)
 
-    try:
-        # Verifica se é uma ferramenta personalizada (adicionada manualmente a raw_tools)
-        is_custom_tool = tool_name in ["Youtube_BlogPost", "VerxRH_GetDBCatalog", "VerxRH_RunQuery"]
-        
-        # Verifica se a ferramenta requer autorização
-        if not is_custom_tool and tools_manager.requires_auth(tool_name):
-            tools_logger.info(f"Auth is required for tool: {tool_name}")
-
-            auth_response = tools_manager.authorize(tool_name, user_id)
-
-            tools_logger.info(f"Auth response ID: {auth_response.id}")
-            tools_logger.info(f"Auth response Status: {auth_response.status}")
-            tools_logger.info(f"Complete auth response: {auth_response}")
-        
-            if auth_response.status != "completed":
-                return _create_auth_response(request_id, tool_name, auth_response.url)
-
-            # executa a ferramenta (autorizada)
-            graph_with_tool = get_graph_with_tool(tool_name)
-
-            # Define as mensagens com o input do usuário
-            inputs = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": f"Execute a ferramenta {tool_name} com os seguintes argumentos: {str(cleaned_arguments)}",
-                    }
-                ],
-            }
+                    authorization_cache.mark_authorized(user_id, auth_key)
 
-            tools_logger.info(f"Message: {inputs}")
-            
-            # Configuração com IDs de encadeamento e usuário para fins de autorização
-            config = {"configurable": {"thread_id": thread_id, "user_id": user_id}}
-            
-            # Executa o grafo e transmite as saídas.
-            for chunk in graph_with_tool.stream(inputs, config=config, stream_mode="values"):
-                tools_logger.info(f"Chunk: {chunk}")
-
-            return create_success_response(request_id, {
-                "content": [{"type": "text", "text": chunk["messages"][-1].content}]
-            })
-        else:
-            # Executa a ferramenta (sem autorização)
-            # Para ferramentas personalizadas, execute usando o método invoke conforme documentação
-            if is_custom_tool:
-                tools_logger.info(f"Executando ferramenta personalizada: {tool_name}")
-                
-                # Tratamento específico para cada ferramenta personalizada
-                if tool_name == "VerxRH_RunQuery":
-                    # VerxRH_RunQuery espera um argumento 'sql'
-                    sql = cleaned_arguments.get("sql", "")
-                    result = tool.invoke({"sql": sql})
-                elif tool_name == "VerxRH_GetDBCatalog":
-                    # VerxRH_GetDBCatalog não espera argumentos
-                    result = tool.invoke({})
-                else:
-                    # Para outras ferramentas personalizadas
-                    result = tool.invoke(cleaned_arguments)
+                # Caminho do agente (opt-in por ferramenta): o LLM decide a chamada da ferramenta
+                if tool_name in AGENT_TOOLS:
+                    async def run_agent() -> str:
+                        async with tool_limiter.limit(tool_name):
+                            return await _run_agent(tool_name, cleaned_arguments, thread_id, user_id)
+
+                    text = await _coalesced(flight_key, tool_name, run_agent)
+                    return create_success_response(request_id, {
+                        "content": [{"type": "text", "text": text}]
+                    })
+
+                # Execução direta da ferramenta autorizada, no contexto de autorização do usuário
+                executor_kwargs = {"user_id": user_id}
             else:
-                # Para ferramentas do Arcade, use o método arun
-                result = await tool.arun(cleaned_arguments)
+                # Executa a ferramenta (sem autorização)
+                if entry.is_custom:
+                    tools_logger.info(f"Executando ferramenta personalizada: {tool_name}")
+
+                executor_kwargs = {}
+
+            # Ferramentas longas rodam como job em segundo plano: responde já com o identificador
+            if tool_name in JOB_TOOLS:
+                return await _submit_job(request_id, entry, cleaned_arguments, executor_kwargs, progress_token, flight_key, slot)
+
+            async def execute() -> Any:
+                async with tool_limiter.limit(tool_name):
+                    with span("execute"):
+                        return await entry.executor(cleaned_arguments, **executor_kwargs)
+
+            result = await _coalesced(flight_key, tool_name, execute)
 
-            tools_logger.info(f"Tool result: {result}")
-            
             tools_logger.info(
-                f"[{thread_id}] Tool '{tool_name}' completed in {time.time() - start_time:.2f}s with result: "
-                f"{json.dumps(result, indent=2) if result else 'None'}"
+                "[%s] Tool '%s' completed in %.2fs with result: %s",
+                thread_id, tool_name, time.time() - start_time, preview(result)
             )
-            
+
             # Formata o resultado e retorna a resposta de sucesso
             markdown_content = _format_result(result)
+            payload = {"content": [{"type": "text", "text": markdown_content}]}
+
+            if cache_policy is not None:
+                cached = result_cache.put(cache_key, cache_policy, payload)
+                return create_success_response(request_id, {**payload, "_meta": {"cache": "miss" if cached else "skip"}})
+
+            return create_success_response(request_id, payload)
+        except AdmissionRejectedError:
+            # Limite da ferramenta esgotado: vira 429 com Retry-After no tools_service
+            raise
+        except Exception as e:
+            tools_logger.error(f"[{thread_id}] Error executing tool '{tool_name}': {str(e)}")
 
-            return create_success_response(request_id, {
-                "content": [{"type": "text", "text": markdown_content}]
-            })
-    except Exception as e:
-        tools_logger.error(f"[{thread_id}] Error executing tool '{tool_name}': {str(e)}")
+            # Token revogado/expirado: a próxima chamada volta a consultar o Arcade
+            if entry.requires_auth and is_auth_error(e):
+                authorization_cache.invalidate(user_id, auth_key)
 
-        return create_error_response(request_id, MCPErrorCode.INTERNAL_ERROR, str(e))
\ No newline at end of file
+            return create_error_response(request_id, MCPErrorCode.INTERNAL_ERROR, str(e))
\ No newline at end of file
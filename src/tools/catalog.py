@@ -0,0 +1,89 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from hashlib import sha1
+import binascii
+from typing import Any, Dict, List, Optional
+import json
+
+from src.logs import tools_logger
+
+
+def _dumps(value: Any) -> bytes:
+    # Mesmo formato compacto usado pelo JSONResponse do Starlette
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a tools/list cursor is malformed or from an older catalog."""
+
+
+@dataclass
+class CatalogPage:
+    """One page of the tools/list result, serialized once."""
+    body: bytes
+    etag: str
+
+    def render(self, request_id: Any) -> bytes:
+        """Build the full JSON-RPC response around the pre-serialized result."""
+        return b'{"id":' + _dumps(request_id) + b',"jsonrpc":"2.0","result":' + self.body + b'}'
+
+
+class ToolCatalog:
+    """Pre-serialized, paginated tools/list catalog."""
+
+    def __init__(self, tools: List[Dict[str, Any]], page_size: int = 0):
+        self.page_size = page_size if page_size > 0 else max(len(tools), 1)
+        self.size = len(tools)
+        self.version = sha1(_dumps(tools)).hexdigest()[:16]
+        self.pages: List[CatalogPage] = []
+
+        chunks = [tools[i:i + self.page_size] for i in range(0, len(tools), self.page_size)] or [[]]
+        for index, chunk in enumerate(chunks):
+            result: Dict[str, Any] = {"tools": chunk}
+            if index + 1 < len(chunks):
+                result["nextCursor"] = self._encode_cursor(index + 1)
+            body = _dumps(result)
+            self.pages.append(CatalogPage(body=body, etag=f'W/"{self.version}-{sha1(body).hexdigest()[:16]}"'))
+
+    def _encode_cursor(self, index: int) -> str:
+        return urlsafe_b64encode(f"{self.version}:{index}".encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> int:
+        # O cursor vem do cliente: qualquer valor que não seja um cursor nosso é INVALID_PARAMS
+        if not isinstance(cursor, str):
+            raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+        try:
+            version, index = urlsafe_b64decode(cursor.encode()).decode().split(":")
+            index = int(index)
+        except (ValueError, UnicodeDecodeError, AttributeError, binascii.Error):
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+        if version != self.version or not 0 <= index < len(self.pages):
+            raise InvalidCursorError(f"Cursor {cursor} is no longer valid, restart the listing")
+
+        return index
+
+    def page(self, cursor: Optional[str] = None) -> CatalogPage:
+        """Return the page for a cursor (first page when cursor is empty)."""
+        return self.pages[self._decode_cursor(cursor) if cursor else 0]
+
+
+def build_catalog(registry, page_size: int = 0) -> ToolCatalog:
+    """Serialize the registry tools into a ToolCatalog."""
+    tools = [
+        {
+            "name": entry.name,
+            "description": entry.tool.description,
+            "inputSchema": entry.schema,
+        }
+        for entry in registry
+    ]
+
+    catalog = ToolCatalog(tools, page_size)
+
+    tools_logger.info(
+        f"Tool catalog {catalog.version} built: {catalog.size} tools in {len(catalog.pages)} page(s), "
+        f"{sum(len(p.body) for p in catalog.pages)} bytes"
+    )
+
+    return catalog
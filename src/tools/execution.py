@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio, contextvars, functools
+
+from src.config import (
+    TOOL_EXECUTOR_WORKERS, TOOL_CONCURRENCY_DEFAULT, TOOL_CONCURRENCY_LIMITS,
+    ADMISSION_QUEUE_SIZE, ADMISSION_MAX_WAIT, ADMISSION_RETRY_AFTER,
+)
+from src.stats import register_stats
+from src.tools.admission import SlotQueue
+
+
+# Pool limitado para as chamadas bloqueantes (crewai, MariaDB, cliente síncrono do Arcade):
+# o event loop do worker continua livre para atender as outras requisições
+blocking_executor = ThreadPoolExecutor(max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="tool-exec")
+
+# Pool usado por run_blocking no contexto atual (os jobs em segundo plano usam um pool próprio)
+current_executor: contextvars.ContextVar[ThreadPoolExecutor] = contextvars.ContextVar("current_executor", default=blocking_executor)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call in the bounded tool executor, preserving context vars."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(current_executor.get(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def parse_limits(value: str) -> Dict[str, int]:
+    """Parse 'Tool_A=2,Tool_B=4' into a dict of per-tool limits."""
+    limits: Dict[str, int] = {}
+    for item in value.split(","):
+        name, _, limit = item.partition("=")
+        if name.strip() and limit.strip():
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+class ToolConcurrencyLimiter(SlotQueue):
+    """Per-tool cap on concurrent executions within a worker (0 = unlimited).
+
+    Same rules as the per-user admission: a bounded wait queue and a deadline,
+    after which AdmissionRejectedError becomes a 429 with Retry-After.
+    """
+
+    scope = "tool"
+
+    def __init__(self, limits: Dict[str, int], default: int = 0,
+                 max_queue: int = 64, max_wait: float = 30.0, retry_after: int = 5):
+        super().__init__(max_queue, max_wait, retry_after)
+        self.limits = limits
+        self.default = default
+
+    def limit_for(self, tool_name: str) -> int:
+        return self.limits.get(tool_name, self.default)
+
+    def limit(self, tool_name: str):
+        """Hold an execution slot of the tool for the duration of the block."""
+        return self.admit(tool_name, tool_name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "executor_workers": blocking_executor._max_workers,
+            "in_flight": dict(self.in_flight),
+            "waiting": self.waiting(),
+            "limits": dict(self.limits),
+            "default_limit": self.default,
+        }
+
+
+tool_limiter = ToolConcurrencyLimiter(
+    parse_limits(TOOL_CONCURRENCY_LIMITS),
+    TOOL_CONCURRENCY_DEFAULT,
+    ADMISSION_QUEUE_SIZE,
+    ADMISSION_MAX_WAIT,
+    ADMISSION_RETRY_AFTER,
+)
+register_stats("tool_execution", tool_limiter.stats)
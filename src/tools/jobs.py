@@ -0,0 +1,217 @@
+"""
+Jobs em segundo plano para ferramentas longas (ex.: Youtube_BlogPost).
+
+O tools/call dessas ferramentas retorna imediatamente um identificador de job;
+a execução roda em um pool próprio e limitado, e o progresso fica registrado no
+job (e segue para o stream SSE da chamada, quando houver). O cliente consulta o
+progresso, o estado e o resultado, quando pronto, com o método `jobs/get`.
+
+Os jobs executam no worker que os recebeu. Com MCP_JOBS_DB definido, o estado
+é gravado em SQLite e pode ser consultado a partir de qualquer worker.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import uuid4
+import asyncio, json, os, sqlite3, threading, time
+
+from src.config import JOBS_MAX_WORKERS, JOBS_MAX_PENDING, JOBS_RESULT_TTL, JOBS_DB_PATH
+from src.logs import tools_logger
+from src.stats import register_stats
+from src.tools.execution import current_executor
+from src.tools.progress import progress_sink
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobQueueFullError(Exception):
+    """Too many jobs waiting for a worker."""
+
+
+@dataclass
+class Job:
+    id: str
+    tool_name: str
+    progress_token: Any
+    status: str = JOB_PENDING
+    progress: float = 0
+    total: Optional[float] = None
+    message: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "jobId": self.id,
+            "tool": self.tool_name,
+            "status": self.status,
+            "progress": self.progress,
+            "total": self.total,
+            "message": self.message,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+        if self.status == JOB_COMPLETED:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class SQLiteJobStore:
+    """Persist job state so any worker can answer jobs/get."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def save(self, job: Job) -> None:
+        data = json.dumps(job.to_dict(), ensure_ascii=False, default=str)
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO jobs (id, data, updated_at) VALUES (?, ?, ?)", (job.id, data, time.time()))
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def prune(self, older_than: float) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE updated_at < ?", (older_than,))
+
+
+class JobManager:
+    """Run long tools in a bounded pool, tracking their state and progress."""
+
+    def __init__(self, max_workers: int, max_pending: int, result_ttl: float, store: Optional[SQLiteJobStore] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-job")
+        self.jobs: Dict[str, Job] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for job in self.jobs.values() if job.status == status)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+        if self.store is not None:
+            self.store.prune(cutoff)
+
+    def submit(self, tool_name: str, run: Callable[[], Awaitable[Any]], progress_token: Any = None) -> Job:
+        """Schedule run() as a background job and return its handle immediately."""
+        self._prune()
+
+        if self._count(JOB_PENDING) >= self.max_pending:
+            self.rejected += 1
+            raise JobQueueFullError(f"Too many pending jobs ({self.max_pending}), try again later")
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        job_id = uuid4().hex
+        job = Job(id=job_id, tool_name=tool_name, progress_token=progress_token if progress_token is not None else job_id)
+        self.jobs[job.id] = job
+        if self.store is not None:
+            self.store.save(job)
+
+        job.task = asyncio.create_task(self._run(job, run), name=f"job-{job.id}")
+        tools_logger.info(f"Job {job.id} queued for tool '{tool_name}'")
+        return job
+
+    def _sink(self, job: Job, forward=None):
+        """Progress sink that records the job progress (and forwards it to a waiting stream)."""
+        def report(progress: float, total: Optional[float], message: Optional[str]) -> None:
+            job.progress, job.total, job.message = progress, total, message
+            if self.store is not None:
+                self.store.save(job)
+            if forward is not None:
+                forward(progress, total, message)
+        return report
+
+    async def _run(self, job: Job, run: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            async with self._slots:
+                job.status, job.started_at = JOB_RUNNING, time.time()
+                if self.store is not None:
+                    self.store.save(job)
+
+                # As chamadas bloqueantes do job vão para o pool de jobs, não para o das requisições
+                current_executor.set(self.executor)
+                progress_sink.set(self._sink(job, progress_sink.get()))
+                job.result = await run()
+                job.status = JOB_COMPLETED
+                self.completed += 1
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+            raise
+        except Exception as e:
+            tools_logger.error(f"Job {job.id} ({job.tool_name}) failed: {str(e)}")
+            job.status, job.error = JOB_FAILED, str(e)
+            self.failed += 1
+        finally:
+            job.finished_at = time.time()
+            tools_logger.info(f"Job {job.id} {job.status} in {job.finished_at - job.created_at:.2f}s")
+            if self.store is not None:
+                self.store.save(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job state, from this worker or from the shared store."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is not None:
+            return self.store.load(job_id)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "pending": self._count(JOB_PENDING),
+            "running": self._count(JOB_RUNNING),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "retained": len(self.jobs),
+        }
+
+
+job_manager = JobManager(
+    JOBS_MAX_WORKERS,
+    JOBS_MAX_PENDING,
+    JOBS_RESULT_TTL,
+    SQLiteJobStore(JOBS_DB_PATH) if JOBS_DB_PATH else None,
+)
+register_stats("jobs", job_manager.stats)
@@ -0,0 +1,52 @@
+from arcadepy import Arcade
+from langchain_arcade import ToolManager
+
+from src.config import (
+    ARCADE_API_KEY,
+    TOOLS_LIST_PAGE_SIZE,
+    TOOLKITS_LOAD_MODE,
+    TOOLKITS_PRELOAD,
+    TOOLKITS_MAX_WORKERS,
+    TOOLKITS_RETRY_DELAY,
+    TOOLKITS_RETRY_MAX_DELAY,
+    TOOLS_SNAPSHOT_PATH,
+    TOOLS_SNAPSHOT_MAX_AGE,
+)
+from src.http_pool import http_client
+from src.stats import register_stats
+from src.tools.toolkits import TOOLKITS, ToolkitLoader
+from src.tools.youtube_tools import Youtube_BlogPost
+# from src.tools.verx_rh_tools import VerxRH_GetDBCatalog, VerxRH_RunQuery
+
+
+CUSTOM_TOOLS = [
+    Youtube_BlogPost,
+    # VerxRH_GetDBCatalog,
+    # VerxRH_RunQuery,
+]
+
+
+# Cliente Arcade único, compartilhado por todos os ToolManagers do processo, sobre o pool HTTP do processo
+arcade_client = Arcade(api_key=ARCADE_API_KEY, http_client=http_client)
+
+# Initialize tool manager
+tools_manager = ToolManager(client=arcade_client)
+
+toolkit_loader = ToolkitLoader(
+    arcade_client,
+    TOOLKITS,
+    CUSTOM_TOOLS,
+    page_size=TOOLS_LIST_PAGE_SIZE,
+    max_workers=TOOLKITS_MAX_WORKERS,
+    snapshot_path=TOOLS_SNAPSHOT_PATH,
+    snapshot_max_age=TOOLS_SNAPSHOT_MAX_AGE,
+    retry_delay=TOOLKITS_RETRY_DELAY,
+    retry_max_delay=TOOLKITS_RETRY_MAX_DELAY,
+)
+
+# No master do gunicorn (preload) a carga fica com preload(), em when_ready, sobre um cliente descartável:
+# carregar aqui abriria conexões do pool compartilhado que todos os workers herdariam no fork
+if TOOLKITS_LOAD_MODE == "eager" and not TOOLKITS_PRELOAD and not toolkit_loader.ready:
+    toolkit_loader.load_all()
+
+register_stats("toolkits", toolkit_loader.status)
@@ -0,0 +1,25 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+
+# Destino do progresso da execução atual: o stream SSE da requisição ou o job em segundo plano
+ProgressSink = Callable[[float, Optional[float], Optional[str]], None]
+progress_sink: ContextVar[Optional[ProgressSink]] = ContextVar("progress_sink", default=None)
+
+
+def progress_notification(progress_token: Any, progress: float, total: Optional[float] = None,
+                          message: Optional[str] = None) -> Dict[str, Any]:
+    """Build an MCP notifications/progress message."""
+    params = {"progressToken": progress_token, "progress": progress, "total": total, "message": message}
+    return {
+        "jsonrpc": "2.0",
+        "method": "notifications/progress",
+        "params": {key: value for key, value in params.items() if value is not None},
+    }
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Report progress of the running tool; a no-op when nobody is listening."""
+    sink = progress_sink.get()
+    if sink is not None:
+        sink(progress, total, message)
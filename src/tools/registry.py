@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.tools.execution import run_blocking
+from src.tools.tools_args import ArgumentPlan, compile_plan
+
+
+TOOL_KIND_CUSTOM = "custom"
+TOOL_KIND_ARCADE = "arcade"
+
+EMPTY_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {},
+    "required": []
+}
+
+ToolExecutor = Callable[..., Awaitable[Any]]  # (arguments, user_id=None)
+
+
+@dataclass
+class ToolEntry:
+    """Pre-computed metadata for a single tool."""
+    name: str
+    tool: Any
+    kind: str
+    requires_auth: bool
+    schema: Dict[str, Any]
+    executor: ToolExecutor
+    # Provedor e escopos da autorização exigida (compartilhados entre ferramentas)
+    auth_key: Optional[Tuple[str, ...]] = None
+    # Normalização dos argumentos compilada a partir do schema
+    plan: Optional[ArgumentPlan] = None
+
+    @property
+    def is_custom(self) -> bool:
+        return self.kind == TOOL_KIND_CUSTOM
+
+
+def _compile_schema(tool) -> Dict[str, Any]:
+    """Compile the tool argument schema to JSON schema once."""
+    if hasattr(tool, 'args_schema'):
+        return tool.args_schema.model_json_schema()
+    return dict(EMPTY_INPUT_SCHEMA)
+
+
+def _make_custom_executor(tool) -> ToolExecutor:
+    """Build the coroutine that executes a custom tool with cleaned arguments."""
+    # Ferramentas do Arcade executam pelo cliente (make_arcade_executor, passado pelo ToolkitLoader).
+    # Para ferramentas personalizadas, execute usando o método invoke conforme documentação
+    # (síncrono: roda no pool de execução, fora do event loop)
+    if tool.name == "VerxRH_RunQuery":
+        # VerxRH_RunQuery espera um argumento 'sql'
+        async def run_query(arguments: Dict[str, Any], user_id: Optional[str] = None) -> Any:
+            return await run_blocking(tool.invoke, {"sql": arguments.get("sql", "")})
+        return run_query
+
+    if tool.name == "VerxRH_GetDBCatalog":
+        # VerxRH_GetDBCatalog não espera argumentos
+        async def run_catalog(arguments: Dict[str, Any], user_id: Optional[str] = None) -> Any:
+            return await run_blocking(tool.invoke, {})
+        return run_catalog
+
+    async def run_custom(arguments: Dict[str, Any], user_id: Optional[str] = None) -> Any:
+        return await run_blocking(tool.invoke, arguments)
+    return run_custom
+
+
+class ToolExecutionError(Exception):
+    """An Arcade tool ran but reported a failure."""
+
+
+def make_arcade_executor(client, tool_name: str) -> ToolExecutor:
+    """Execute an Arcade tool directly through the client.
+
+    Unlike the LangChain wrapper, it does not authorize again before each
+    call: the caller checks the authorization (and caches it) beforehand.
+    """
+    async def run_arcade(arguments: Dict[str, Any], user_id: Optional[str] = None) -> Any:
+        kwargs = {"tool_name": tool_name, "input": arguments}
+        if user_id is not None:
+            kwargs["user_id"] = user_id
+
+        response = await run_blocking(client.tools.execute, **kwargs)
+
+        if response.success and response.output is not None:
+            return response.output.value
+
+        error = response.output.error if response.output is not None else None
+        raise ToolExecutionError(error.message if error is not None else f"Tool {tool_name} failed")
+    return run_arcade
+
+
+def create_entry(tool, kind: str, requires_auth: bool = False,
+                 auth_key: Optional[Tuple[str, ...]] = None,
+                 executor: Optional[ToolExecutor] = None) -> ToolEntry:
+    """Create a registry entry, compiling the tool schema, argument plan and executor."""
+    if executor is None:
+        if kind == TOOL_KIND_ARCADE:
+            raise ValueError(f"Arcade tool {tool.name} needs an executor (make_arcade_executor)")
+        executor = _make_custom_executor(tool)
+
+    schema = _compile_schema(tool)
+    return ToolEntry(
+        name=tool.name,
+        tool=tool,
+        kind=kind,
+        requires_auth=requires_auth,
+        schema=schema,
+        executor=executor,
+        auth_key=auth_key if requires_auth else None,
+        plan=compile_plan(schema, tool.name),
+    )
+
+
+class ToolRegistry:
+    """Index of tools by name, built once at startup."""
+
+    def __init__(self):
+        self._entries: Dict[str, ToolEntry] = {}
+
+    def add(self, entry: ToolEntry) -> ToolEntry:
+        """Add an already compiled entry."""
+        self._entries[entry.name] = entry
+        return entry
+
+    def get(self, name: str) -> Optional[ToolEntry]:
+        """Return the entry for a tool name, or None if unknown."""
+        return self._entries.get(name)
+
+    @property
+    def tools(self) -> List[Any]:
+        return [entry.tool for entry in self._entries.values()]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[ToolEntry]:
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import threading, time
+
+import orjson
+
+from src.codec import _default, dumps
+from src.config import RESULT_CACHE_POLICIES, RESULT_CACHE_MAX_BYTES
+from src.stats import register_stats
+
+
+DEFAULT_MAX_ENTRY_BYTES = 1024 * 1024
+
+CallKey = Tuple[str, Optional[str], bytes]
+
+
+def call_key(tool_name: str, arguments: Dict[str, Any], user_id: Optional[str] = None) -> CallKey:
+    """Identity of a tool call: tool, user scope and the canonical JSON of the cleaned arguments."""
+    canonical = orjson.dumps(arguments, default=_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return (tool_name, user_id, canonical)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Opt-in caching of a read-only tool: TTL, largest cacheable result and user scoping."""
+    ttl: float
+    max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES
+    per_user: bool = False
+
+
+def parse_policies(value: str) -> Dict[str, CachePolicy]:
+    """Parse 'Web_ScrapeUrl=600:2097152,Search_*=300,Gmail_ListEmails=60:65536:user'.
+
+    Each item is Tool=ttl[:max_entry_bytes[:user]]; a trailing '*' matches a prefix.
+    """
+    policies: Dict[str, CachePolicy] = {}
+    for item in value.split(","):
+        name, _, spec = item.partition("=")
+        if not name.strip() or not spec.strip():
+            continue
+        ttl, max_entry_bytes, scope = (spec.strip().split(":") + ["", ""])[:3]
+        policy = CachePolicy(
+            float(ttl),
+            int(max_entry_bytes) if max_entry_bytes else DEFAULT_MAX_ENTRY_BYTES,
+            scope.strip().lower() == "user",
+        )
+        policies[name.strip()] = policy
+    return policies
+
+
+@dataclass
+class _CachedResult:
+    result: Dict[str, Any]
+    size: int
+    created_at: float
+    expires_at: float
+
+
+class ResultCache:
+    """Size-bounded TTL + LRU cache of tool results.
+
+    Keyed by tool name + the canonical JSON of the cleaned arguments (and the
+    user, for per-user policies). Only tools with a policy are cached.
+    """
+
+    def __init__(self, policies: Dict[str, CachePolicy], max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.policies = policies
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+        self._entries: "OrderedDict[CallKey, _CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def policy_for(self, tool_name: str) -> Optional[CachePolicy]:
+        if self.max_bytes <= 0:
+            return None
+        policy = self.policies.get(tool_name)
+        if policy is not None:
+            return policy
+        for pattern, policy in self.policies.items():
+            if pattern.endswith("*") and tool_name.startswith(pattern[:-1]):
+                return policy
+        return None
+
+    def key(self, tool_name: str, arguments: Dict[str, Any], user_id: Optional[str] = None) -> CallKey:
+        """Cache key: same arguments in any order map to the same entry."""
+        return call_key(tool_name, arguments, user_id)
+
+    def _drop(self, key) -> None:
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def get(self, key) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (result, age in seconds) when cached and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.result, now - entry.created_at
+
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, policy: CachePolicy, result: Dict[str, Any]) -> bool:
+        """Store a result; False when it is larger than the policy (or the cache) allows."""
+        size = len(dumps(result))
+        if size > policy.max_entry_bytes or size > self.max_bytes:
+            self.oversized += 1
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            now = self.clock()
+            self._entries[key] = _CachedResult(result, size, now, now + policy.ttl)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "oversized": self.oversized,
+            "policies": sorted(self.policies),
+        }
+
+
+result_cache = ResultCache(parse_policies(RESULT_CACHE_POLICIES), RESULT_CACHE_MAX_BYTES)
+register_stats("result_cache", result_cache.stats)
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import asyncio
+
+from src.inflight import InFlightRequests
+from src.logs import tools_logger
+from src.stats import register_stats
+
+
+FLIGHT_SESSION = "single-flight"
+
+
+@dataclass
+class _Flight:
+    id: int
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls: one execution per key, shared by every caller.
+
+    The execution runs in its own task, so a caller that goes away (client
+    disconnect, notifications/cancelled) does not abort it for the others;
+    it is cancelled, with its cleanup hooks, only when the last caller leaves.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._calls = InFlightRequests()
+        self._ids = count()
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, tool_name: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run call() unless an identical one is in flight; returns (result, shared)."""
+        flight = self._flights.get(key)
+        shared = flight is not None
+
+        if flight is None:
+            flight_id = next(self._ids)
+            # Registro próprio: os ganchos de cancelamento (ex.: KILL QUERY) pertencem à execução, não a um chamador
+            task = asyncio.create_task(self._calls.run(FLIGHT_SESSION, flight_id, tool_name, call))
+            flight = _Flight(flight_id, task)
+            self._flights[key] = flight
+            task.add_done_callback(lambda _, key=key, flight=flight: self._finish(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            tools_logger.info(f"Tool '{tool_name}' call coalesced with an identical one in flight ({flight.waiters} waiting)")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                self.abandoned += 1
+                await self._calls.cancel(FLIGHT_SESSION, flight.id, "all callers left")
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Marca a exceção como lida: sem chamadores, ninguém mais a consultaria
+            flight.task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / lookups if lookups else 0.0,
+            "abandoned": self.abandoned,
+        }
+
+
+single_flight = SingleFlight()
+register_stats("single_flight", single_flight.stats)
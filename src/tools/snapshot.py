@@ -0,0 +1,128 @@
+"""
+Snapshot local (JSON) das definições de ferramentas do Arcade.
+
+Permite que os workers iniciem em milissegundos, sem buscar as definições
+remotamente, e que o servidor suba mesmo com o Arcade fora do ar.
+
+Uso (regenera o snapshot):
+  python -m src.tools.snapshot
+  python -m src.tools.snapshot --path db/tools_snapshot.json --toolkits Web Slack
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import argparse, json, os, sys, tempfile, time
+
+from arcadepy.types import ToolDefinition
+
+from src.logs import tools_logger
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def dump_definitions(definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
+    return [definition.model_dump(mode="json", exclude_none=True) for definition in definitions]
+
+
+def load_definitions(items: List[Dict[str, Any]]) -> List[ToolDefinition]:
+    return [ToolDefinition.model_validate(item) for item in items]
+
+
+def read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    """Read a snapshot file, returning None when missing, corrupt, malformed or from another format."""
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        tools_logger.warning(f"Ignoring unreadable tools snapshot {path}: {str(e)}")
+        return None
+
+    if not isinstance(snapshot, dict) or not isinstance(snapshot.get("toolkits"), dict):
+        tools_logger.warning(f"Ignoring malformed tools snapshot {path}: expected an object with a \"toolkits\" map")
+        return None
+
+    if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        tools_logger.warning(
+            f"Ignoring tools snapshot {path}: format {snapshot.get('format_version')} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+        return None
+
+    return snapshot
+
+
+def snapshot_age(snapshot: Dict[str, Any]) -> float:
+    """Seconds since the snapshot was generated."""
+    return time.time() - snapshot.get("created_at", 0)
+
+
+def write_snapshot(path: str, toolkits: Dict[str, List[ToolDefinition]]) -> Dict[str, Any]:
+    """Atomically write the definitions of each toolkit to path."""
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": time.time(),
+        "created_at_iso": datetime.now(timezone.utc).isoformat(),
+        "toolkits": {toolkit: dump_definitions(definitions) for toolkit, definitions in toolkits.items()},
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Escrita atômica: vários workers podem atualizar o snapshot ao mesmo tempo
+    fd, tmp_path = tempfile.mkstemp(prefix=".tools_snapshot.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    tools_logger.info(
+        f"Tools snapshot written to {path}: {sum(len(d) for d in toolkits.values())} tools "
+        f"from {len(toolkits)} toolkit(s)"
+    )
+
+    return snapshot
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Não importa src.tools.loader: criaria (e, no modo eager, carregaria) o loader do servidor
+    from arcadepy import Arcade
+    from src.config import ARCADE_API_KEY, TOOLS_SNAPSHOT_PATH, TOOLKITS_MAX_WORKERS
+    from src.tools.toolkits import ToolkitLoader, TOOLKITS
+
+    parser = argparse.ArgumentParser(description="Regenera o snapshot de definições de ferramentas do Arcade")
+    parser.add_argument("--path", default=TOOLS_SNAPSHOT_PATH, help="Arquivo de saída")
+    parser.add_argument("--toolkits", nargs="+", default=TOOLKITS, help="Toolkits a incluir")
+    args = parser.parse_args(argv)
+
+    if not args.path:
+        print("Defina --path ou MCP_TOOLS_SNAPSHOT_PATH")
+        return 2
+
+    with Arcade(api_key=ARCADE_API_KEY) as client:
+        loader = ToolkitLoader(client, args.toolkits, [], max_workers=TOOLKITS_MAX_WORKERS)
+        loader.load_all()
+
+    for toolkit, info in loader.status()["toolkits"].items():
+        if info["error"]:
+            print(f"{toolkit}: ERRO {info['error']}")
+        else:
+            print(f"{toolkit}: {info['tools']} ferramentas em {info['seconds']:.2f}s")
+
+    if loader.errors:
+        print(f"Snapshot não gravado: {len(loader.errors)} toolkit(s) falharam")
+        return 1
+
+    write_snapshot(args.path, loader.definitions)
+    print(f"Snapshot gravado em {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+Carregamento das definições dos toolkits do Arcade (registro + catálogo do tools/list).
+
+Só a classe: importar este módulo não cria clientes nem busca nada. As
+instâncias do processo ficam em src/tools/loader.py; a CLI do snapshot
+(src/tools/snapshot.py) monta o próprio ToolkitLoader a partir daqui.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio, threading, time
+
+import httpx
+from arcadepy.types import ToolDefinition
+from langchain_arcade._utilities import wrap_arcade_tool
+
+from src.config import TOOLKITS_LOAD_MODE
+from src.logs import tools_logger
+from src.tools.registry import ToolEntry, ToolRegistry, create_entry, make_arcade_executor, TOOL_KIND_ARCADE, TOOL_KIND_CUSTOM
+from src.tools.catalog import ToolCatalog, build_catalog
+from src.tools.snapshot import read_snapshot, write_snapshot, load_definitions, snapshot_age
+
+
+TOOLKITS = [
+    "Web",
+    "Search",
+    "Google",
+    "Microsoft",
+    "Github",
+    "Slack",
+    "Linkedin",
+    "X",
+    "Confluence",
+    "Jira",
+    "Trello",
+    "Notion",
+    "Dropbox",
+    "Reddit",
+]
+
+
+def _auth_key(definition: ToolDefinition) -> Optional[Tuple[str, ...]]:
+    """Identify the authorization grant of a tool: provider plus sorted scopes."""
+    if definition.requirements is None or definition.requirements.authorization is None:
+        return None
+
+    authorization = definition.requirements.authorization
+    provider = authorization.provider_id or authorization.provider_type or authorization.id or ""
+    scopes = authorization.oauth2.scopes if authorization.oauth2 and authorization.oauth2.scopes else []
+    return (provider, *sorted(scopes))
+
+
+class ToolkitLoader:
+    """Loads Arcade toolkit definitions concurrently, eagerly or on demand.
+
+    Each toolkit is fetched once (in a thread pool, since the Arcade client is
+    synchronous) and compiled into registry entries. The registry and the
+    tools/list catalog are rebuilt and swapped atomically whenever a toolkit
+    finishes loading.
+
+    When a snapshot path is given, definitions are first read from the local
+    snapshot; a stale snapshot is refreshed in the background warm-up and
+    rewritten after a successful fetch.
+
+    The loader is ready only once every toolkit is loaded: the warm-up keeps
+    retrying the toolkits that failed, with exponential backoff, until then.
+    """
+
+    def __init__(
+        self,
+        client,
+        toolkits: List[str],
+        custom_tools: List[Any],
+        page_size: int = 0,
+        max_workers: int = 8,
+        snapshot_path: Optional[str] = None,
+        snapshot_max_age: float = 0,
+        retry_delay: float = 0,
+        retry_max_delay: float = 300,
+    ):
+        self.client = client
+        self.toolkits = list(toolkits)
+        self.custom_tools = list(custom_tools)
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.snapshot_path = snapshot_path
+        self.snapshot_max_age = snapshot_max_age
+        self.snapshot_loaded_age: Optional[float] = None
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.sources: Dict[str, str] = {}
+        self.definitions: Dict[str, List[ToolDefinition]] = {}
+        self._entries: Dict[str, List[ToolEntry]] = {}
+        self._toolkit_locks = {toolkit: threading.Lock() for toolkit in self.toolkits}
+        self._rebuild_lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._fetch_client = None
+        self._ready = threading.Event()
+        # Primeira carga concluída (mesmo parcial): o tools/list deixa de esperar
+        self._attempted = threading.Event()
+
+        self._custom_entries = [create_entry(tool, TOOL_KIND_CUSTOM) for tool in self.custom_tools]
+        self.registry: ToolRegistry = ToolRegistry()
+        self.catalog: ToolCatalog = ToolCatalog([])
+
+        if self.snapshot_path:
+            self._load_snapshot()
+
+        self._rebuild()
+        self._mark_ready()
+
+    # ------------------------------------------------------------------ estado
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def is_loaded(self, toolkit: str) -> bool:
+        return toolkit in self._entries
+
+    def failed(self) -> List[str]:
+        return [toolkit for toolkit in self.toolkits if not self.is_loaded(toolkit)]
+
+    def _mark_ready(self) -> None:
+        if not self.failed():
+            self._ready.set()
+            self._attempted.set()
+
+    def status(self) -> Dict[str, Any]:
+        """Per-toolkit load report (tools, seconds, error)."""
+        return {
+            "mode": TOOLKITS_LOAD_MODE,
+            "ready": self.ready,
+            "tools": len(self.registry),
+            "snapshot_age": self.snapshot_loaded_age,
+            "toolkits": {
+                toolkit: {
+                    "loaded": self.is_loaded(toolkit),
+                    "source": self.sources.get(toolkit),
+                    "tools": len(self._entries.get(toolkit, [])),
+                    "seconds": self.timings.get(toolkit),
+                    "error": self.errors.get(toolkit),
+                }
+                for toolkit in self.toolkits
+            },
+        }
+
+    # -------------------------------------------------------------- carregamento
+
+    def _fetch_definitions(self, toolkit: str) -> List[ToolDefinition]:
+        # Iterar a página percorre todas as páginas do toolkit
+        client = self._fetch_client or self.client
+        return list(client.tools.list(toolkit=toolkit))
+
+    def _compile(self, definitions: List[ToolDefinition]) -> List[ToolEntry]:
+        """Wrap definitions as LangChain tools and compile their registry entries."""
+        entries = []
+        for definition in definitions:
+            if not (definition.toolkit and definition.toolkit.name and definition.name):
+                continue
+            tool_name = f"{definition.toolkit.name}_{definition.name}"
+            requires_auth = definition.requirements is not None and definition.requirements.authorization is not None
+            tool = wrap_arcade_tool(self.client, tool_name, definition, langgraph=True)
+            executor = make_arcade_executor(self.client, tool_name)
+            entries.append(create_entry(tool, TOOL_KIND_ARCADE, requires_auth, _auth_key(definition), executor))
+        return entries
+
+    def _install(self, toolkit: str, definitions: List[ToolDefinition], source: str) -> None:
+        self._entries[toolkit] = self._compile(definitions)
+        self.definitions[toolkit] = definitions
+        self.sources[toolkit] = source
+
+    def _load_snapshot(self) -> None:
+        snapshot = read_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return
+
+        start_time = time.perf_counter()
+        for toolkit in self.toolkits:
+            items = snapshot["toolkits"].get(toolkit)
+            if items is not None:
+                self._install(toolkit, load_definitions(items), "snapshot")
+
+        self.snapshot_loaded_age = snapshot_age(snapshot)
+        tools_logger.info(
+            f"Tools snapshot loaded from {self.snapshot_path} in {time.perf_counter() - start_time:.3f}s "
+            f"({len(self.sources)} toolkit(s), {self.snapshot_loaded_age:.0f}s old)"
+        )
+
+    def snapshot_is_stale(self) -> bool:
+        if self.snapshot_loaded_age is None:
+            return False
+        return self.snapshot_max_age > 0 and self.snapshot_loaded_age > self.snapshot_max_age
+
+    def load_toolkit(self, toolkit: str, refresh: bool = False) -> bool:
+        """Fetch a toolkit once; concurrent callers wait for the same fetch."""
+        with self._toolkit_locks[toolkit]:
+            if self.is_loaded(toolkit) and not refresh:
+                return True
+
+            start_time = time.perf_counter()
+            try:
+                definitions = self._fetch_definitions(toolkit)
+                self._install(toolkit, definitions, "arcade")
+            except Exception as e:
+                self.errors[toolkit] = str(e)
+                if self.is_loaded(toolkit):
+                    tools_logger.warning(f"Failed to refresh toolkit '{toolkit}', keeping snapshot: {str(e)}")
+                else:
+                    tools_logger.error(f"Failed to load toolkit '{toolkit}': {str(e)}")
+                return False
+
+            self.timings[toolkit] = time.perf_counter() - start_time
+            self.errors.pop(toolkit, None)
+
+            tools_logger.info(f"Toolkit '{toolkit}' loaded: {len(self._entries[toolkit])} tools in {self.timings[toolkit]:.2f}s")
+            return True
+
+    def load_all(self, refresh: bool = False) -> None:
+        """Load (or refresh) every toolkit concurrently and rebuild the catalog once."""
+        start_time = time.perf_counter()
+        pending = [toolkit for toolkit in self.toolkits if refresh or not self.is_loaded(toolkit)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="toolkit-loader") as executor:
+            fetched = [toolkit for toolkit, ok in zip(pending, executor.map(lambda tk: self.load_toolkit(tk, refresh), pending)) if ok]
+
+        self._rebuild()
+        self._mark_ready()
+        self._attempted.set()
+
+        report = ", ".join(
+            f"{toolkit}={self.timings[toolkit]:.2f}s" if toolkit in self.timings else f"{toolkit}={self.sources.get(toolkit, 'failed')}"
+            for toolkit in self.toolkits
+        )
+        tools_logger.info(
+            f"{len(fetched)}/{len(pending)} toolkit(s) fetched in {time.perf_counter() - start_time:.2f}s "
+            f"({len(self.registry)} tools): {report}"
+        )
+
+        if self.snapshot_path and fetched:
+            self.save_snapshot()
+
+    def save_snapshot(self) -> None:
+        try:
+            write_snapshot(self.snapshot_path, self.definitions)
+            self.snapshot_loaded_age = 0
+        except OSError as e:
+            tools_logger.error(f"Failed to write tools snapshot {self.snapshot_path}: {str(e)}")
+
+    def preload(self) -> None:
+        """Build the full registry and catalog in the gunicorn master, before workers fork."""
+        refresh = self.snapshot_is_stale()
+        if self.ready and not refresh:
+            return
+
+        # Cliente descartável: conexões abertas no master não podem ser herdadas pelos workers
+        with self.client.copy(http_client=httpx.Client()) as fetch_client:
+            self._fetch_client = fetch_client
+            try:
+                self.load_all(refresh=refresh)
+            finally:
+                self._fetch_client = None
+
+    def start_warm_up(self) -> None:
+        """Load pending toolkits, or refresh a stale snapshot, in a background thread (idempotent)."""
+        if self._warm_up_thread is not None:
+            return
+
+        refresh = self.snapshot_is_stale()
+        if self.ready and not refresh:
+            return
+
+        self._warm_up_thread = threading.Thread(
+            target=self._warm_up,
+            kwargs={"refresh": refresh},
+            name="toolkit-warm-up",
+            daemon=True,
+        )
+        self._warm_up_thread.start()
+
+    def _warm_up(self, refresh: bool) -> None:
+        self.load_all(refresh=refresh)
+
+        # Toolkits que falharam ficam fora do catálogo até carregar: nova tentativa com espera crescente
+        delay = self.retry_delay
+        while delay > 0 and self.failed():
+            tools_logger.warning(f"Retrying toolkit(s) {', '.join(self.failed())} in {delay:.0f}s")
+            time.sleep(delay)
+            self.load_all()
+            delay = min(delay * 2, self.retry_max_delay)
+
+    async def wait_until_ready(self, timeout: float) -> bool:
+        """Wait (without blocking the event loop) for the first warm-up pass; True once every toolkit is loaded."""
+        self.start_warm_up()
+
+        deadline = time.monotonic() + timeout
+        while not self._attempted.is_set() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        return self.ready
+
+    def _rebuild(self) -> None:
+        with self._rebuild_lock:
+            registry = ToolRegistry()
+            for toolkit in self.toolkits:
+                for entry in self._entries.get(toolkit, []):
+                    registry.add(entry)
+            for entry in self._custom_entries:
+                registry.add(entry)
+
+            # Troca atômica das referências: leitores nunca veem um estado parcial
+            self.catalog = build_catalog(registry, self.page_size)
+            self.registry = registry
+
+    # ----------------------------------------------------------------- consulta
+
+    def _toolkit_for(self, tool_name: str) -> Optional[str]:
+        prefix = tool_name.split("_", 1)[0].lower()
+        for toolkit in self.toolkits:
+            if toolkit.lower() == prefix:
+                return toolkit
+        return None
+
+    def get(self, tool_name: str) -> Optional[ToolEntry]:
+        """Return a registry entry, loading its toolkit on first use."""
+        entry = self.registry.get(tool_name)
+        if entry is not None:
+            return entry
+
+        toolkit = self._toolkit_for(tool_name)
+        if toolkit is None or self.is_loaded(toolkit):
+            return None
+
+        if self.load_toolkit(toolkit):
+            self._rebuild()
+            self._mark_ready()
+
+        return self.registry.get(tool_name)
+
+    async def aget(self, tool_name: str) -> Optional[ToolEntry]:
+        """Async variant of get(): remote loads run off the event loop."""
+        entry = self.registry.get(tool_name)
+        if entry is not None:
+            return entry
+        return await asyncio.to_thread(self.get, tool_name)
+
+    def requires_auth(self, tool_name: str) -> bool:
+        """Same contract as ToolManager.requires_auth, backed by the registry."""
+        entry = self.get(tool_name)
+        if entry is None:
+            raise ValueError(f"Tool '{tool_name}' not found in this manager instance")
+        return entry.requires_auth
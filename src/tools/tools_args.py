@@ -1,81 +1,150 @@
 from src.utils import create_error_response, MCPErrorCode
-import json
-from typing import Dict, Any
-
-async def _clean_microsoft_createandsendemail_args(arguments: Dict[str, Any], schema: Dict[str, Any], request_id: int, correlation_id: str) -> Dict[str, Any]:
-    """Clean and validate email tool arguments."""
-    clean_args = {}
-    
-    for k, v in arguments.items():
-        if v is None:
-            continue
-            
-        if k == 'to_recipients' and isinstance(v, str):
-            if v.startswith('[') and v.endswith(']'):
-                try:
-                    parsed_value = json.loads(v)
-                    if parsed_value is not None:
-                        clean_args[k] = parsed_value
-                except json.JSONDecodeError:
-                    return create_error_response(request_id, MCPErrorCode.INVALID_PARAMS, f"Invalid array format for to_recipients")
-            else:
-                clean_args[k] = [v]
-        else:
-            clean_args[k] = v
-    
-    return clean_args
-
-def _clean_scrape_args(arguments: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
-    """Clean and validate scrape tool arguments."""
-    clean_args = {k: v for k, v in arguments.items() if v is not None}
-    
-    # Set scrape-specific defaults
-    for prop, details in schema.get('properties', {}).items():
-        if prop not in clean_args:
-            if prop == 'formats':
-                clean_args[prop] = ['markdown']
-            elif prop == 'timeout':
-                clean_args[prop] = 30000
-            elif details.get('type') == 'array':
-                clean_args[prop] = []
-            elif details.get('type') == 'boolean':
-                clean_args[prop] = False
-            elif details.get('type') == 'integer':
-                clean_args[prop] = 0
-    
-    return clean_args
-
-def _clean_default_args(arguments: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
-    """Clean and validate default tool arguments."""
-    clean_args = {k: v for k, v in arguments.items() if v is not None}
-    
-    # Set generic defaults
-    for prop, details in schema.get('properties', {}).items():
-        if prop not in clean_args:
-            if details.get('type') == 'array':
-                clean_args[prop] = []
-            elif details.get('type') == 'boolean':
-                clean_args[prop] = False
-            elif details.get('type') == 'integer':
-                clean_args[prop] = 0
-    
-    return clean_args
-
-
-async def _clean_arguments(tool, arguments: Dict[str, Any], tool_name: str, request_id: int, correlation_id: str):
+from dataclasses import dataclass, field
+import copy, functools, json
+from typing import Dict, Any, Callable, Optional, Tuple
+
+
+class ArgumentError(ValueError):
+    """An argument could not be coerced to the type declared in the tool schema."""
+
+
+# Ajustes por ferramenta sobre o plano derivado do schema
+# Nota: microsoft_createandsendemail mantém o nome antigo usado pelas funções de limpeza anteriores
+PLAN_OVERRIDES: Dict[str, Dict[str, Any]] = {
+    "Web_ScrapeUrl": {"defaults": {"formats": ["markdown"], "timeout": 30000}},
+    "microsoft_createandsendemail": {"fill_defaults": False, "coerce": {"to_recipients": "array"}},
+}
+
+# Valores padrão para propriedades ausentes, pelo tipo declarado no schema
+_TYPE_DEFAULTS: Dict[str, Callable[[], Any]] = {
+    "array": list,
+    "boolean": lambda: False,
+    "integer": lambda: 0,
+}
+
+
+def _to_array(key: str, value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    if value.startswith('[') and value.endswith(']'):
+        try:
+            parsed = json.loads(value)
+        except json.JSONDecodeError:
+            raise ArgumentError(f"Invalid array format for {key}")
+        if not isinstance(parsed, list):
+            raise ArgumentError(f"Invalid array format for {key}")
+        return parsed
+    return [value]
+
+
+def _to_integer(key: str, value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if not isinstance(value, str):
+        return value
+    try:
+        return int(value.strip())
+    except ValueError:
+        raise ArgumentError(f"Invalid integer for {key}: {value!r}")
+
+
+def _to_number(key: str, value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    try:
+        return float(value.strip())
+    except ValueError:
+        raise ArgumentError(f"Invalid number for {key}: {value!r}")
+
+
+def _to_boolean(key: str, value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    normalized = value.strip().lower()
+    if normalized in ("true", "1", "yes"):
+        return True
+    if normalized in ("false", "0", "no"):
+        return False
+    raise ArgumentError(f"Invalid boolean for {key}: {value!r}")
+
+
+_COERCIONS: Dict[str, Callable[[str, Any], Any]] = {
+    "array": _to_array,
+    "integer": _to_integer,
+    "number": _to_number,
+    "boolean": _to_boolean,
+}
+
+
+def _declared_type(details: Dict[str, Any]) -> Optional[str]:
+    """Type of a property, looking through Optional[...] (anyOf with null)."""
+    if "type" in details:
+        return details["type"] if isinstance(details["type"], str) else None
+    types = [option.get("type") for option in details.get("anyOf", []) if option.get("type") != "null"]
+    return types[0] if len(types) == 1 and isinstance(types[0], str) else None
+
+
+@dataclass(frozen=True)
+class ArgumentPlan:
+    """Normalization of a tool's arguments, compiled once from its schema."""
+    defaults: Tuple[Tuple[str, Callable[[], Any]], ...] = ()
+    coercions: Dict[str, Callable[[str, Any], Any]] = field(default_factory=dict)
+
+    def apply(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop None values, coerce declared types and fill defaults in one pass."""
+        clean_args = {}
+        for key, value in arguments.items():
+            if value is None:
+                continue
+            coerce = self.coercions.get(key)
+            clean_args[key] = coerce(key, value) if coerce is not None else value
+
+        for key, default in self.defaults:
+            if key not in clean_args:
+                clean_args[key] = default()
+
+        return clean_args
+
+
+def compile_plan(schema: Dict[str, Any], tool_name: str) -> ArgumentPlan:
+    """Compile a tool JSON schema (plus the tool overrides) into an ArgumentPlan."""
+    override = PLAN_OVERRIDES.get(tool_name, {})
+    properties = schema.get('properties', {})
+
+    coercions = {}
+    for prop, details in properties.items():
+        coerce = _COERCIONS.get(_declared_type(details))
+        if coerce is not None:
+            coercions[prop] = coerce
+    for prop, type_name in override.get("coerce", {}).items():
+        coercions[prop] = _COERCIONS[type_name]
+
+    defaults = []
+    if override.get("fill_defaults", True):
+        fixed = override.get("defaults", {})
+        for prop, details in properties.items():
+            if prop in fixed:
+                # Cópia por chamada: o valor fixo (ex.: lista) não é compartilhado entre requisições
+                defaults.append((prop, functools.partial(copy.copy, fixed[prop])))
+            elif details.get('type') in _TYPE_DEFAULTS:
+                # Apenas tipos declarados diretamente (propriedades Optional ficam ausentes)
+                defaults.append((prop, _TYPE_DEFAULTS[details['type']]))
+
+    return ArgumentPlan(tuple(defaults), coercions)
+
+
+async def _clean_arguments(tool, arguments: Dict[str, Any], tool_name: str, request_id: int, correlation_id: str,
+                           schema: Optional[Dict[str, Any]] = None, plan: Optional[ArgumentPlan] = None):
     # Clean and validate arguments based on tool type
-    if hasattr(tool, 'args_schema'):
-        schema = tool.args_schema.model_json_schema()
-        
-        # Nota: Aqui ainda estamos usando os nomes antigos para compatibilidade com as funções de limpeza
-        # Se necessário, você pode atualizar essas condições para usar os nomes originais
-        if tool_name == 'microsoft_createandsendemail':
-            arguments = await _clean_microsoft_createandsendemail_args(arguments, schema, request_id, correlation_id)
-            if isinstance(arguments, JSONResponse):  # If error response
-                return arguments
-        elif tool_name == 'Web_ScrapeUrl':
-            arguments = _clean_scrape_args(arguments, schema)
-        else:
-            arguments = _clean_default_args(arguments, schema)
-
-        return arguments
\ No newline at end of file
+    # O plano pré-compilado do registro evita model_json_schema() e a análise do schema a cada chamada
+    if plan is None:
+        if schema is None and hasattr(tool, 'args_schema'):
+            schema = tool.args_schema.model_json_schema()
+        if schema is None:
+            return arguments
+        plan = compile_plan(schema, tool_name)
+
+    try:
+        return plan.apply(arguments)
+    except ArgumentError as e:
+        return create_error_response(request_id, MCPErrorCode.INVALID_PARAMS, str(e))
@@ -1,64 +1,20 @@
 from typing import List, Dict, Any
 import re, json
-from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from sqlalchemy import text
 
-from src.services.database import DB, ENGINE
-from src.config import OPENAI_API_KEY, MARIADB_URI
+from src.services.database import DB, cancellable_connection
+from src.config import MARIADB_URI
+from src.agent.llm import get_llm
 from src.services.nl2sql import export_db_catalog
+from src.services.sql_guard import _enforce_allowed_tables, _validate_select_only
 
 
 def build_llm():
-    return ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-        api_key=OPENAI_API_KEY,
-    )
-
-
-def _enforce_allowed_tables(sql: str) -> None:
-    """Função mantida para compatibilidade, mas não faz mais verificações
-    já que o controle de acesso é feito via schema seguro e permissões do usuário."""
-    # O controle agora é feito via schema seguro e permissões do usuário
-    pass
-
-
-def _validate_select_only(sql: str) -> str:
-    # Adicionar logs para debug
-    print(f"SQL recebido para validação: '{sql}'")
-    print(f"Primeiros 10 caracteres (representação): {repr(sql[:10])}")
-    
-    # Remover marcadores de código Markdown se presentes
-    if sql.startswith('```'):
-        # Encontra o final do bloco de código
-        end_marker = sql.rfind('```')
-        if end_marker > 3:  # Certifica-se de que há um marcador de fim
-            # Extrai apenas o conteúdo entre os marcadores
-            # Pula a primeira linha se contiver apenas ```sql ou similar
-            lines = sql[3:end_marker].strip().split('\n')
-            if lines[0].strip().lower() in ['sql', 'mysql', 'mariadb']:
-                sql = '\n'.join(lines[1:]).strip()
-            else:
-                sql = '\n'.join(lines).strip()
-            print(f"SQL após remoção de marcadores Markdown: '{sql}'")
-    
-    # Normalizar a string removendo espaços extras e caracteres invisíveis
-    normalized_sql = sql.strip()
-    
-    # Verificar se começa com SELECT
-    if not re.match(r"(?i)^\s*select\b", normalized_sql, re.IGNORECASE):
-        print(f"ERRO: SQL não começa com SELECT: '{normalized_sql}'")
-        raise ValueError("Somente consultas SELECT são permitidas.")
-    
-    # Impõe LIMIT se não houver
-    if not re.search(r"\blimit\s+\d+\s*;?\s*$", normalized_sql, re.IGNORECASE):
-        normalized_sql = normalized_sql.rstrip().rstrip(";") + " LIMIT 200;"
-        print(f"SQL com LIMIT adicionado: '{normalized_sql}'")
-    
-    return normalized_sql
+    # Modelo compartilhado (pool HTTP do processo) em vez de um cliente novo por chamada
+    return get_llm("gpt-4o-mini", temperature=0)
 
 
 # Cadeia NL → SQL
@@ -90,7 +46,7 @@ def VerxRH_RunQuery(sql: str) -> Dict[str, Any]:
     """Executa SQL (somente SELECT) no MariaDB e retorna linhas como JSON."""
     safe_sql = _validate_select_only(sql)
 
-    with ENGINE.connect() as conn:
+    with cancellable_connection() as conn:
         conn.execute(text("SET SESSION time_zone = '+00:00'"))
         res = conn.execute(text(safe_sql))
         
@@ -138,7 +94,7 @@ def db_query(sql: str) -> Dict[str, Any]:
 
     safe_sql = _validate_select_only(sql)
 
-    with ENGINE.connect() as conn:
+    with cancellable_connection() as conn:
         conn.execute(text("SET SESSION time_zone = '+00:00'"))
         res = conn.execute(text(safe_sql))
         rows = [dict(r._mapping) for r in res]
@@ -175,7 +131,7 @@ def db_nl2sql_rows(question: str) -> str:
     safe_sql = _validate_select_only(sql)
 
     # 4) Executa e retorna SOMENTE os rows em JSON
-    with ENGINE.connect() as conn:
+    with cancellable_connection() as conn:
         conn.execute(text("SET SESSION time_zone = '+00:00'"))
         result = conn.execute(text(safe_sql))
         
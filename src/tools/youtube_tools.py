@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from crewai import Task, Crew, Process, Agent
 from crewai_tools import YoutubeChannelSearchTool
+from src.tools.progress import report_progress
 
 
 @tool
@@ -64,9 +65,17 @@ def Youtube_BlogPost(channel: str, topic: str) -> str:
         memory = True,
         cache = True,
         max_rpm = 100,
-        share_crew = True
+        share_crew = True,
+        # Cada tarefa concluída vira uma notificação de progresso do job
+        task_callback = lambda task_output: report_progress(
+            len([task for task in (research_task, write_task) if task.output is not None]),
+            2,
+            f"Tarefa concluída: {task_output.agent}"
+        )
     )
 
+    report_progress(0, 2, "Pesquisando o canal")
+
     output = crew.kickoff(inputs = {'topic': topic})
 
     return output.raw
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Spans por fase de cada requisição, sem coletor externo.
+
+O TracingMiddleware abre um Trace por requisição HTTP; as camadas marcam suas
+fases com `span("nome")` (parse, jwt, lookup, arguments, authorize,
+graph_build, llm, execute, serialize). Ao final, a duração de cada fase vai
+para os histogramas do /metrics, o resumo sai no log (DEBUG) e o cliente
+recebe o cabeçalho `Server-Timing`.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import time
+
+from src.logs import mcp_logger
+from src.metrics import request_duration, requests_in_flight, span_duration
+
+
+@dataclass
+class Trace:
+    method: Optional[str] = None
+    tool: Optional[str] = None
+    started_at: float = field(default_factory=time.perf_counter)
+    spans: List[Tuple[str, float]] = field(default_factory=list)
+
+    def label(self, method: Optional[str] = None, tool: Optional[str] = None) -> None:
+        """Set the method/tool labels; the first value wins (batch elements keep 'batch')."""
+        if method is not None and self.method is None:
+            self.method = method
+        if tool is not None and self.tool is None:
+            self.tool = tool
+
+    def server_timing(self) -> str:
+        totals: Dict[str, float] = {}
+        for name, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        return ", ".join(f"{name};dur={duration * 1000:.1f}" for name, duration in totals.items())
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+# Os labels das métricas nunca vêm direto da entrada do cliente (cada valor novo é uma série nova):
+# ferramentas fora do registro e rotas/métodos desconhecidos caem em um único valor
+UNKNOWN_TOOL = "unknown"
+OTHER = "other"
+
+
+def label_request(method: Optional[str] = None, tool: Optional[str] = None) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.label(method, tool)
+
+
+def trace_labels() -> Tuple[str, str]:
+    """(method, tool) of the current request, for metrics recorded outside the middleware."""
+    trace = current_trace.get()
+    if trace is None:
+        return "", ""
+    return trace.method or "", trace.tool or ""
+
+
+@contextmanager
+def span(name: str, tool: Optional[str] = None) -> Iterator[None]:
+    """Time a phase of the current request (also usable in threads run via run_blocking)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        trace = current_trace.get()
+        if tool is None and trace is not None:
+            tool = trace.tool
+        span_duration.observe(duration, span=name, tool=tool or "")
+        if trace is not None:
+            trace.spans.append((name, duration))
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    """Method and route template of a non-MCP request (unmatched requests share one label)."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    method = scope.get("method", "")
+    if path is None or method not in (getattr(route, "methods", None) or ()):
+        return OTHER
+    return f"{method} {path}"
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware: one Trace per HTTP request, request metrics and Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = current_trace.set(trace)
+        requests_in_flight.inc()
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and trace.spans:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            requests_in_flight.dec()
+            duration = time.perf_counter() - trace.started_at
+            method = trace.method or _route_label(scope)
+            request_duration.observe(duration, method=method, tool=trace.tool or "")
+            current_trace.reset(token)
+            mcp_logger.debug(
+                "Request %s %s took %.1fms (%s)", method, trace.tool or "-", duration * 1000, trace.server_timing()
+            )
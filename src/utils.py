@@ -1,27 +1,40 @@
-from typing import Any
-from fastapi.responses import JSONResponse
+from typing import Any, Dict, Optional
+from src.codec import ORJSONResponse
 from src.schemas.mcp_schemas import MCPErrorCode
+from src.metrics import request_errors
+from src.tracing import span, trace_labels
 
-def create_error_response(request_id: int, code: MCPErrorCode, message: str) -> JSONResponse:
+_ERROR_STATUS = {MCPErrorCode.METHOD_NOT_FOUND: 400, MCPErrorCode.SERVER_BUSY: 429}
+
+def create_error_response(request_id: int, code: MCPErrorCode, message: str,
+                          data: Optional[Dict[str, Any]] = None,
+                          headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
     """Helper function to create error responses"""
-    return JSONResponse(
-        content={
-            "id": request_id,
-            "jsonrpc": "2.0",
-            "error": {
-                "code": code.value,
-                "message": message
-            }
-        },
-        status_code=400 if code == MCPErrorCode.METHOD_NOT_FOUND else 500
-    )
+    method, tool = trace_labels()
+    request_errors.inc(method=method, tool=tool, code=code.value)
+
+    error: Dict[str, Any] = {"code": code.value, "message": message}
+    if data is not None:
+        error["data"] = data
 
-def create_success_response(request_id: int, result: Any) -> JSONResponse:
+    with span("serialize"):
+        return ORJSONResponse(
+            content={
+                "id": request_id,
+                "jsonrpc": "2.0",
+                "error": error
+            },
+            status_code=_ERROR_STATUS.get(code, 500),
+            headers=headers
+        )
+
+def create_success_response(request_id: int, result: Any) -> ORJSONResponse:
     """Helper function to create success responses"""
-    return JSONResponse(
-        content={
-            "id": request_id,
-            "jsonrpc": "2.0",
-            "result": result
-        }
-    )
+    with span("serialize"):
+        return ORJSONResponse(
+            content={
+                "id": request_id,
+                "jsonrpc": "2.0",
+                "result": result
+            }
+        )
@@ -0,0 +1,48 @@
+"""Tests for the compiled graph LRU cache."""
+from unittest.mock import MagicMock, patch
+from src.agent.graph import GraphCache, release_thread
+
+def test_graph_is_compiled_once_per_tool():
+    cache = GraphCache(max_size=2)
+
+    with patch("src.agent.graph.build_graph_with_tool", side_effect=lambda name, version: MagicMock(name=name)) as build:
+        first = cache.get("Slack_SendMessage")
+        assert cache.get("Slack_SendMessage") is first
+        assert build.call_count == 1
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_least_recently_used_graph_is_evicted():
+    cache = GraphCache(max_size=2)
+
+    with patch("src.agent.graph.build_graph_with_tool", side_effect=lambda name, version: MagicMock(name=name)) as build:
+        cache.get("A")
+        cache.get("B")
+        cache.get("A")
+        cache.get("C")
+        cache.get("A")
+        cache.get("B")
+
+    assert build.call_count == 4
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["size"] == 2
+
+def test_catalog_reload_replaces_cached_graphs():
+    version = "v1"
+    cache = GraphCache(max_size=4, version=lambda: version)
+
+    with patch("src.agent.graph.build_graph_with_tool", side_effect=lambda name, version: MagicMock(name=name)) as build:
+        before = cache.get("A")
+        version = "v2"
+        after = cache.get("A")
+        assert after is not before
+        assert cache.get("A") is after
+
+    assert [call.args for call in build.call_args_list] == [("A", "v1"), ("A", "v2")]
+    assert cache.stats()["size"] == 1
+
+def test_release_thread_drops_call_state():
+    graph = MagicMock()
+    release_thread(graph, "thread-1")
+    graph.checkpointer.delete_thread.assert_called_once_with("thread-1")
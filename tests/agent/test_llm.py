@@ -0,0 +1,34 @@
+"""Tests for the shared, tool-bound LLM clients."""
+from langchain_core.tools import StructuredTool
+from src.agent.llm import get_llm, get_llm_with_tools, http_client, llm_stats
+
+def make_tool(name):
+    def run(query: str) -> str:
+        """Run the tool."""
+        return query
+    return StructuredTool.from_function(run, name=name)
+
+def test_bound_model_is_reused_per_tool_set_and_model():
+    tools = [make_tool("Web_Search")]
+
+    first = get_llm_with_tools(tools)
+
+    assert get_llm_with_tools([make_tool("Web_Search")]) is first
+    assert get_llm_with_tools(tools, model="gpt-4o-mini") is not first
+    assert get_llm_with_tools([make_tool("Slack_SendMessage")]) is not first
+
+def test_catalog_reload_invalidates_bound_models():
+    tools = [make_tool("Web_Search")]
+    before = get_llm_with_tools(tools, version="v1")
+
+    # Mesmo nome, catálogo recarregado: o schema pode ter mudado
+    after = get_llm_with_tools([make_tool("Web_Search")], version="v2")
+
+    assert after is not before
+    assert get_llm_with_tools(tools, version="v2") is after
+    assert llm_stats()["bound_models"] == 1
+
+def test_models_share_the_pooled_http_client():
+    assert get_llm("gpt-4o") is get_llm("gpt-4o")
+    assert get_llm("gpt-4o").http_client is http_client
+    assert get_llm("gpt-4o-mini").http_client is http_client
@@ -0,0 +1,79 @@
+"""Tests for the verified-JWT cache used by verify_token."""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.auth import jwt_handler
+from src.auth.jwt_handler import create_access_token, verify_token
+from src.auth.token_cache import TokenCache, token_cache, token_key
+
+
+def test_entries_expire_at_exp_and_rejections_are_short_lived(clock):
+    clock.now = 1000.0
+    cache = TokenCache(max_entries=10, max_ttl=3600, negative_ttl=5, clock=clock)
+
+    cache.put(token_key("good"), {"sub": "ana", "exp": 1060})
+    cache.reject(token_key("bad"))
+
+    assert cache.get(token_key("good")) == (True, {"sub": "ana", "exp": 1060})
+    assert cache.get(token_key("bad")) == (True, None)
+
+    clock.now = 1006
+    assert cache.get(token_key("bad")) == (False, None)
+    clock.now = 1060
+    assert cache.get(token_key("good")) == (False, None)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["negative_hits"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TokenCache(max_entries=2, max_ttl=3600, negative_ttl=5)
+    for token in ("a", "b"):
+        cache.put(token_key(token), {"sub": token})
+    cache.get(token_key("a"))
+    cache.put(token_key("c"), {"sub": "c"})
+
+    assert cache.get(token_key("b")) == (False, None)
+    assert cache.get(token_key("a"))[0]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_rejections_do_not_evict_valid_claims():
+    cache = TokenCache(max_entries=2, max_ttl=3600, negative_ttl=5, max_negative_entries=2)
+    cache.put(token_key("good"), {"sub": "ana"})
+    for token in ("x", "y", "z"):
+        cache.reject(token_key(token))
+
+    assert cache.get(token_key("good")) == (True, {"sub": "ana"})
+    assert cache.get(token_key("x")) == (False, None)
+    assert cache.get(token_key("z")) == (True, None)
+    assert cache.stats()["negative_evictions"] == 1
+    assert cache.stats()["evictions"] == 0
+
+
+@pytest.fixture
+def auth_required(monkeypatch):
+    monkeypatch.setattr(jwt_handler, "AUTH_REQUIRED", True)
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def test_verify_token_decodes_each_token_once(auth_required):
+    token = create_access_token({"sub": "ana"}, timedelta(minutes=5))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    bad = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token + "x")
+
+    with patch("src.auth.jwt_handler.jwt.decode", wraps=jwt_handler.jwt.decode) as decode:
+        assert verify_token(credentials)["sub"] == "ana"
+        assert verify_token(credentials)["sub"] == "ana"
+        for _ in range(2):
+            with pytest.raises(HTTPException) as error:
+                verify_token(bad)
+            assert error.value.status_code == 401
+
+    assert decode.call_count == 2
@@ -1,7 +1,17 @@
 """Shared test fixtures and configuration."""
+import threading
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from pydantic import BaseModel
+from src.tools.catalog import build_catalog
+from src.tools.loader import toolkit_loader
+from src.tools.registry import ToolEntry, ToolRegistry, TOOL_KIND_ARCADE, TOOL_KIND_CUSTOM, create_entry, make_arcade_executor
+
+SCRAPE_RESULT = {
+    "markdown": "Test content",
+    "html": "<p>Test content</p>"
+}
 
 class TestArgsSchema(BaseModel):
     """Base schema for testing tools."""
@@ -12,21 +22,68 @@ class TestArgsSchema(BaseModel):
     categories: list[str] = []
 
 class MockTool:
-    """Base mock tool for testing."""
-    def __init__(self, name: str, should_fail: bool = False):
+    """Base mock tool definition for testing."""
+    def __init__(self, name: str):
         self.name = name
-        self.should_fail = should_fail
+        self.description = f"Mock tool {name}"
         self.args_schema = TestArgsSchema
 
-    async def arun(self, arguments):
-        if self.should_fail:
-            raise Exception("Tool execution failed")
-        return {
-            "markdown": "Test content",
-            "html": "<p>Test content</p>"
-        }
+class FakeArcade:
+    """Arcade client whose tools.execute returns outputs[tool_name]; an Exception output fails the call."""
+    def __init__(self, outputs=None):
+        self.outputs = dict(outputs or {})
+        self.calls = []
+        self.tools = self
+
+    def execute(self, tool_name, input, user_id=None):
+        self.calls.append((tool_name, input, user_id))
+        output = self.outputs.get(tool_name)
+        if isinstance(output, Exception):
+            return SimpleNamespace(success=False, output=SimpleNamespace(value=None, error=SimpleNamespace(message=str(output))))
+        return SimpleNamespace(success=True, output=SimpleNamespace(value=output, error=None))
+
+class FakeClock:
+    """Manually advanced clock for the TTL caches (set `now` to move time)."""
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    """Fixture that returns a FakeClock starting at 0."""
+    return FakeClock()
+
+@pytest.fixture(autouse=True, scope="session")
+def no_toolkit_retries():
+    """The process loader has no Arcade here: its warm-up must not keep retrying after the tests end."""
+    toolkit_loader.retry_delay = 0
 
 @pytest.fixture
-def mock_tool():
-    """Fixture that returns a mock tool instance."""
-    return lambda name="scrapeurl", should_fail=False: MockTool(name, should_fail)
+def use_tools(monkeypatch):
+    """Fixture that installs tools (or compiled entries) as the process registry and tools/list catalog."""
+    def install(*tools, kind=TOOL_KIND_CUSTOM) -> ToolRegistry:
+        registry = ToolRegistry()
+        for tool in tools:
+            registry.add(tool if isinstance(tool, ToolEntry) else create_entry(tool, kind))
+        ready = threading.Event()
+        ready.set()
+        monkeypatch.setattr(toolkit_loader, "registry", registry)
+        monkeypatch.setattr(toolkit_loader, "catalog", build_catalog(registry))
+        monkeypatch.setattr(toolkit_loader, "_ready", ready)
+        return registry
+    return install
+
+@pytest.fixture
+def arcade_tools(use_tools):
+    """Fixture that installs MockTools as Arcade tools executed through a FakeArcade client (returned)."""
+    def install(*names, output=SCRAPE_RESULT) -> FakeArcade:
+        client = FakeArcade({name: output for name in names})
+        use_tools(*(
+            create_entry(MockTool(name), TOOL_KIND_ARCADE, executor=make_arcade_executor(client, name))
+            for name in names
+        ))
+        return client
+    return install
+
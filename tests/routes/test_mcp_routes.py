@@ -1,7 +1,9 @@
+import time
 import pytest
 from fastapi.testclient import TestClient
 from src.app import app
 from src.config import server_name, server_version
+from src.services import tools_service
 
 client = TestClient(app)
 
@@ -85,3 +87,65 @@ async def test_tool_call():
     assert data["jsonrpc"] == "2.0"
     assert data["id"] == 1
     assert "result" in data or "error" in data  # Both are valid responses depending on tool execution
+
+class SleepTool:
+    name = "Sleep_Tool"
+    description = "Sleeps 0.3s"
+
+    def invoke(self, arguments):
+        time.sleep(0.3)
+        return f"slept {arguments.get('n')}"
+
+@pytest.fixture
+def sleep_tool(use_tools):
+    use_tools(SleepTool())
+
+def test_batch_runs_tool_calls_concurrently(sleep_tool):
+    payload = [
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "Sleep_Tool", "arguments": {"n": 1}}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "Sleep_Tool", "arguments": {"n": 2}}},
+        {"jsonrpc": "2.0", "id": 3, "method": "initialize"},
+    ]
+
+    start = time.perf_counter()
+    response = client.post("/mcp", json=payload)
+    elapsed = time.perf_counter() - start
+
+    data = response.json()
+    assert [item["id"] for item in data] == [1, 2, 3]
+    assert data[0]["result"]["content"][0]["text"] == "slept 1"
+    assert data[1]["result"]["content"][0]["text"] == "slept 2"
+    assert data[2]["result"]["serverInfo"]["name"] == server_name
+    assert elapsed < 0.55
+
+def test_batch_with_invalid_element_and_only_notifications():
+    data = client.post("/mcp", json=[{"jsonrpc": "2.0", "id": 1, "method": "initialize"}, 42]).json()
+    assert data[0]["id"] == 1
+    assert data[1]["error"]["code"] == -32600
+
+    response = client.post("/mcp", json=[{"jsonrpc": "2.0", "method": "notifications/initialized"}])
+    assert response.status_code == 202
+    assert response.content == b""
+
+    assert client.post("/mcp", json=[]).json()["error"]["code"] == -32600
+
+def test_batch_element_that_raises_becomes_its_own_error(monkeypatch):
+    def broken_initialize(request_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(tools_service, "get_initialize_response", broken_initialize)
+    payload = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ]
+
+    response = client.post("/mcp", json=payload)
+
+    data = response.json()
+    assert response.status_code == 200
+    assert data[0]["id"] == 1
+    assert data[0]["error"]["code"] == -32603
+    assert "boom" in data[0]["error"]["message"]
+    assert data[1]["id"] == 2
+    assert "tools" in data[1]["result"]
@@ -0,0 +1,59 @@
+"""Tests for the Streamable HTTP (SSE) transport of tools/call."""
+import json
+import time
+import httpx
+import pytest
+from src.app import app
+from src.tools.progress import report_progress
+
+class StepsTool:
+    name = "Steps_Tool"
+    description = "Reports progress while running"
+
+    def invoke(self, arguments):
+        for step in (1, 2):
+            report_progress(step, 2, f"step {step}")
+            time.sleep(0.05)
+        return "finished"
+
+@pytest.fixture(autouse=True)
+def steps_tool(use_tools):
+    use_tools(StepsTool())
+
+def parse_events(body: str):
+    return [json.loads(block.split("data: ", 1)[1]) for block in body.strip().split("\n\n")]
+
+async def call_tool(accept, name="Steps_Tool"):
+    payload = {"jsonrpc": "2.0", "id": 7, "method": "tools/call",
+               "params": {"name": name, "arguments": {}, "_meta": {"progressToken": "p-7"}}}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/mcp", json=payload, headers={"Accept": accept})
+
+@pytest.mark.asyncio
+async def test_tools_call_streams_progress_then_result():
+    response = await call_tool("application/json, text/event-stream")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+
+    assert [event["method"] for event in events[:-1]] == ["notifications/progress"] * 2
+    assert events[0]["params"] == {"progressToken": "p-7", "progress": 1, "total": 2, "message": "step 1"}
+    assert events[-1]["id"] == 7
+    assert events[-1]["result"]["content"][0]["text"] == "finished"
+
+@pytest.mark.asyncio
+async def test_streamed_long_tool_waits_for_its_job(monkeypatch):
+    monkeypatch.setattr("src.tools.base.JOB_TOOLS", {"Steps_Tool"})
+
+    events = parse_events((await call_tool("text/event-stream")).text)
+
+    assert len(events) == 3
+    assert events[-1]["result"]["content"][0]["text"] == "finished"
+
+@pytest.mark.asyncio
+async def test_plain_json_without_event_stream_accept():
+    response = await call_tool("application/json")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["result"]["content"][0]["text"] == "finished"
@@ -1,7 +1,12 @@
+import json
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 from src.services import tools_service
-from src.config import server_name, server_version
+from src.tools.registry import ToolRegistry, TOOL_KIND_CUSTOM, create_entry
+from src.tools.catalog import build_catalog
+from src.tools.loader import toolkit_loader
+from src.config import server_name, server_version, DEFAULT_USER_ID
 from src.schemas.mcp_schemas import MCPErrorCode
 
 def test_get_server_info():
@@ -36,7 +41,29 @@ def test_get_initialized_notification_response():
     assert response["jsonrpc"] == "2.0"
     assert response["result"] is None
 
-def test_get_tools_list_response():
+@pytest.fixture(autouse=True)
+def loaded_toolkits():
+    """Mark the toolkits as loaded so tools/list does not wait for the warm-up."""
+    ready = threading.Event()
+    ready.set()
+    with patch.object(toolkit_loader, "_ready", ready):
+        yield
+
+def _build_catalog(tools, page_size=0):
+    registry = ToolRegistry()
+    for tool in tools:
+        registry.add(create_entry(tool, TOOL_KIND_CUSTOM))
+    return build_catalog(registry, page_size)
+
+def _make_tool(name):
+    mock_tool = MagicMock()
+    mock_tool.name = name
+    mock_tool.description = f"Tool {name}"
+    mock_tool.args_schema.model_json_schema.return_value = {"type": "object", "properties": {}, "required": []}
+    return mock_tool
+
+@pytest.mark.asyncio
+async def test_get_tools_list_response():
     """Test tools list response"""
     request_id = 789
     mock_tool = MagicMock()
@@ -48,13 +75,14 @@ def test_get_tools_list_response():
         "required": ["url"]
     }
     
-    with patch("src.services.tools_service.raw_tools", [mock_tool]):
-        response = tools_service.get_tools_list_response(request_id)
+    with patch.object(toolkit_loader, "catalog", _build_catalog([mock_tool])):
+        response = json.loads((await tools_service.get_tools_list_response(request_id)).body)
     
     assert response["id"] == request_id
     assert response["jsonrpc"] == "2.0"
     assert "tools" in response["result"]
     assert len(response["result"]["tools"]) == 1
+    assert "nextCursor" not in response["result"]
     
     tool_info = response["result"]["tools"][0]
     assert tool_info["name"] == "test_tool"
@@ -62,7 +90,11 @@ def test_get_tools_list_response():
     assert tool_info["inputSchema"]["type"] == "object"
     assert "url" in tool_info["inputSchema"]["properties"]
 
-def test_get_tools_list_response_no_schema():
+    # O schema é compilado uma única vez, na construção do catálogo
+    assert mock_tool.args_schema.model_json_schema.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_tools_list_response_no_schema():
     """Test tools list response with tool without schema"""
     request_id = 789
     mock_tool = MagicMock()
@@ -71,8 +103,8 @@ def test_get_tools_list_response_no_schema():
     # Remove args_schema attribute
     del mock_tool.args_schema
     
-    with patch("src.services.tools_service.raw_tools", [mock_tool]):
-        response = tools_service.get_tools_list_response(request_id)
+    with patch.object(toolkit_loader, "catalog", _build_catalog([mock_tool])):
+        response = json.loads((await tools_service.get_tools_list_response(request_id)).body)
     
     assert response["id"] == request_id
     assert response["jsonrpc"] == "2.0"
@@ -83,6 +115,54 @@ def test_get_tools_list_response_no_schema():
         "required": []
     }
 
+@pytest.mark.asyncio
+async def test_get_tools_list_response_pagination():
+    """Test tools list pagination with cursor/nextCursor"""
+    catalog = _build_catalog([_make_tool(f"tool_{i}") for i in range(5)], page_size=2)
+    names = []
+    cursor = None
+
+    with patch.object(toolkit_loader, "catalog", catalog):
+        for _ in range(3):
+            params = {"cursor": cursor} if cursor else None
+            result = json.loads((await tools_service.get_tools_list_response(1, params)).body)["result"]
+            names.extend(tool["name"] for tool in result["tools"])
+            cursor = result.get("nextCursor")
+
+    assert names == [f"tool_{i}" for i in range(5)]
+    assert cursor is None
+
+@pytest.mark.asyncio
+async def test_get_tools_list_response_invalid_cursor():
+    """Test tools list with an unknown cursor"""
+    with patch.object(toolkit_loader, "catalog", _build_catalog([_make_tool("a")])):
+        response = await tools_service.get_tools_list_response(1, {"cursor": "invalid"})
+
+    data = json.loads(response.body)
+    assert data["error"]["code"] == MCPErrorCode.INVALID_PARAMS.value
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", [123, ["x"], {"page": 1}, "é", "a", "Zm9vOmJhcg=="])
+async def test_get_tools_list_response_malformed_cursor(cursor):
+    """Non-string and undecodable cursors are INVALID_PARAMS, not internal errors"""
+    with patch.object(toolkit_loader, "catalog", _build_catalog([_make_tool(f"tool_{i}") for i in range(3)], page_size=2)):
+        response = await tools_service.get_tools_list_response(1, {"cursor": cursor})
+
+    data = json.loads(response.body)
+    assert data["error"]["code"] == MCPErrorCode.INVALID_PARAMS.value
+
+@pytest.mark.asyncio
+async def test_get_tools_list_response_etag():
+    """Test tools list ETag and 304 Not Modified"""
+    with patch.object(toolkit_loader, "catalog", _build_catalog([_make_tool("a")])):
+        response = await tools_service.get_tools_list_response(1)
+        etag = response.headers["etag"]
+        not_modified = await tools_service.get_tools_list_response(2, None, etag)
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
 @pytest.mark.asyncio
 async def test_handle_tool_request_success():
     """Test successful tool request handling"""
@@ -96,7 +176,7 @@ async def test_handle_tool_request_success():
     with patch("src.services.tools_service.handle_tool_call", return_value=mock_response) as mock_handle:
         response = await tools_service.handle_tool_request(request_id, params)
         
-        mock_handle.assert_called_once_with(request_id, "test_tool", {"url": "https://example.com"})
+        mock_handle.assert_called_once_with(request_id, "test_tool", {"url": "https://example.com"}, None, DEFAULT_USER_ID)
         assert response == mock_response
 
 @pytest.mark.asyncio
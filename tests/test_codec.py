@@ -0,0 +1,53 @@
+"""Tests for the orjson/msgspec codec layer."""
+import json
+from datetime import datetime, date
+from decimal import Decimal
+from uuid import UUID
+import pytest
+from src.codec import CodecError, convert_tool_call, decode_request, dumps
+from src.schemas.mcp_schemas import MCPEnvelope
+from src.utils import create_success_response
+
+def test_tool_results_with_native_types_are_serialized():
+    result = {
+        "when": datetime(2024, 5, 1, 12, 30),
+        "day": date(2024, 5, 1),
+        "salary": Decimal("1234.56"),
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+        "tags": {"a"},
+    }
+
+    data = json.loads(create_success_response(1, result).body)["result"]
+
+    assert data == {
+        "when": "2024-05-01T12:30:00",
+        "day": "2024-05-01",
+        "salary": "1234.56",
+        "id": "12345678-1234-5678-1234-567812345678",
+        "tags": ["a"],
+    }
+    assert dumps({"texto": "ação"}) == '{"texto":"ação"}'.encode()
+
+def test_decode_single_request_and_batch():
+    envelope = decode_request(b'{"jsonrpc":"2.0","id":"abc","method":"tools/list","params":{"cursor":"x"}}')
+    assert isinstance(envelope, MCPEnvelope)
+    assert envelope.id == "abc"
+    assert envelope.params == {"cursor": "x"}
+
+    assert decode_request(b'{"method":"initialize"}').id == 0
+    assert len(decode_request(b'[{"method":"initialize"}, 42]')) == 2
+
+@pytest.mark.parametrize("body", [b'{"invalid":"format"}', b'{"method": 1}', b'not json'])
+def test_invalid_envelopes_raise_codec_error(body):
+    with pytest.raises(CodecError):
+        decode_request(body)
+
+def test_tool_call_params_with_meta():
+    params = convert_tool_call({"name": "Web_Search", "arguments": {"q": "x"}, "_meta": {"progressToken": 5}})
+
+    assert params.name == "Web_Search"
+    assert params.arguments == {"q": "x"}
+    assert params.meta == {"progressToken": 5}
+
+    with pytest.raises(CodecError):
+        convert_tool_call({"arguments": {}})
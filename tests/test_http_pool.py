@@ -0,0 +1,61 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.agent.llm import get_llm
+from src.http_pool import AsyncPooledTransport, ConnectionStats, PooledTransport, http_async_client, http_client
+from src.tools.loader import arcade_client
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_transport_counts_reused_connections(server_url):
+    stats = ConnectionStats()
+    with httpx.Client(transport=PooledTransport(stats, max_per_host=2)) as client:
+        for _ in range(3):
+            assert client.get(server_url).text == "ok"
+
+    host = stats.stats()["hosts"]["127.0.0.1"]
+    assert host == {"requests": 3, "new_connections": 1, "reused": 2, "http2_requests": 0}
+    assert stats.stats()["reuse_ratio"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_async_transport_counts_reused_connections(server_url):
+    stats = ConnectionStats()
+    async with httpx.AsyncClient(transport=AsyncPooledTransport(stats, max_per_host=2)) as client:
+        for _ in range(3):
+            assert (await client.get(server_url)).text == "ok"
+
+    assert stats.stats()["reused"] == 2
+
+
+def test_arcade_and_openai_clients_share_the_pool():
+    assert arcade_client._client is http_client
+    llm = get_llm("gpt-4o-mini", temperature=0)
+    assert llm is get_llm("gpt-4o-mini", temperature=0)
+    assert llm.http_client is http_client
+    assert llm.http_async_client is http_async_client
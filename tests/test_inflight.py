@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+from starlette.requests import Request
+
+from src.inflight import InFlightRequests, RequestCancelledError, register_cancel_hook
+from src.schemas.mcp_schemas import MCPErrorCode
+from src.routes.mcp_routes import _session_id
+from src.services import tools_service
+
+
+@pytest.mark.asyncio
+async def test_cancel_interrupts_call_and_runs_hooks():
+    inflight = InFlightRequests()
+    released = threading.Event()
+    started = asyncio.Event()
+
+    async def slow_call():
+        register_cancel_hook("fake query", released.set, blocking=True)
+        started.set()
+        await asyncio.sleep(10)
+
+    call = asyncio.create_task(inflight.run("s1", 7, "Slow_Tool", slow_call))
+    await started.wait()
+
+    assert await inflight.cancel("s1", 7, "user abort") is True
+    with pytest.raises(RequestCancelledError):
+        await call
+
+    assert released.is_set()
+    assert inflight.stats() == {"in_flight": 0, "cancelled": 1}
+
+
+@pytest.mark.asyncio
+async def test_cancel_is_scoped_by_session_and_ignores_unknown_ids():
+    inflight = InFlightRequests()
+    started = asyncio.Event()
+
+    async def slow_call():
+        started.set()
+        await asyncio.sleep(10)
+
+    call = asyncio.create_task(inflight.run("s1", 1, "Slow_Tool", slow_call))
+    await started.wait()
+
+    assert await inflight.cancel("other-session", 1) is False
+    assert await inflight.cancel("s1", 99) is False
+    assert not call.done()
+
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+
+@pytest.mark.asyncio
+async def test_cancelled_tool_request_returns_error_response(monkeypatch):
+    started = asyncio.Event()
+
+    async def slow_tool_call(request_id, tool_name, arguments, progress_token=None, user_id=None):
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(tools_service, "handle_tool_call", slow_tool_call)
+
+    call = asyncio.create_task(
+        tools_service.handle_tool_request(3, {"name": "Slow_Tool", "arguments": {}}, "session-a")
+    )
+    await started.wait()
+
+    assert await tools_service.cancel_request("session-a", {"requestId": 3, "reason": "timeout"}) is True
+    response = await call
+
+    assert b'"code":%d' % MCPErrorCode.REQUEST_CANCELLED.value in response.body
+
+
+def _request(headers):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+@pytest.mark.asyncio
+async def test_user_cannot_cancel_another_users_request(monkeypatch):
+    started = asyncio.Event()
+
+    async def slow_tool_call(request_id, tool_name, arguments, progress_token=None, user_id=None):
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(tools_service, "handle_tool_call", slow_tool_call)
+
+    bob_session = _session_id(_request({}), {"sub": "bob"})
+    call = asyncio.create_task(
+        tools_service.handle_tool_request(5, {"name": "Slow_Tool", "arguments": {}}, bob_session)
+    )
+    await started.wait()
+
+    # Alice forja o sub do Bob (e a sessão padrão) no cabeçalho Mcp-Session-Id
+    for header in ("bob", "default"):
+        alice_session = _session_id(_request({"Mcp-Session-Id": header}), {"sub": "alice"})
+        assert await tools_service.cancel_request(alice_session, {"requestId": 5}) is False
+    assert not call.done()
+
+    assert await tools_service.cancel_request(bob_session, {"requestId": 5}) is True
+    await call
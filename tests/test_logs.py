@@ -0,0 +1,91 @@
+import json
+import logging
+import queue
+
+from src.logs import ContextQueueHandler, JSONLinesFormatter, Preview, _parse_levels, preview, request_id_var
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted eagerly")
+
+
+def test_preview_is_lazy_and_capped():
+    lazy = preview(Exploding())
+    assert isinstance(lazy, Preview)
+
+    logger = logging.getLogger("tests.lazy")
+    logger.setLevel(logging.WARNING)
+    logger.info("payload: %s", lazy)  # nível desativado: nada é formatado
+
+    text = str(preview({"text": "x" * 50}, limit=20))
+    assert text == '{"text": "xxxxxxxxxx... (truncated)'
+    assert str(preview("y" * 30, limit=10)) == "yyyyyyyyyy... (30 chars)"
+    assert str(preview({"rows": [1, None, True], "n": 1.5})) == '{"rows": [1, null, true], "n": 1.5}'
+
+
+def test_preview_stops_rendering_at_the_limit():
+    # Nada além do limite é percorrido (o Exploding nunca é convertido)
+    rows = [{"id": i, "text": "x" * 10} for i in range(10_000)] + [Exploding()]
+
+    text = str(preview({"rows": rows}, limit=50))
+
+    assert text.startswith('{"rows": [{"id": 0, "text": "xxxxxxxxxx"}')
+    assert text.endswith("... (truncated)")
+    assert len(text) == 50 + len("... (truncated)")
+
+
+def test_queue_handler_captures_request_id_and_formats_as_json_lines():
+    records = queue.Queue()
+    handler = ContextQueueHandler(records)
+    logger = logging.getLogger("tests.queue")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    token = request_id_var.set(7)
+    try:
+        logger.warning("tool %s failed", "Search")
+    finally:
+        request_id_var.reset(token)
+        logger.removeHandler(handler)
+
+    line = json.loads(JSONLinesFormatter().format(records.get_nowait()))
+    assert line["request_id"] == 7
+    assert line["message"] == "tool Search failed"
+    assert line["logger"] == "tests.queue"
+    assert line["level"] == "WARNING"
+
+
+def test_previews_render_on_the_calling_thread_and_never_raise():
+    records = queue.Queue()
+    handler = ContextQueueHandler(records)
+    logger = logging.getLogger("tests.preview")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    payload = {"rows": [1]}
+    try:
+        logger.warning("result: %s, broken: %s", preview(payload), preview(Exploding()))
+    finally:
+        logger.removeHandler(handler)
+    # Alterado depois do log, antes de o escritor formatar
+    payload["rows"].append(2)
+
+    line = json.loads(JSONLinesFormatter().format(records.get_nowait()))
+    assert line["message"] == (
+        'result: {"rows": [1]}, broken: <Exploding: preview failed: AssertionError(\'formatted eagerly\')>'
+    )
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = ContextQueueHandler(queue.Queue(1))
+    dropped = ContextQueueHandler.dropped
+
+    for _ in range(3):
+        handler.emit(logging.makeLogRecord({"msg": "x"}))
+
+    assert ContextQueueHandler.dropped == dropped + 2
+
+
+def test_parse_levels():
+    assert _parse_levels("tools=debug, auth=WARNING,,bad") == {"tools": "DEBUG", "auth": "WARNING"}
@@ -0,0 +1,72 @@
+
+import httpx
+import pytest
+
+from src.app import app
+from src.metrics import Counter, Histogram, render_metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "Test latency", ("tool",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, tool="a")
+    histogram.observe(0.5, tool="a")
+    histogram.observe(5, tool="a")
+
+    lines = histogram.render()
+
+    assert 'test_latency_seconds_bucket{tool="a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{tool="a",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{tool="a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{tool="a"} 3' in lines
+
+
+def test_counter_escapes_labels_and_stats_are_flattened():
+    counter = Counter("test_errors_total", "Test errors", ("message",))
+    counter.inc(message='bad "quote"')
+
+    assert 'test_errors_total{message="bad \\"quote\\""} 1' in counter.render()
+
+    text = render_metrics(lambda: {"cache": {"hits": 3, "hit_ratio": 0.5, "nested": {"size": 2}, "names": ["x"]}})
+    assert 'mcp_stat{section="cache",key="hits"} 3' in text
+    assert 'mcp_stat{section="cache",key="nested.size"} 2' in text
+    assert 'key="names"' not in text
+
+
+class EchoTool:
+    name = "Echo_Tool"
+    description = "Returns its arguments"
+
+    def invoke(self, arguments):
+        return f"echo {arguments.get('text', '')}"
+
+
+@pytest.fixture
+def echo_tool(use_tools):
+    use_tools(EchoTool())
+
+
+@pytest.mark.asyncio
+async def test_tool_call_reports_spans_and_metrics(echo_tool):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/mcp", json={
+            "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "Echo_Tool", "arguments": {"text": "hi"}}
+        })
+        await client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "Missing"}})
+        await client.post("/mcp", json={"jsonrpc": "2.0", "id": 3, "method": "scanner/probe-123"})
+        await client.get("/wp-admin/probe-123.php")
+        metrics = await client.get("/metrics")
+
+    timing = response.headers["server-timing"]
+    for phase in ("parse", "lookup", "arguments", "execute", "serialize"):
+        assert f"{phase};dur=" in timing
+
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'mcp_request_duration_seconds_count{method="tools/call",tool="Echo_Tool"}' in metrics.text
+    assert 'mcp_span_duration_seconds_count{span="execute",tool="Echo_Tool"}' in metrics.text
+    assert 'mcp_request_errors_total{method="tools/call",tool="unknown",code="-32601"}' in metrics.text
+    # Nomes, métodos e caminhos enviados pelo cliente não criam séries novas
+    series = [line for line in metrics.text.splitlines() if line.startswith("mcp_")]
+    assert not [line for line in series if "Missing" in line or "probe-123" in line]
+    assert 'mcp_request_duration_seconds_count{method="other",tool=""}' in metrics.text
+    assert "mcp_requests_in_flight 1" in metrics.text  # a própria requisição do /metrics
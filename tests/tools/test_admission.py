@@ -0,0 +1,145 @@
+"""Tests for per-user admission control of tools/call and per-tool execution limits."""
+import asyncio
+import json
+
+import pytest
+
+from src.schemas.mcp_schemas import MCPErrorCode
+from src.services import tools_service
+from src.tools.admission import AdmissionController, AdmissionRejectedError
+from src.tools.execution import ToolConcurrencyLimiter
+from src.tools.jobs import job_manager
+from src.tools.registry import TOOL_KIND_CUSTOM, create_entry
+
+
+async def hold(controller, user, tool, release: asyncio.Event, entered: asyncio.Event = None):
+    async with controller.admit(user, tool):
+        if entered is not None:
+            entered.set()
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_user_limit_queues_then_admits_in_order():
+    controller = AdmissionController(user_limit=1, max_queue=4, max_wait=5)
+    release_first = asyncio.Event()
+    first = asyncio.create_task(hold(controller, "ana", "Tool_A", release_first))
+    await asyncio.sleep(0)
+
+    # Outro usuário não é afetado pelo limite da ana
+    async with controller.admit("bruno", "Tool_A"):
+        pass
+
+    entered = asyncio.Event()
+    second = asyncio.create_task(hold(controller, "ana", "Tool_B", asyncio.Event(), entered))
+    await asyncio.sleep(0)
+    assert controller.stats()["queue_depth"] == 1
+    assert not entered.is_set()
+
+    release_first.set()
+    await first
+    await asyncio.wait_for(entered.wait(), 1)
+    assert controller.stats()["queue_depth"] == 0
+    second.cancel()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_and_expired_deadline_are_rejected():
+    controller = AdmissionController(user_limit=1, max_queue=1, max_wait=0.05, retry_after=3)
+    release = asyncio.Event()
+    running = asyncio.create_task(hold(controller, "ana", "Slow_Tool", release))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(hold(controller, "ana", "Slow_Tool", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as error:
+        await hold(controller, "ana", "Other_Tool", release)
+    assert error.value.retry_after == 3
+
+    with pytest.raises(AdmissionRejectedError):
+        await waiting
+
+    release.set()
+    await running
+    assert controller.stats()["rejected"] == 2
+    assert controller.in_flight == {}
+
+
+class EchoTool:
+    name = "Echo_Tool"
+    description = "Echo the arguments"
+
+
+@pytest.fixture
+def echo_gate(use_tools):
+    """Register Echo_Tool; its executions wait until the returned event is set."""
+    gate = asyncio.Event()
+    gate.set()
+
+    async def executor(arguments, user_id=None):
+        await gate.wait()
+        return "echo"
+
+    use_tools(create_entry(EchoTool(), TOOL_KIND_CUSTOM, executor=executor))
+    return gate
+
+
+def assert_busy(response, retry_after):
+    body = json.loads(response.body)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == str(retry_after)
+    assert body["error"]["code"] == MCPErrorCode.SERVER_BUSY.value
+    assert body["error"]["data"] == {"retryAfter": retry_after}
+
+
+@pytest.mark.asyncio
+async def test_rejected_tool_request_returns_busy_error(monkeypatch, echo_gate):
+    controller = AdmissionController(user_limit=1, max_queue=0, retry_after=7)
+    monkeypatch.setattr("src.tools.base.admission_controller", controller)
+    release = asyncio.Event()
+    running = asyncio.create_task(hold(controller, "ana", "Echo_Tool", release))
+    await asyncio.sleep(0)
+
+    response = await tools_service.handle_tool_request(1, {"name": "Echo_Tool", "arguments": {}}, user_id="ana")
+    assert_busy(response, 7)
+
+    # Outro usuário (ou o usuário padrão das requisições sem JWT) tem a própria vaga
+    response = await tools_service.handle_tool_request(2, {"name": "Echo_Tool", "arguments": {}})
+    assert response.status_code == 200
+
+    release.set()
+    await running
+
+
+@pytest.mark.asyncio
+async def test_background_job_holds_the_user_slot_until_it_ends(monkeypatch, echo_gate):
+    controller = AdmissionController(user_limit=1, max_queue=0, retry_after=3)
+    monkeypatch.setattr("src.tools.base.admission_controller", controller)
+    monkeypatch.setattr("src.tools.base.JOB_TOOLS", {"Echo_Tool"})
+    echo_gate.clear()
+    call = {"name": "Echo_Tool", "arguments": {}}
+
+    accepted = await tools_service.handle_tool_request(1, call, user_id="ana")
+    job_id = json.loads(accepted.body)["result"]["structuredContent"]["jobId"]
+
+    # O job aceito ainda ocupa a vaga: o usuário não enche a fila de jobs
+    assert_busy(await tools_service.handle_tool_request(2, call, user_id="ana"), 3)
+    assert controller.in_flight == {"ana": 1}
+
+    echo_gate.set()
+    await job_manager.jobs[job_id].task
+    assert controller.in_flight == {}
+    assert (await tools_service.handle_tool_request(3, call, user_id="ana")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_tool_limit_rejects_with_retry_after(monkeypatch, echo_gate):
+    limiter = ToolConcurrencyLimiter({"Echo_Tool": 1}, max_queue=0, retry_after=4)
+    monkeypatch.setattr("src.tools.base.tool_limiter", limiter)
+
+    async with limiter.limit("Echo_Tool"):
+        response = await tools_service.handle_tool_request(1, {"name": "Echo_Tool", "arguments": {}}, user_id="ana")
+
+    assert_busy(response, 4)
+    assert limiter.stats()["rejected"] == 1
+    assert (await tools_service.handle_tool_request(2, {"name": "Echo_Tool", "arguments": {}})).status_code == 200
@@ -0,0 +1,68 @@
+"""Tests for the per-user authorization status cache."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.tools.auth_cache import AuthorizationCache, authorization_cache
+from src.tools.base import handle_tool_call
+from src.tools.registry import TOOL_KIND_ARCADE, create_entry
+
+def test_cache_expires_and_counts_hits(clock):
+    cache = AuthorizationCache(ttl=60, max_entries=10, clock=clock)
+
+    assert not cache.is_authorized("user", ("slack", "chat:write"))
+    cache.mark_authorized("user", ("slack", "chat:write"))
+    assert cache.is_authorized("user", ("slack", "chat:write"))
+    assert not cache.is_authorized("other", ("slack", "chat:write"))
+
+    clock.now = 61
+    assert not cache.is_authorized("user", ("slack", "chat:write"))
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["size"] == 0
+
+def test_cache_evicts_least_recently_used_and_invalidates():
+    cache = AuthorizationCache(ttl=60, max_entries=2)
+    cache.mark_authorized("a", ("slack",))
+    cache.mark_authorized("b", ("slack",))
+    cache.is_authorized("a", ("slack",))
+    cache.mark_authorized("c", ("slack",))
+
+    assert not cache.is_authorized("b", ("slack",))
+    assert cache.is_authorized("a", ("slack",))
+
+    cache.invalidate("a", ("slack",))
+    assert not cache.is_authorized("a", ("slack",))
+    assert cache.stats()["invalidations"] == 1
+
+class SlackTool:
+    name = "Slack_SendMessage"
+    description = "Send a message"
+
+@pytest.fixture
+def slack_entry(use_tools, monkeypatch):
+    executor = AsyncMock(return_value="sent")
+    entry = create_entry(SlackTool(), TOOL_KIND_ARCADE, True, ("slack", "chat:write"), executor)
+    use_tools(entry)
+    monkeypatch.setattr(authorization_cache, "_entries", type(authorization_cache._entries)())
+    return entry
+
+@pytest.mark.asyncio
+async def test_completed_authorization_is_reused(slack_entry):
+    with patch("src.tools.base.tools_manager") as manager:
+        manager.authorize.return_value = MagicMock(status="completed")
+
+        await handle_tool_call(1, "Slack_SendMessage", {})
+        await handle_tool_call(2, "Slack_SendMessage", {})
+
+    assert manager.authorize.call_count == 1
+
+@pytest.mark.asyncio
+async def test_auth_error_invalidates_cached_authorization(slack_entry):
+    slack_entry.executor.side_effect = Exception("Authorization revoked")
+
+    with patch("src.tools.base.tools_manager") as manager:
+        manager.authorize.return_value = MagicMock(status="completed")
+
+        await handle_tool_call(1, "Slack_SendMessage", {})
+        await handle_tool_call(2, "Slack_SendMessage", {})
+
+    assert manager.authorize.call_count == 2
@@ -0,0 +1,61 @@
+"""Tests for non-blocking tool execution and per-tool concurrency limits."""
+import asyncio
+import time
+import httpx
+import pytest
+from src.app import app
+from src.tools.execution import ToolConcurrencyLimiter, parse_limits
+
+class SlowTool:
+    """Custom tool whose invoke blocks like a crewai run or a MariaDB query."""
+    name = "Slow_Tool"
+    description = "Blocks for a while"
+
+    def invoke(self, arguments):
+        time.sleep(1)
+        return "done"
+
+@pytest.fixture
+def slow_tool(use_tools):
+    use_tools(SlowTool())
+
+def rpc(method, request_id, params=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+
+@pytest.mark.asyncio
+async def test_long_tool_call_does_not_block_other_requests(slow_tool):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        call = asyncio.create_task(client.post("/mcp", json=rpc("tools/call", 1, {"name": "Slow_Tool", "arguments": {}})))
+        await asyncio.sleep(0.1)
+
+        start = time.perf_counter()
+        listed, initialized = await asyncio.gather(
+            client.post("/mcp", json=rpc("tools/list", 2)),
+            client.post("/mcp", json=rpc("initialize", 3)),
+        )
+        elapsed = time.perf_counter() - start
+
+        assert not call.done()
+        assert elapsed < 0.5
+        assert listed.json()["result"]["tools"][0]["name"] == "Slow_Tool"
+        assert initialized.json()["id"] == 3
+
+        response = await call
+        assert response.json()["result"]["content"][0]["text"] == "done"
+
+@pytest.mark.asyncio
+async def test_per_tool_concurrency_limit():
+    limiter = ToolConcurrencyLimiter(parse_limits("Slow_Tool=2"))
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        async with limiter.limit("Slow_Tool"):
+            peak = max(peak, limiter.in_flight["Slow_Tool"])
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(run() for _ in range(5)))
+
+    assert peak == 2
+    assert limiter.limit_for("Other_Tool") == 0
@@ -0,0 +1,78 @@
+"""Tests for background jobs of long-running tools."""
+import asyncio
+import json
+import time
+import pytest
+from src.services import tools_service
+from src.tools.jobs import JobManager, JobQueueFullError, SQLiteJobStore, job_manager
+from src.tools.progress import report_progress
+
+class LongTool:
+    name = "Long_Tool"
+    description = "Takes a while"
+
+    def invoke(self, arguments):
+        report_progress(1, 2, "halfway")
+        time.sleep(0.2)
+        return f"post about {arguments['topic']}"
+
+@pytest.fixture(autouse=True)
+def long_tool(use_tools, monkeypatch):
+    use_tools(LongTool())
+    monkeypatch.setattr("src.tools.base.JOB_TOOLS", {"Long_Tool"})
+
+async def wait_for(job_id):
+    for _ in range(100):
+        job = job_manager.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+@pytest.mark.asyncio
+async def test_long_tool_returns_job_handle_and_reports_progress():
+    start = time.perf_counter()
+    response = await tools_service.handle_tool_request(1, {
+        "name": "Long_Tool", "arguments": {"topic": "ai"}, "_meta": {"progressToken": "tok-1"}
+    })
+    assert time.perf_counter() - start < 0.1
+
+    handle = json.loads(response.body)["result"]["structuredContent"]
+    assert handle["status"] == "pending"
+    assert handle["progressToken"] == "tok-1"
+
+    job = await wait_for(handle["jobId"])
+    assert job["status"] == "completed"
+    assert job["result"]["content"][0]["text"] == "post about ai"
+
+    fetched = json.loads(tools_service.get_job_response(2, {"jobId": handle["jobId"]}).body)
+    assert fetched["result"]["status"] == "completed"
+    assert (fetched["result"]["progress"], fetched["result"]["total"], fetched["result"]["message"]) == (1, 2, "halfway")
+
+@pytest.mark.asyncio
+async def test_pending_queue_is_bounded():
+    manager = JobManager(max_workers=1, max_pending=1, result_ttl=60)
+
+    async def run():
+        await asyncio.sleep(0.05)
+
+    manager.submit("Long_Tool", run)
+    with pytest.raises(JobQueueFullError):
+        manager.submit("Long_Tool", run)
+    assert manager.stats()["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_sqlite_store_shares_jobs_between_workers(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    worker_a = JobManager(max_workers=1, max_pending=10, result_ttl=60, store=SQLiteJobStore(path))
+    worker_b = JobManager(max_workers=1, max_pending=10, result_ttl=60, store=SQLiteJobStore(path))
+
+    async def run():
+        return {"content": [{"type": "text", "text": "ok"}]}
+
+    job = worker_a.submit("Long_Tool", run)
+    await job.task
+
+    assert worker_b.get(job.id)["status"] == "completed"
+    assert worker_b.get(job.id)["result"]["content"][0]["text"] == "ok"
+    assert worker_b.get("unknown") is None
@@ -0,0 +1,163 @@
+"""Tests for concurrent and lazy toolkit loading."""
+import json
+import time
+import pytest
+from arcadepy import Arcade
+from arcadepy.types import ToolDefinition
+from src.tools import snapshot, toolkits
+from src.tools.loader import ToolkitLoader
+
+def make_definition(toolkit, requires_auth=False):
+    definition = {
+        "name": "Tool",
+        "fully_qualified_name": f"{toolkit}.Tool@1.0.0",
+        "toolkit": {"name": toolkit},
+        "description": f"{toolkit} tool",
+        "input": {"parameters": [
+            {"name": "query", "required": True, "value_schema": {"val_type": "string"}}
+        ]},
+    }
+    if requires_auth:
+        definition["requirements"] = {"authorization": {"provider_id": "slack", "provider_type": "oauth2"}}
+    return ToolDefinition.model_validate(definition)
+
+class FakeLoader(ToolkitLoader):
+    """ToolkitLoader with a fake remote fetch (50ms per toolkit by default)."""
+    def __init__(self, toolkits, failing=(), delay=0.05, **kwargs):
+        self.fetched = []
+        self.failing = set(failing)
+        self.delay = delay
+        super().__init__(Arcade(api_key="test"), toolkits, [], max_workers=8, **kwargs)
+
+    def _fetch_definitions(self, toolkit):
+        self.fetched.append(toolkit)
+        time.sleep(self.delay)
+        if toolkit in self.failing:
+            raise ConnectionError("Arcade unreachable")
+        return [make_definition(toolkit, requires_auth=toolkit == "Slack")]
+
+def test_load_all_is_concurrent_and_reports_timings():
+    toolkits = ["Web", "Search", "Slack", "Jira", "Notion", "Reddit"]
+    loader = FakeLoader(toolkits, delay=0.2)
+
+    start = time.perf_counter()
+    loader.load_all()
+    elapsed = time.perf_counter() - start
+
+    assert loader.ready
+    assert elapsed < 0.2 * len(toolkits)
+    assert set(loader.timings) == set(toolkits)
+    assert len(loader.registry) == len(toolkits)
+    # Catálogo na ordem de configuração, independente da ordem de conclusão
+    tools = json.loads(loader.catalog.pages[0].body)["tools"]
+    assert [tool["name"] for tool in tools] == [f"{toolkit}_Tool" for toolkit in toolkits]
+    assert loader.status()["toolkits"]["Web"]["tools"] == 1
+
+def test_get_loads_only_the_needed_toolkit():
+    loader = FakeLoader(["Web", "Slack"])
+
+    assert len(loader.registry) == 0
+    entry = loader.get("Slack_Tool")
+
+    assert entry.name == "Slack_Tool"
+    assert loader.requires_auth("Slack_Tool") is True
+    assert loader.fetched == ["Slack"]
+    assert loader.get("Unknown_Tool") is None
+    assert loader.fetched == ["Slack"]
+
+def test_failed_toolkit_is_reported_and_retried():
+    loader = FakeLoader(["Web", "Slack"], failing=["Slack"])
+    loader.load_all()
+
+    assert loader.is_loaded("Web")
+    assert not loader.is_loaded("Slack")
+    assert "Arcade unreachable" in loader.status()["toolkits"]["Slack"]["error"]
+
+    loader.failing.clear()
+    assert loader.get("Slack_Tool") is not None
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_failed_toolkits_until_ready():
+    loader = FakeLoader(["Web", "Slack"], failing=["Slack"], delay=0, retry_delay=0.05)
+
+    # A primeira passada libera o tools/list com o catálogo parcial, sem marcar pronto
+    assert not await loader.wait_until_ready(timeout=5)
+    assert loader.failed() == ["Slack"]
+    assert len(loader.registry) == 1
+
+    loader.failing.clear()
+    loader._warm_up_thread.join(timeout=5)
+
+    assert loader.ready
+    assert loader.failed() == []
+    assert len(loader.registry) == 2
+    assert loader.fetched.count("Slack") >= 2
+
+@pytest.mark.asyncio
+async def test_wait_until_ready_starts_warm_up():
+    loader = FakeLoader(["Web", "Search"])
+
+    assert await loader.wait_until_ready(timeout=5)
+    assert len(loader.registry) == 2
+
+def test_snapshot_is_written_and_used_offline(tmp_path):
+    path = str(tmp_path / "tools_snapshot.json")
+    FakeLoader(["Web", "Slack"], snapshot_path=path).load_all()
+
+    # Novo worker com o Arcade fora do ar: sobe apenas com o snapshot
+    offline = FakeLoader(["Web", "Slack"], failing=["Web", "Slack"], snapshot_path=path, snapshot_max_age=3600)
+
+    assert offline.ready
+    assert offline.fetched == []
+    assert offline.get("Slack_Tool").requires_auth is True
+    assert offline.status()["toolkits"]["Web"]["source"] == "snapshot"
+    assert "query" in offline.get("Web_Tool").schema["properties"]
+
+def test_stale_snapshot_is_refreshed_in_background(tmp_path):
+    path = str(tmp_path / "tools_snapshot.json")
+    FakeLoader(["Web"], snapshot_path=path).load_all()
+
+    loader = FakeLoader(["Web"], snapshot_path=path, snapshot_max_age=0.01)
+    time.sleep(0.02)
+    assert loader.snapshot_is_stale()
+
+    loader.start_warm_up()
+    loader._warm_up_thread.join(timeout=5)
+
+    assert loader.fetched == ["Web"]
+    assert loader.status()["toolkits"]["Web"]["source"] == "arcade"
+    assert not loader.snapshot_is_stale()
+
+def test_snapshot_with_other_format_is_ignored(tmp_path):
+    path = tmp_path / "tools_snapshot.json"
+    path.write_text(json.dumps({"format_version": 0, "toolkits": {}}))
+
+    loader = FakeLoader(["Web"], snapshot_path=str(path))
+
+    assert not loader.ready
+    assert loader.snapshot_loaded_age is None
+
+@pytest.mark.parametrize("content", [[], {"format_version": 1}, {"format_version": 1, "toolkits": []}])
+def test_malformed_snapshot_is_ignored(tmp_path, content):
+    path = tmp_path / "tools_snapshot.json"
+    path.write_text(json.dumps(content))
+
+    assert snapshot.read_snapshot(str(path)) is None
+    assert FakeLoader(["Web"], snapshot_path=str(path)).snapshot_loaded_age is None
+
+def test_snapshot_cli_builds_its_own_loader(tmp_path, monkeypatch):
+    created = []
+
+    class CliLoader(FakeLoader):
+        def __init__(self, client, toolkits, custom_tools, max_workers=8):
+            created.append(client)
+            super().__init__(toolkits, delay=0)
+
+    monkeypatch.setattr(toolkits, "ToolkitLoader", CliLoader)
+    path = tmp_path / "tools_snapshot.json"
+
+    assert snapshot.main(["--path", str(path), "--toolkits", "Web", "Slack"]) == 0
+
+    # Loader descartável da CLI, não o toolkit_loader do servidor
+    assert len(created) == 1
+    assert set(snapshot.read_snapshot(str(path))["toolkits"]) == {"Web", "Slack"}
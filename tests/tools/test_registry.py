@@ -0,0 +1,74 @@
+"""Tests for the indexed tool registry."""
+import pytest
+from unittest.mock import MagicMock
+from src.tools.registry import ToolRegistry, create_entry, make_arcade_executor, ToolExecutionError, TOOL_KIND_ARCADE, TOOL_KIND_CUSTOM, EMPTY_INPUT_SCHEMA
+from tests.conftest import MockTool
+
+class MockCustomTool:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = []
+
+    def invoke(self, arguments):
+        self.calls.append(arguments)
+        return "custom result"
+
+def arcade_entry(name, *args):
+    return create_entry(MockTool(name), TOOL_KIND_ARCADE, *args, executor=make_arcade_executor(MagicMock(), name))
+
+def test_registry_indexes_entries_by_name():
+    registry = ToolRegistry()
+    registry.add(arcade_entry("Web_ScrapeUrl"))
+    registry.add(arcade_entry("Gmail_SendEmail", True, ("google", "gmail.send")))
+    registry.add(create_entry(MockCustomTool("Youtube_BlogPost"), TOOL_KIND_CUSTOM))
+
+    assert len(registry) == 3
+    assert "Gmail_SendEmail" in registry
+    assert registry.get("Web_ScrapeUrl").kind == TOOL_KIND_ARCADE
+    assert registry.get("Web_ScrapeUrl").requires_auth is False
+    assert registry.get("Web_ScrapeUrl").auth_key is None
+    assert registry.get("Gmail_SendEmail").requires_auth is True
+    assert registry.get("Gmail_SendEmail").auth_key == ("google", "gmail.send")
+    assert registry.get("Youtube_BlogPost").is_custom
+    assert registry.get("unknown") is None
+
+def test_registry_compiles_schema_once():
+    registry = ToolRegistry()
+    registry.add(arcade_entry("Web_ScrapeUrl"))
+    registry.add(create_entry(MockCustomTool("Youtube_BlogPost"), TOOL_KIND_CUSTOM))
+
+    assert "url" in registry.get("Web_ScrapeUrl").schema["properties"]
+    assert registry.get("Youtube_BlogPost").schema == EMPTY_INPUT_SCHEMA
+
+def test_arcade_entry_requires_the_client_executor():
+    with pytest.raises(ValueError, match="make_arcade_executor"):
+        create_entry(MockTool("Web_ScrapeUrl"), TOOL_KIND_ARCADE)
+
+@pytest.mark.asyncio
+async def test_registry_executors():
+    query_tool = MockCustomTool("VerxRH_RunQuery")
+    catalog_tool = MockCustomTool("VerxRH_GetDBCatalog")
+    registry = ToolRegistry()
+    registry.add(create_entry(query_tool, TOOL_KIND_CUSTOM))
+    registry.add(create_entry(catalog_tool, TOOL_KIND_CUSTOM))
+
+    await registry.get("VerxRH_RunQuery").executor({"sql": "SELECT 1", "extra": True})
+    assert query_tool.calls == [{"sql": "SELECT 1"}]
+
+    await registry.get("VerxRH_GetDBCatalog").executor({"ignored": 1})
+    assert catalog_tool.calls == [{}]
+
+
+@pytest.mark.asyncio
+async def test_arcade_executor_runs_under_user_authorization():
+    client = MagicMock()
+    client.tools.execute.return_value = MagicMock(success=True, output=MagicMock(value={"ok": True}))
+    executor = make_arcade_executor(client, "Slack_SendMessage")
+
+    assert await executor({"text": "hi"}, user_id="user") == {"ok": True}
+    client.tools.execute.assert_called_once_with(tool_name="Slack_SendMessage", input={"text": "hi"}, user_id="user")
+    client.tools.authorize.assert_not_called()
+
+    client.tools.execute.return_value = MagicMock(success=False, output=MagicMock(error=MagicMock(message="token expired")))
+    with pytest.raises(ToolExecutionError, match="token expired"):
+        await executor({"text": "hi"}, user_id="user")
@@ -0,0 +1,70 @@
+"""Tests for the TTL result cache of read-only tools."""
+import json
+import pytest
+from unittest.mock import AsyncMock
+from src.tools.result_cache import CachePolicy, ResultCache, parse_policies, result_cache
+from src.tools.base import handle_tool_call
+from src.tools.registry import TOOL_KIND_CUSTOM, create_entry
+
+def test_parse_policies():
+    policies = parse_policies("Web_ScrapeUrl=600:2048, Search_*=300,Gmail_ListEmails=60::user,broken")
+
+    assert policies["Web_ScrapeUrl"] == CachePolicy(600, 2048)
+    assert policies["Search_*"].ttl == 300
+    assert policies["Gmail_ListEmails"].per_user
+    assert "broken" not in policies
+
+def test_policy_lookup_supports_prefixes():
+    cache = ResultCache(parse_policies("Search_*=300,VerxRH_GetDBCatalog=3600"), max_bytes=1024)
+
+    assert cache.policy_for("Search_SearchGoogle").ttl == 300
+    assert cache.policy_for("VerxRH_GetDBCatalog").ttl == 3600
+    assert cache.policy_for("VerxRH_RunQuery") is None
+
+def test_key_ignores_argument_order():
+    cache = ResultCache({}, max_bytes=1024)
+
+    assert cache.key("Search", {"a": 1, "b": [2]}) == cache.key("Search", {"b": [2], "a": 1})
+    assert cache.key("Search", {"a": 1}, "user") != cache.key("Search", {"a": 1})
+
+def test_entries_expire_and_respect_size_limits(clock):
+    cache = ResultCache({}, max_bytes=200, clock=clock)
+    policy = CachePolicy(ttl=60, max_entry_bytes=100)
+
+    assert cache.put("a", policy, {"text": "x" * 10})
+    assert not cache.put("big", policy, {"text": "x" * 150})
+    assert cache.get("a") == ({"text": "x" * 10}, 0.0)
+
+    cache.put("b", policy, {"text": "y" * 80})
+    cache.put("c", policy, {"text": "z" * 80})
+    assert cache.get("a") is None  # evicted to stay under max_bytes
+
+    clock.now = 61
+    assert cache.get("c") is None
+    stats = cache.stats()
+    assert stats["oversized"] == 1
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+    assert stats["bytes"] == cache.bytes > 0
+
+class SearchTool:
+    name = "Search_SearchGoogle"
+    description = "Search the web"
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_served_from_cache(use_tools, monkeypatch):
+    executor = AsyncMock(return_value="results")
+    use_tools(create_entry(SearchTool(), TOOL_KIND_CUSTOM, executor=executor))
+    monkeypatch.setattr(result_cache, "policies", {"Search_*": CachePolicy(ttl=60)})
+    result_cache.clear()
+
+    first = json.loads((await handle_tool_call(1, "Search_SearchGoogle", {"query": "mcp", "n": 5})).body)
+    second = json.loads((await handle_tool_call(2, "Search_SearchGoogle", {"n": 5, "query": "mcp"})).body)
+    other = json.loads((await handle_tool_call(3, "Search_SearchGoogle", {"query": "other"})).body)
+
+    assert executor.await_count == 2
+    assert first["result"]["_meta"] == {"cache": "miss"}
+    assert second["result"]["_meta"]["cache"] == "hit"
+    assert second["result"]["content"] == first["result"]["content"]
+    assert other["result"]["_meta"] == {"cache": "miss"}
+    result_cache.clear()
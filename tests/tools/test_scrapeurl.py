@@ -3,24 +3,16 @@ import pytest
 from unittest.mock import patch, MagicMock
 from src.tools.base import handle_tool_call
 from src.schemas.mcp_schemas import MCPErrorCode
-from tests.conftest import MockTool
+from src.tools.registry import ToolRegistry
+from src.tools.loader import toolkit_loader
 
 @pytest.fixture(autouse=True)
-def mock_tools(mock_tool, monkeypatch):
-    """Mock the find_tool_by_name function and manager for testing."""
-    tool = mock_tool()
-    def mock_find_tool_by_name(name):
-        return tool if name.lower() == "scrapeurl" else None
-    
-    # Mock the manager object
-    mock_manager = MagicMock()
-    mock_manager.requires_auth.return_value = False
-    
-    monkeypatch.setattr("src.tools.base.find_tool_by_name", mock_find_tool_by_name)
-    monkeypatch.setattr("src.tools.base.manager", mock_manager)
+def arcade(arcade_tools):
+    """Mock the tool registry (and the Arcade client) for testing."""
+    return arcade_tools("scrapeurl")
 
 @pytest.mark.asyncio
-async def test_handle_scrapeurl_tool_success(mock_tools):
+async def test_handle_scrapeurl_tool_success(arcade):
     """Test successful tool execution."""
     result = await handle_tool_call(1, "scrapeurl", {"url": "https://example.com"})
     data = result.body.decode()
@@ -33,7 +25,7 @@ async def test_handle_scrapeurl_tool_success(mock_tools):
 @pytest.mark.asyncio
 async def test_handle_scrapeurl_tool_not_found():
     """Test tool not found error."""
-    with patch("src.tools.base.find_tool_by_name", return_value=None):
+    with patch.object(toolkit_loader, "registry", ToolRegistry()):
         result = await handle_tool_call(1, "nonexistent", {})
         data = result.body.decode()
         
@@ -43,18 +35,10 @@ async def test_handle_scrapeurl_tool_not_found():
         assert str(MCPErrorCode.METHOD_NOT_FOUND.value) in data
 
 @pytest.mark.asyncio
-async def test_handle_scrapeurl_tool_failure(mock_tools, monkeypatch):
+async def test_handle_scrapeurl_tool_failure(arcade):
     """Test tool execution failure."""
-    failing_tool = MockTool("scrapeurl", should_fail=True)
-    def mock_find_tool_by_name(name):
-        return failing_tool if name.lower() == "scrapeurl" else None
-    
-    # Mock the manager object
-    mock_manager = MagicMock()
-    mock_manager.requires_auth.return_value = False
-    
-    monkeypatch.setattr("src.tools.base.find_tool_by_name", mock_find_tool_by_name)
-    monkeypatch.setattr("src.tools.base.manager", mock_manager)
+    arcade.outputs["scrapeurl"] = Exception("Tool execution failed")
+
     result = await handle_tool_call(1, "scrapeurl", {"url": "https://example.com"})
     data = result.body.decode()
     
@@ -65,7 +49,7 @@ async def test_handle_scrapeurl_tool_failure(mock_tools, monkeypatch):
     assert "Tool execution failed" in data
 
 @pytest.mark.asyncio
-async def test_handle_scrapeurl_tool_with_default_args(mock_tools):
+async def test_handle_scrapeurl_tool_with_default_args(arcade):
     """Test tool execution with default arguments."""
     result = await handle_tool_call(1, "scrapeurl", {
         "url": "https://example.com",
@@ -0,0 +1,82 @@
+"""Tests for single-flight coalescing of identical concurrent tool calls."""
+import asyncio
+import json
+import pytest
+from src.inflight import register_cancel_hook
+from src.tools.singleflight import SingleFlight
+from src.tools.base import handle_tool_call
+from src.tools.registry import TOOL_KIND_CUSTOM, create_entry
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    results = await asyncio.gather(*(flights.do("key", "Tool", call) for _ in range(5)))
+
+    assert calls == 1
+    assert [result for result, _ in results] == [1] * 5
+    assert [shared for _, shared in results].count(False) == 1
+    assert flights.stats()["coalesced"] == 4
+    assert flights.stats()["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_caller_leaving_does_not_abort_the_shared_execution():
+    flights = SingleFlight()
+    released = []
+
+    async def call():
+        register_cancel_hook("fake query", lambda: released.append(True))
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flights.do("key", "Tool", call))
+    second = asyncio.create_task(flights.do("key", "Tool", call))
+    await asyncio.sleep(0.01)
+
+    first.cancel()
+    assert await second == ("done", True)
+    assert released == []
+
+    lone = asyncio.create_task(flights.do("other", "Tool", call))
+    await asyncio.sleep(0.01)
+    lone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lone
+
+    assert released == [True]
+    assert flights.stats()["abandoned"] == 1
+
+class ScrapeTool:
+    name = "Slow_Scrape"
+    description = "Scrape a page"
+
+@pytest.mark.asyncio
+async def test_handle_tool_call_coalesces_identical_calls(use_tools, monkeypatch):
+    calls = []
+
+    async def executor(arguments, user_id=None):
+        calls.append(arguments)
+        await asyncio.sleep(0.05)
+        return f"page {arguments['url']}"
+
+    use_tools(create_entry(ScrapeTool(), TOOL_KIND_CUSTOM, executor=executor))
+    monkeypatch.setattr("src.tools.base.COALESCE_TOOLS", {"Slow_Scrape"})
+
+    responses = await asyncio.gather(
+        handle_tool_call(1, "Slow_Scrape", {"url": "a"}),
+        handle_tool_call(2, "Slow_Scrape", {"url": "a"}),
+        handle_tool_call(3, "Slow_Scrape", {"url": "b"}),
+    )
+
+    bodies = [json.loads(response.body) for response in responses]
+    assert len(calls) == 2
+    assert [body["id"] for body in bodies] == [1, 2, 3]
+    assert bodies[0]["result"] == bodies[1]["result"]
+    assert bodies[2]["result"]["content"][0]["text"] == "page b"
@@ -0,0 +1,57 @@
+"""Tests for the precompiled argument-normalization plans."""
+import json
+from typing import List, Optional
+import pytest
+from pydantic import BaseModel
+from src.tools.tools_args import ArgumentError, _clean_arguments, compile_plan
+
+class SearchArgs(BaseModel):
+    query: str
+    tags: List[str]
+    limit: int
+    exact: bool
+    score: float = 0.5
+    cc: Optional[List[str]] = None
+
+SCHEMA = SearchArgs.model_json_schema()
+
+def test_plan_drops_none_and_fills_type_defaults():
+    plan = compile_plan(SCHEMA, "Search_Tool")
+
+    assert plan.apply({"query": "mcp", "cc": None}) == {"query": "mcp", "tags": [], "limit": 0, "exact": False}
+
+def test_plan_coerces_according_to_schema():
+    plan = compile_plan(SCHEMA, "Search_Tool")
+
+    cleaned = plan.apply({"query": "1", "tags": "a", "limit": "5", "exact": "true", "score": "0.7", "cc": '["x@y.com"]'})
+
+    assert cleaned == {"query": "1", "tags": ["a"], "limit": 5, "exact": True, "score": 0.7, "cc": ["x@y.com"]}
+
+@pytest.mark.parametrize("arguments", [{"limit": "many"}, {"exact": "maybe"}, {"tags": "[1,]"}])
+def test_plan_rejects_values_that_do_not_match_the_schema(arguments):
+    with pytest.raises(ArgumentError):
+        compile_plan(SCHEMA, "Search_Tool").apply(arguments)
+
+def test_defaults_are_not_shared_between_calls():
+    plan = compile_plan({"properties": {"formats": {"type": "array"}, "timeout": {"type": "integer"}}}, "Web_ScrapeUrl")
+
+    first = plan.apply({})
+    first["formats"].append("html")
+
+    assert plan.apply({}) == {"formats": ["markdown"], "timeout": 30000}
+
+def test_email_override_wraps_recipients_without_defaults():
+    plan = compile_plan({"properties": {"to_recipients": {}, "cc": {"type": "array"}}}, "microsoft_createandsendemail")
+
+    assert plan.apply({"to_recipients": "a@b.com", "subject": None}) == {"to_recipients": ["a@b.com"]}
+
+@pytest.mark.asyncio
+async def test_clean_arguments_returns_invalid_params_error():
+    class Tool:
+        args_schema = SearchArgs
+
+    response = await _clean_arguments(Tool(), {"limit": "many"}, "Search_Tool", 4, "corr")
+
+    body = json.loads(response.body)
+    assert body["id"] == 4
+    assert body["error"]["code"] == -32602